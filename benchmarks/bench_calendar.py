@@ -0,0 +1,128 @@
+"""Benchmark the date handling of calendar builds and the day index reads.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_calendar [occurrence_count]
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import random
+import sys
+import time
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.util import dt as dt_util
+
+from custom_components.tickets_events.const import EVENT_DEFAULT_DURATION
+from custom_components.tickets_events.dates import (
+    DateSet,
+    calendar_dates,
+    occurrence_span,
+)
+from custom_components.tickets_events.records import EventRecord
+from custom_components.tickets_events.timeline import Timeline
+
+DATES_PER_EVENT = 20
+FIRST_DAY = date(2025, 12, 1)
+
+
+def make_events(occurrences: int, seed: int = 1) -> list[EventRecord]:
+    """Return events with DATES_PER_EVENT dates each from the next 60 days."""
+    rng = random.Random(seed)
+    days = [(FIRST_DAY + timedelta(days=offset)).isoformat() for offset in range(60)]
+    return [
+        EventRecord(
+            {
+                "id": event_id,
+                "title": f"Event {event_id}",
+                "available_dates": sorted(rng.sample(days, DATES_PER_EVENT)),
+            }
+        )
+        for event_id in range(occurrences // DATES_PER_EVENT)
+    ]
+
+
+def spans_parsed(events: list[EventRecord]) -> list[tuple[datetime, datetime]]:
+    """Parse and localize every date string, as the calendar used to."""
+    spans = []
+    for event in events:
+        for date_str in event.get("available_dates", []):
+            start_time = datetime.fromisoformat(date_str).replace(
+                hour=10, minute=0, second=0, microsecond=0
+            )
+            start_time = dt_util.as_local(start_time)
+            spans.append((start_time, start_time + EVENT_DEFAULT_DURATION))
+    return spans
+
+
+def spans_cached(events: list[EventRecord]) -> list[tuple[datetime, datetime]]:
+    """Pack the dates of each event and expand them with the cached spans."""
+    spans = []
+    for event in events:
+        spans.extend(occurrence_span(day) for day in calendar_dates(event, FIRST_DAY))
+    return spans
+
+
+def calendar_events(spans: list[tuple[datetime, datetime]]) -> list[CalendarEvent]:
+    """Build a CalendarEvent per span, for reference."""
+    return [
+        CalendarEvent(start=start, end=end, summary="Event")
+        for start, end in spans
+    ]
+
+
+def weekly_series(count: int) -> list[DateSet]:
+    """Return count series occurring weekly for a year, a seventh on any day."""
+    return [
+        DateSet(
+            FIRST_DAY + timedelta(days=index % 7 + 7 * week) for week in range(52)
+        )
+        for index in range(count)
+    ]
+
+
+def scan_day(series: list[DateSet], day: date) -> list[DateSet]:
+    """Check every series for the day, as an index of whole series has to."""
+    return [dates for dates in series if any(dates.between(day, day))]
+
+
+def timed(func, repeat: int = 5) -> float:
+    """Return the mean duration of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(occurrences: int) -> None:
+    """Run the benchmark."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Bucharest"))
+    events = make_events(occurrences)
+    spans = spans_cached(events)
+    assert [start for start, _end in spans] == [
+        start for start, _end in spans_parsed(events)
+    ]
+
+    print(f"occurrences: {len(spans)} ({len(events)} events)")
+    print(f"parse every date:       {timed(lambda: spans_parsed(events)):8.1f} ms")
+    print(f"cached dates and spans: {timed(lambda: spans_cached(events)):8.1f} ms")
+    # What expanding lazily avoids for occurrences outside the shown range
+    print(f"CalendarEvent objects:  {timed(lambda: calendar_events(spans)):8.1f} ms")
+
+    # Reads should follow the occurrences of the day, not the series count
+    day = FIRST_DAY + timedelta(days=100)
+    for count in (1_000, 10_000):
+        series = weekly_series(count)
+        timeline = Timeline((dates, dates) for dates in series)
+        print(f"{count} weekly series over a year:")
+        print(f"  scan series for a day: {timed(lambda: scan_day(series, day)):8.3f} ms")
+        print(
+            f"  day buckets:           "
+            f"{timed(lambda: list(timeline.between(day, day))):8.3f} ms"
+        )
+        print(f"  next occurrence:       {timed(lambda: timeline.first_from(day)):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,91 @@
+"""Benchmark the memory used by event dicts and compact event records.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_memory [event_count ...]
+"""
+from __future__ import annotations
+
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+from custom_components.tickets_events.records import EventRecord
+
+CITIES = [
+    ("Bucharest", "Romania"),
+    ("Paris", "France"),
+    ("London", "United Kingdom"),
+    ("Rome", "Italy"),
+    ("Kraków", "Poland"),
+]
+TYPES = ["tour", "museum", "attraction", "show", "activity"]
+DATES = [f"2025-12-{day:02d}" for day in range(1, 32)]
+
+
+def make_payload(count: int, seed: int = 1) -> str:
+    """Return an API-like JSON payload with count events."""
+    rng = random.Random(seed)
+    events = []
+    for event_id in range(count):
+        city, country = rng.choice(CITIES)
+        price = round(rng.uniform(0, 120), 2)
+        events.append(
+            {
+                "id": event_id,
+                "title": f"Event {event_id} in {city}",
+                "description": "Guided visit with skip-the-line entry " * 3,
+                "city": city,
+                "country": country,
+                "price": price,
+                "price_eur": price,
+                "currency": "EUR",
+                "rating": round(rng.uniform(3, 5), 1),
+                "rating_count": rng.randint(0, 5000),
+                "type": rng.choice(TYPES),
+                "is_checkout_disabled": False,
+                "available_dates": rng.sample(DATES, 7),
+                "latitude": rng.uniform(40, 52),
+                "longitude": rng.uniform(-1, 27),
+                "images": [
+                    {"url": f"https://cdn.example.com/{event_id}.jpg", "alt": city}
+                ],
+                "booking_url": f"https://tickets.example.com/e/{event_id}",
+            }
+        )
+    return json.dumps({"events": events})
+
+
+def measure(build) -> tuple[int, object]:
+    """Return the bytes still allocated by build() and its result."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main(counts: list[int]) -> None:
+    """Run the benchmark."""
+    for count in counts:
+        payload = make_payload(count)
+        dict_size, events = measure(lambda: json.loads(payload)["events"])
+        # Parsed again so records do not share strings with the dicts above
+        record_size, records = measure(
+            lambda: [EventRecord(event) for event in json.loads(payload)["events"]]
+        )
+        assert records[0] == events[0]
+        print(
+            f"events: {count:>7}   dicts {dict_size / 2**20:8.1f} MiB   "
+            f"records {record_size / 2**20:8.1f} MiB   "
+            f"({record_size / dict_size:.0%})"
+        )
+        del events, records
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
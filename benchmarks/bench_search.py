@@ -0,0 +1,93 @@
+"""Benchmark the local search index against a substring scan.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_search [event_count]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from custom_components.tickets_events.store import EventStore
+
+COMMON_WORDS = (
+    "palace museum tour castle garden river cruise art gallery village "
+    "cathedral old town walking food wine tasting night bike market opera "
+    "concert history modern national royal park tower bridge boat zoo"
+).split()
+CITIES = ["Bucharest", "Paris", "London", "Rome", "Braşov", "Kraków", "Zürich"]
+TYPES = ["tour", "museum", "attraction", "show", "activity"]
+QUERIES = ["museum", "mus", "castle garden", "krakow", "wine tasting", "zurich boat"]
+
+
+def make_vocabulary(rng: random.Random, size: int = 20_000) -> list[str]:
+    """Return random filler words with the common words ranked from 100 on."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    filler = sorted(
+        {"".join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(size)}
+    )
+    return filler[:100] + COMMON_WORDS + filler[100:]
+
+
+def make_events(count: int, seed: int = 1) -> list[dict]:
+    """Generate synthetic events with a Zipf-like word distribution."""
+    rng = random.Random(seed)
+    words = make_vocabulary(rng)
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    return [
+        {
+            "id": event_id,
+            "title": " ".join(rng.choices(words, weights, k=4)).title(),
+            "description": " ".join(rng.choices(words, weights, k=25)),
+            "city": rng.choice(CITIES),
+            "type": rng.choice(TYPES),
+        }
+        for event_id in range(count)
+    ]
+
+
+def substring_search(events: list[dict], query: str, limit: int) -> list[dict]:
+    """The scan used by search_sample_events."""
+    query_lower = query.lower()
+    return [
+        e for e in events
+        if query_lower in e["title"].lower()
+        or query_lower in e["description"].lower()
+        or query_lower in e.get("type", "").lower()
+    ][:limit]
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Return the mean duration of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmark."""
+    events = make_events(count)
+    store = EventStore()
+
+    print(f"events: {count}")
+    print(f"initial index build:   {timed(lambda: store.update(events)):10.1f} ms")
+
+    refreshed = list(events)
+    for position in range(0, count, 100):  # 1% of the events change
+        refreshed[position] = {**events[position], "title": "Updated Castle Tour"}
+    print(f"incremental update 1%: {timed(lambda: store.update(refreshed)):10.1f} ms")
+
+    for query in QUERIES:
+        indexed = timed(lambda: store.search(query, limit=50), repeat=20)
+        scanned = timed(lambda: substring_search(refreshed, query, 50), repeat=3)
+        print(
+            f"query {query!r:16} index {indexed:8.2f} ms   "
+            f"substring scan {scanned:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
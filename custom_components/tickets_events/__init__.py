@@ -7,11 +7,19 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
-from .coordinator import TicketsEventsDataUpdateCoordinator
+from .const import (
+    DATA_CALENDARS,
+    DATA_FX,
+    DATA_HUBS,
+    DOMAIN,
+)
+from .coordinator import TicketsEventsHubs
+from .currency import FxRates
+from .services import async_setup_services
+from .views import TicketsEventsCalendarView, TicketsEventsView
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,7 +30,17 @@ CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Set up the Tickets & Events component."""
+    fx = FxRates(hass)
+    await fx.async_load()
+
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][DATA_FX] = fx
+    hass.data[DOMAIN][DATA_HUBS] = TicketsEventsHubs(hass, fx)
+
+    await async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    hass.http.register_view(TicketsEventsView())
+    hass.http.register_view(TicketsEventsCalendarView())
     return True
 
 
@@ -30,15 +48,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tickets & Events from a config entry."""
     _LOGGER.debug("Setting up Tickets & Events integration")
 
-    # Create coordinator
-    coordinator = TicketsEventsDataUpdateCoordinator(hass, entry)
-    
-    # Fetch initial data
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        _LOGGER.error("Error setting up Tickets & Events: %s", err)
-        raise ConfigEntryNotReady from err
+    # Attach to the coordinator shared by entries for the same city, fetching
+    # initial data if this is the first such entry
+    hubs: TicketsEventsHubs = hass.data[DOMAIN][DATA_HUBS]
+    coordinator = await hubs.async_attach(entry)
 
     # Store coordinator
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -46,8 +59,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Register services
-    await _async_setup_services(hass, coordinator)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
 
@@ -61,6 +73,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await hass.data[DOMAIN][DATA_HUBS].async_detach(entry)
+        # The combined calendar may have gone with this entry's platform
+        if (calendars := hass.data[DOMAIN].get(DATA_CALENDARS)) is not None:
+            calendars.async_adopt()
 
     return unload_ok
 
@@ -71,10 +87,14 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await async_setup_entry(hass, entry)
 
 
-async def _async_setup_services(
-    hass: HomeAssistant, coordinator: TicketsEventsDataUpdateCoordinator
-) -> None:
-    """Set up services for the integration."""
-    from .services import async_setup_services
-    
-    await async_setup_services(hass, coordinator)
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options.
+
+    Currency and radius changes only re-render the entities from the shared
+    data; anything else reloads the entry.
+    """
+    if hass.data[DOMAIN][DATA_HUBS].async_display_options_changed(entry):
+        hass.data[DOMAIN][entry.entry_id].async_update_listeners()
+        return
+
+    await hass.config_entries.async_reload(entry.entry_id)
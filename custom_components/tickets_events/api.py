@@ -62,23 +62,18 @@ class RateLimiter:
     async def acquire(self) -> None:
         """Acquire rate limit slot."""
         async with self._lock:
-            now = datetime.now().timestamp()
-            # Remove calls outside the time window
-            self.calls = [call for call in self.calls if now - call < self.period]
-            
-            if len(self.calls) >= self.max_calls:
-                # Calculate wait time
-                oldest_call = min(self.calls)
-                wait_time = self.period - (now - oldest_call)
-                if wait_time > 0:
-                    _LOGGER.warning(
-                        "Rate limit reached. Waiting %.2f seconds", wait_time
-                    )
-                    await asyncio.sleep(wait_time)
-                    # Recursive call after waiting
-                    await self.acquire()
-                    return
-            
+            while True:
+                now = datetime.now().timestamp()
+                # Remove calls outside the time window
+                self.calls = [call for call in self.calls if now - call < self.period]
+                if len(self.calls) < self.max_calls:
+                    break
+
+                # Waiting callers queue on the lock, so slots go out in order
+                wait_time = self.period - (now - min(self.calls))
+                _LOGGER.warning("Rate limit reached. Waiting %.2f seconds", wait_time)
+                await asyncio.sleep(wait_time)
+
             # Add current call
             self.calls.append(now)
 
@@ -90,11 +85,17 @@ class TicketsEventsApiClient:
         self,
         session: aiohttp.ClientSession | None = None,
         use_sample_data: bool = DEFAULT_USE_SAMPLE_DATA,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        Clients given the same rate_limiter share its budget of calls.
+        """
         self._session = session
         self._close_session = False
-        self._rate_limiter = RateLimiter(API_RATE_LIMIT, API_RATE_LIMIT_PERIOD)
+        self._rate_limiter = rate_limiter or RateLimiter(
+            API_RATE_LIMIT, API_RATE_LIMIT_PERIOD
+        )
         self._use_sample_data = use_sample_data
 
         if self._session is None:
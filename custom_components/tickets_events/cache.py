@@ -0,0 +1,58 @@
+"""Caching utilities for Tickets & Events."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+import time
+from typing import Any
+
+
+class LRUCache:
+    """Least-recently-used cache whose entries also expire after a TTL."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Initialize the cache with a size limit and a TTL in seconds."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value under key, evicting the least recently used entry."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries, keeping the counters."""
+        self._entries.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
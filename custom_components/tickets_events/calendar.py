@@ -1,26 +1,42 @@
 """Calendar platform for Tickets & Events integration."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from collections.abc import Iterator, Mapping
+from datetime import date, datetime, timedelta
+import heapq
 import logging
-from typing import Any
+from typing import Any, NamedTuple
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTR_EVENTS,
+    CONF_CURRENCY,
+    DATA_CALENDARS,
+    DEFAULT_CURRENCY,
     DOMAIN,
+    EVENT_DEFAULT_DURATION,
 )
 from .coordinator import TicketsEventsDataUpdateCoordinator
+from .dates import DateSet, calendar_dates, occurrence_span, occurrence_start
+from .timeline import Timeline
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _Series(NamedTuple):
+    """An event and the dates it occurs on."""
+
+    event: Mapping[str, Any]
+    price: float
+    dates: DateSet
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -28,9 +44,69 @@ async def async_setup_entry(
 ) -> None:
     """Set up Tickets & Events calendar."""
     coordinator: TicketsEventsDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    calendars: TicketsEventsCalendars = hass.data[DOMAIN].setdefault(
+        DATA_CALENDARS, TicketsEventsCalendars()
+    )
 
     # Create calendar entity
-    async_add_entities([TicketsEventsCalendar(coordinator, entry)])
+    calendar = TicketsEventsCalendar(coordinator, entry, calendars)
+    async_add_entities([calendar])
+    calendars.async_register(entry.entry_id, calendar, async_add_entities)
+
+
+class TicketsEventsCalendars:
+    """The calendars of all entries and the combined calendar over them.
+
+    The combined calendar is added once a second entry has a calendar, by
+    the platform of the first entry. If that entry is unloaded it goes with
+    it and is added again by a remaining entry, see async_adopt.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.calendars: dict[str, TicketsEventsCalendar] = {}
+        self._add_entities: dict[str, AddEntitiesCallback] = {}
+        self.combined: TicketsEventsCombinedCalendar | None = None
+        self._combined_owner: str | None = None
+
+    @callback
+    def async_register(
+        self,
+        entry_id: str,
+        calendar: TicketsEventsCalendar,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Track the calendar of an entry."""
+        self.calendars[entry_id] = calendar
+        self._add_entities[entry_id] = async_add_entities
+        self.async_adopt()
+        self.async_update()
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Stop tracking the calendar of an entry."""
+        self.calendars.pop(entry_id, None)
+        self._add_entities.pop(entry_id, None)
+        if entry_id == self._combined_owner:
+            # Removed along with the entities of its entry
+            self.combined = None
+            self._combined_owner = None
+        self.async_update()
+
+    @callback
+    def async_adopt(self) -> None:
+        """Add the combined calendar if there are several calendars and none."""
+        if self.combined is not None or len(self.calendars) < 2:
+            return
+        self._combined_owner = next(iter(self._add_entities))
+        self.combined = TicketsEventsCombinedCalendar(self)
+        self._add_entities[self._combined_owner]([self.combined])
+
+    @callback
+    def async_update(self) -> None:
+        """Write the state of the combined calendar."""
+        if self.combined is not None and self.combined.hass is not None:
+            self.combined.async_write_ha_state()
 
 
 class TicketsEventsCalendar(CoordinatorEntity, CalendarEntity):
@@ -42,38 +118,63 @@ class TicketsEventsCalendar(CoordinatorEntity, CalendarEntity):
         self,
         coordinator: TicketsEventsDataUpdateCoordinator,
         entry: ConfigEntry,
+        calendars: TicketsEventsCalendars,
     ) -> None:
         """Initialize the calendar."""
         super().__init__(coordinator)
         self.entry = entry
+        self._calendars = calendars
         
         # Entity IDs
         self._attr_unique_id = f"{entry.entry_id}_calendar"
         self._attr_name = "Events Calendar"
         self._attr_icon = "mdi:calendar-star"
 
+        self._timeline: Timeline[_Series] | None = None
+        self._timeline_key: tuple[Any, ...] | None = None
+        # (start, day, series) of the next occurrence, kept until it starts
+        self._upcoming: tuple[datetime, date, _Series] | None = None
+        self._currency = DEFAULT_CURRENCY
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         return self.coordinator.last_update_success and self.coordinator.data is not None
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Leave the combined calendar."""
+        await super().async_will_remove_from_hass()
+        self._calendars.async_unregister(self.entry.entry_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the calendar and the combined calendar."""
+        super()._handle_coordinator_update()
+        self._calendars.async_update()
+
     @property
     def event(self) -> CalendarEvent | None:
         """Return the next upcoming event."""
-        events = self._get_calendar_events()
-        
-        if not events:
-            return None
-        
-        # Return the first upcoming event
+        timeline = self._get_timeline()
         now = dt_util.now()
-        upcoming = [e for e in events if e.start >= now]
-        
-        if upcoming:
-            return upcoming[0]
-        
+        if (upcoming := self._upcoming) is not None and upcoming[0] >= now:
+            return self._occurrence(upcoming[2], upcoming[1])
+
+        # The occurrences of a day all start together, skip today's once started
+        today = now.date()
+        found = timeline.first_from(today)
+        if found is not None and occurrence_start(found[0]) < now:
+            found = timeline.first_from(today + timedelta(days=1))
+        if found is not None:
+            day, series = found
+            self._upcoming = (occurrence_start(day), day, series)
+            return self._occurrence(series, day)
+
         # If no upcoming events, return the first event
-        return events[0] if events else None
+        if (found := timeline.first()) is None:
+            return None
+        day, series = found
+        return self._occurrence(series, day)
 
     async def async_get_events(
         self,
@@ -87,106 +188,155 @@ class TicketsEventsCalendar(CoordinatorEntity, CalendarEntity):
             start_date.isoformat(),
             end_date.isoformat()
         )
-        
-        events = self._get_calendar_events()
-        
-        # Filter events within the requested date range
-        filtered_events = [
-            event for event in events
+
+        events = list(self.iter_events(start_date, end_date))
+
+        _LOGGER.debug("Returning %d calendar events", len(events))
+        return events
+
+    def iter_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[CalendarEvent]:
+        """Yield the events of a date range by start, expanded as they are consumed."""
+        # Occurrences are expanded only for the days of the range, and the
+        # occurrences of a day all start together
+        first_day = dt_util.as_local(start_date - EVENT_DEFAULT_DURATION).date()
+        last_day = dt_util.as_local(end_date).date()
+        if occurrence_span(first_day)[1] <= start_date:
+            first_day += timedelta(days=1)
+        if occurrence_start(last_day) >= end_date:
+            last_day -= timedelta(days=1)
+        occurrences = (
+            self._occurrence(series, day)
+            for day, series in self._get_timeline().between(first_day, last_day)
+        )
+        return (
+            event for event in occurrences
             if event.start < end_date and event.end > start_date
-        ]
-        
-        _LOGGER.debug("Returning %d calendar events", len(filtered_events))
-        return filtered_events
+        )
+
+    def _get_timeline(self) -> Timeline[_Series]:
+        """Return the calendar series, rebuilt only when their inputs change."""
+        currency = self.entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+        # Undated events are shown today, so the day is part of the key
+        key = (
+            self.coordinator.data_version,
+            self.coordinator.fx.updated,
+            currency,
+            dt_util.now().date(),
+        )
+        if self._timeline is None or key != self._timeline_key:
+            series = self._get_series(currency)
+            # Within a day, series starting earlier come first
+            self._timeline = Timeline(
+                (item, item.dates)
+                for item in sorted(series, key=lambda item: item.dates.first)
+            )
+            self._timeline_key = key
+            self._currency = currency
+            self._upcoming = None
+            _LOGGER.debug(
+                "Built %d calendar series with %d occurrences",
+                len(series),
+                sum(len(item.dates) for item in series),
+            )
+        return self._timeline
 
-    def _get_calendar_events(self) -> list[CalendarEvent]:
-        """Convert events to calendar events."""
+    def _get_series(self, currency: str) -> list[_Series]:
+        """Return the dates of each event, packed."""
         if not self.coordinator.data:
             return []
 
-        events_data = self.coordinator.data.get("events", {})
-        events = events_data.get("events", [])
-        
-        calendar_events = []
+        events = self.coordinator.store.events
+        today = dt_util.now().date()
+        prices = self.coordinator.fx.event_prices(events, currency)
+
+        series = []
+        for event, price in zip(events, prices):
+            if dates := calendar_dates(event, today):
+                series.append(_Series(event, price, dates))
+        return series
+
+    def _occurrence(self, series: _Series, day: date) -> CalendarEvent:
+        """Return the calendar event of a series on day."""
+        event = series.event
+        start_time, end_time = occurrence_span(day)
+        description, location = self.coordinator.store.describe(
+            event, series.price, self._currency
+        )
+        return CalendarEvent(
+            start=start_time,
+            end=end_time,
+            summary=event.get("title", "Event"),
+            description=description,
+            location=location,
+            uid=f"{event.get('id')}_{day.isoformat()}",
+        )
+
+
+class TicketsEventsCombinedCalendar(CalendarEntity):
+    """Events of all entries in one calendar.
+
+    The already sorted events of each entry are merged lazily, and events
+    listed by more than one entry (same event on the same day) are shown once.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, calendars: TicketsEventsCalendars) -> None:
+        """Initialize the calendar."""
+        self._calendars = calendars
+        self._attr_unique_id = f"{DOMAIN}_all_calendar"
+        self._attr_name = "All Events Calendar"
+        self._attr_icon = "mdi:calendar-multiple"
+
+    @property
+    def available(self) -> bool:
+        """Return if any entry calendar is available."""
+        return any(calendar.available for calendar in self._calendars.calendars.values())
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming event over all entries."""
         now = dt_util.now()
-        
-        for event in events:
-            # Get event date or use available dates
-            event_date = event.get("date")
-            available_dates = event.get("available_dates", [])
-            
-            # If no specific date, use available dates or default to today
-            dates_to_process = []
-            if event_date:
-                dates_to_process = [event_date]
-            elif available_dates:
-                dates_to_process = available_dates
-            else:
-                # Default to today
-                dates_to_process = [now.date().isoformat()]
-            
-            # Create a calendar event for each available date
-            for date_str in dates_to_process:
-                try:
-                    # Parse the date
-                    event_date_obj = datetime.fromisoformat(date_str)
-                    
-                    # Set event time (default to 10:00 AM - 6:00 PM for all-day events)
-                    start_time = event_date_obj.replace(hour=10, minute=0, second=0, microsecond=0)
-                    # Make timezone aware
-                    start_time = dt_util.as_local(start_time)
-                    
-                    # End time (8 hours later for tours/activities)
-                    end_time = start_time + timedelta(hours=8)
-                    
-                    # Create calendar event
-                    calendar_event = CalendarEvent(
-                        start=start_time,
-                        end=end_time,
-                        summary=event.get("title", "Event"),
-                        description=self._format_description(event),
-                        location=f"{event.get('city', '')}, {event.get('country', '')}".strip(", "),
-                        uid=f"{event.get('id')}_{date_str}",
-                    )
-                    
-                    calendar_events.append(calendar_event)
-                    
-                except (ValueError, TypeError) as err:
-                    _LOGGER.warning("Error parsing date %s for event %s: %s", date_str, event.get("id"), err)
-                    continue
-        
-        # Sort by start date
-        calendar_events.sort(key=lambda x: x.start)
-        
-        return calendar_events
+        events = [
+            event
+            for calendar in self._calendars.calendars.values()
+            if calendar.available and (event := calendar.event) is not None
+        ]
+        upcoming = [event for event in events if event.start >= now]
+        return min(upcoming or events, key=lambda event: event.start, default=None)
 
-    def _format_description(self, event: dict[str, Any]) -> str:
-        """Format event description for calendar."""
-        description_parts = []
-        
-        # Add main description
-        if desc := event.get("description"):
-            description_parts.append(desc)
-        
-        # Add price
-        price = event.get("price", 0)
-        currency = event.get("currency", "EUR")
-        if price > 0:
-            description_parts.append(f"\n💰 Price: {price:.2f} {currency}")
-        else:
-            description_parts.append("\n💰 Free Entry")
-        
-        # Add rating
-        if rating := event.get("rating"):
-            rating_count = event.get("rating_count", 0)
-            description_parts.append(f"⭐ Rating: {rating}/5 ({rating_count} reviews)")
-        
-        # Add type
-        if event_type := event.get("type"):
-            description_parts.append(f"📍 Type: {event_type.replace('_', ' ').title()}")
-        
-        # Add booking URL
-        if booking_url := event.get("booking_url"):
-            description_parts.append(f"\n🎫 Book now: {booking_url}")
-        
-        return "\n".join(description_parts)
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Get the events of all entries in a date range."""
+        return list(self.iter_events(start_date, end_date))
+
+    def iter_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterator[CalendarEvent]:
+        """Yield the events of all entries in a date range by start, once each."""
+        merged = heapq.merge(
+            *(
+                calendar.iter_events(start_date, end_date)
+                for calendar in self._calendars.calendars.values()
+                if calendar.available
+            ),
+            key=lambda event: event.start,
+        )
+        # Duplicates start at the same time, only the current start needs remembering
+        seen: set[str | None] = set()
+        seen_start: datetime | None = None
+        for event in merged:
+            if event.start != seen_start:
+                seen.clear()
+                seen_start = event.start
+            if event.uid in seen:
+                continue
+            seen.add(event.uid)
+            yield event
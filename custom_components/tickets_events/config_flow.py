@@ -13,12 +13,17 @@ from homeassistant.helpers import selector
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
+    CONF_ATTRIBUTE_BUDGET,
     CONF_CITY_ID,
     CONF_CITY_NAME,
     CONF_CURRENCY,
+    CONF_NEARBY_ENTITY,
+    CONF_NEARBY_RADIUS,
     CONF_USE_LOCATION,
     CONF_USE_SAMPLE_DATA,
+    DEFAULT_ATTRIBUTE_BUDGET,
     DEFAULT_CURRENCY,
+    DEFAULT_NEARBY_RADIUS,
     DEFAULT_USE_SAMPLE_DATA,
     DOMAIN,
     SUPPORTED_CURRENCIES,
@@ -186,10 +191,17 @@ class TicketsEventsOptionsFlowHandler(config_entries.OptionsFlow):
                 errors["base"] = "cannot_connect"
 
         if user_input is not None:
+            data = {**self.config_entry.data, **user_input}
+            # An emptied entity selector means "use the home location"
+            if not user_input.get(CONF_NEARBY_ENTITY):
+                data.pop(CONF_NEARBY_ENTITY, None)
+            if CONF_ATTRIBUTE_BUDGET in user_input:
+                data[CONF_ATTRIBUTE_BUDGET] = int(user_input[CONF_ATTRIBUTE_BUDGET])
+
             # Update config entry
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
-                data={**self.config_entry.data, **user_input},
+                data=data,
             )
             return self.async_create_entry(title="", data={})
 
@@ -214,6 +226,11 @@ class TicketsEventsOptionsFlowHandler(config_entries.OptionsFlow):
         # Get current values
         current_city = self.config_entry.data.get(CONF_CITY_ID, "auto")
         current_currency = self.config_entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+        current_radius = self.config_entry.data.get(CONF_NEARBY_RADIUS, DEFAULT_NEARBY_RADIUS)
+        current_entity = self.config_entry.data.get(CONF_NEARBY_ENTITY)
+        current_budget = self.config_entry.data.get(
+            CONF_ATTRIBUTE_BUDGET, DEFAULT_ATTRIBUTE_BUDGET
+        )
 
         data_schema = vol.Schema(
             {
@@ -231,6 +248,36 @@ class TicketsEventsOptionsFlowHandler(config_entries.OptionsFlow):
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
                 ),
+                vol.Required(
+                    CONF_NEARBY_RADIUS, default=current_radius
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=1,
+                        max=500,
+                        step=1,
+                        unit_of_measurement="km",
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
+                vol.Optional(
+                    CONF_NEARBY_ENTITY,
+                    description={"suggested_value": current_entity},
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain=["person", "device_tracker", "zone"],
+                    )
+                ),
+                vol.Required(
+                    CONF_ATTRIBUTE_BUDGET, default=current_budget
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=1024,
+                        max=262144,
+                        step=1024,
+                        unit_of_measurement="B",
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
             }
         )
 
@@ -1,10 +1,15 @@
 """Constants for the Tickets & Events integration."""
-from datetime import timedelta
+from datetime import time, timedelta
 from typing import Final
 
 # Domain
 DOMAIN: Final = "tickets_events"
 
+# hass.data keys
+DATA_HUBS: Final = "hubs"
+DATA_FX: Final = "fx"
+DATA_CALENDARS: Final = "calendars"
+
 # Configuration
 CONF_CITY_ID: Final = "city_id"
 CONF_CITY_NAME: Final = "city_name"
@@ -12,6 +17,9 @@ CONF_CURRENCY: Final = "currency"
 CONF_USE_LOCATION: Final = "use_location"
 CONF_UPDATE_INTERVAL: Final = "update_interval"
 CONF_USE_SAMPLE_DATA: Final = "use_sample_data"
+CONF_NEARBY_RADIUS: Final = "nearby_radius"
+CONF_NEARBY_ENTITY: Final = "nearby_entity"
+CONF_ATTRIBUTE_BUDGET: Final = "attribute_budget"
 
 # Defaults
 DEFAULT_CURRENCY: Final = "EUR"
@@ -19,6 +27,8 @@ DEFAULT_UPDATE_INTERVAL: Final = timedelta(hours=24)  # Once per day
 DEFAULT_MAX_EVENTS: Final = 50
 DEFAULT_TIMEOUT: Final = 30
 DEFAULT_USE_SAMPLE_DATA: Final = True  # Use sample data by default for testing
+DEFAULT_NEARBY_RADIUS: Final = 50  # km
+DEFAULT_ATTRIBUTE_BUDGET: Final = 16384  # bytes, the recorder's attribute limit
 
 # API
 API_BASE_URL: Final = "https://bff.mangocity.md/events"
@@ -38,6 +48,8 @@ SENSOR_TODAY: Final = "today"
 SENSOR_NEARBY: Final = "nearby"
 SENSOR_CALENDAR: Final = "calendar"
 SENSOR_SEARCH: Final = "search"
+SENSOR_CATEGORY: Final = "category"
+SENSOR_NEXT: Final = "next"
 
 SENSOR_TYPES: Final = [
     SENSOR_TODAY,
@@ -51,17 +63,27 @@ SERVICE_SEARCH_EVENTS: Final = "search_events"
 SERVICE_GET_EVENTS_BY_DATE: Final = "get_events_by_date"
 SERVICE_GENERATE_BOOKING_URL: Final = "generate_booking_url"
 SERVICE_REFRESH_EVENTS: Final = "refresh_events"
+SERVICE_GENERATE_BOOKING_URLS: Final = "generate_booking_urls"
+SERVICE_QUERY_EVENTS: Final = "query_events"
 
 # Service Parameters
 ATTR_QUERY: Final = "query"
 ATTR_DATE_FROM: Final = "date_from"
 ATTR_DATE_TO: Final = "date_to"
 ATTR_EVENT_ID: Final = "event_id"
+ATTR_EVENT_IDS: Final = "event_ids"
+ATTR_QR_CODE: Final = "qr_code"
 ATTR_DATE: Final = "date"
 ATTR_TIMESLOT: Final = "timeslot"
 ATTR_TICKETS: Final = "tickets"
 ATTR_LANGUAGE: Final = "language"
 ATTR_SENSOR: Final = "sensor"
+ATTR_FALLBACK_TO_API: Final = "fallback_to_api"
+ATTR_ENTRY_ID: Final = "entry_id"
+ATTR_CITY_ID: Final = "city_id"
+ATTR_FIELDS: Final = "fields"
+ATTR_LIMIT: Final = "limit"
+ATTR_CURSOR: Final = "cursor"
 
 # Event attributes
 ATTR_EVENTS: Final = "events"
@@ -69,6 +91,16 @@ ATTR_DESTINATION_TITLE: Final = "destination_title"
 ATTR_DESTINATION_URL: Final = "destination_url"
 ATTR_LOCATION_TYPE: Final = "location_type"
 ATTR_LAST_UPDATED: Final = "last_updated"
+ATTR_CATEGORY: Final = "category"
+ATTR_MIN_PRICE: Final = "min_price"
+ATTR_MEDIAN_PRICE: Final = "median_price"
+ATTR_AVERAGE_RATING: Final = "average_rating"
+ATTR_RATING_COUNT: Final = "rating_count"
+
+# Events with only a date are shown from 10:00 to 18:00 local time
+EVENT_DEFAULT_START: Final = time(10, 0)
+EVENT_DEFAULT_DURATION: Final = timedelta(hours=8)
+DATE_CACHE_SIZE: Final = 4096  # Parsed date strings and day spans kept
 
 # Event fields
 EVENT_ID: Final = "id"
@@ -87,6 +119,75 @@ EVENT_TYPE: Final = "type"
 EVENT_IS_CHECKOUT_DISABLED: Final = "is_checkout_disabled"
 EVENT_QR_CODE: Final = "qr_code_data"
 
+# Trimming applied, in order, to sensor events until the attributes fit the
+# budget: (field, None) drops the field, (field, n) keeps its first n items/chars
+ATTRIBUTE_TRIM_STEPS: Final = (
+    (EVENT_QR_CODE, None),
+    (EVENT_IMAGES, 1),
+    (EVENT_DESCRIPTION, 200),
+    (EVENT_IMAGES, None),
+    (EVENT_BOOKING_URL_FULL, None),
+    (EVENT_DESCRIPTION, None),
+)
+
+# Local search
+SEARCH_BM25_K1: Final = 1.2
+SEARCH_BM25_B: Final = 0.75
+SEARCH_PREFIX_WEIGHT: Final = 0.8  # Score factor for prefix (non-exact) matches
+SEARCH_CACHE_SIZE: Final = 128  # Cached search results
+SEARCH_CACHE_TTL: Final = 900  # seconds
+SEARCH_FIELD_WEIGHTS: Final = {
+    EVENT_TITLE: 3.0,
+    EVENT_TYPE: 2.0,
+    EVENT_CITY: 1.5,
+    EVENT_DESCRIPTION: 1.0,
+}
+
+# Data refreshed by refresh_events
+REFRESH_ALL: Final = "all"
+REFRESH_EVENTS: Final = "events"
+REFRESH_RATES: Final = "rates"
+REFRESH_SEARCH: Final = "search"
+# Sensor or data type -> the data behind it
+REFRESH_TARGETS: Final = {
+    "today": REFRESH_EVENTS,
+    "nearby": REFRESH_EVENTS,
+    "next": REFRESH_EVENTS,
+    "category": REFRESH_EVENTS,
+    "calendar": REFRESH_EVENTS,
+    "events": REFRESH_EVENTS,
+    "search": REFRESH_SEARCH,
+    "rates": REFRESH_RATES,
+    "all": REFRESH_ALL,
+}
+REFRESH_COALESCE_WINDOW: Final = 10  # seconds a refresh result is shared
+
+# Event store
+STORE_CHANGELOG_SIZE: Final = 20  # Updates kept to answer "changes since"
+
+# Websocket API
+WS_DEFAULT_PAGE_SIZE: Final = 20
+WS_MAX_PAGE_SIZE: Final = 200
+
+# Services
+SERVICE_MAX_PAGE_SIZE: Final = 200
+
+# Price history
+PRICE_HISTORY_SIZE: Final = 96  # Samples kept per event
+PRICE_HISTORY_MAX_EVENTS: Final = 200  # Events tracked per coordinator
+
+# HTTP API
+VIEW_CACHE_SIZE: Final = 16  # Serialized responses kept
+VIEW_CACHE_TTL: Final = 3600  # seconds
+
+# iCalendar feed
+ICS_CHUNK_SIZE: Final = 32768  # characters written at a time
+ICS_DEFAULT_PAST: Final = timedelta(days=7)
+ICS_DEFAULT_FUTURE: Final = timedelta(days=90)
+
+# Spatial index
+GEO_CELL_SIZE: Final = 0.1  # degrees, roughly 11 km of latitude
+
 # Currencies
 SUPPORTED_CURRENCIES: Final = [
     "EUR",  # Euro
@@ -100,6 +201,34 @@ SUPPORTED_CURRENCIES: Final = [
     "CNY",  # Chinese Yuan
 ]
 
+# Prices are fetched and stored in this currency and converted locally
+CANONICAL_CURRENCY: Final = "EUR"
+
+# Decimals shown per currency, 2 when not listed
+CURRENCY_DECIMALS: Final = {
+    "JPY": 0,
+    "CNY": 0,
+}
+
+# Exchange rates
+FX_RATES_URL: Final = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"
+FX_REFRESH_INTERVAL: Final = timedelta(days=7)
+FX_STORAGE_KEY: Final = f"{DOMAIN}.fx_rates"
+FX_STORAGE_VERSION: Final = 1
+
+# Fallback rates (units per EUR) until the ECB reference rates are fetched
+DEFAULT_FX_RATES: Final = {
+    "EUR": 1.0,
+    "USD": 1.08,
+    "GBP": 0.85,
+    "RON": 4.97,
+    "CHF": 0.95,
+    "AUD": 1.65,
+    "CAD": 1.47,
+    "JPY": 162.0,
+    "CNY": 7.8,
+}
+
 # Languages
 SUPPORTED_LANGUAGES: Final = [
     "eng",  # English
@@ -135,6 +264,8 @@ QR_CODE_VERSION: Final = 1
 QR_CODE_ERROR_CORRECTION: Final = "L"  # ~7% error correction
 QR_CODE_BOX_SIZE: Final = 10
 QR_CODE_BORDER: Final = 4
+QR_CODE_CACHE_SIZE: Final = 256  # Rendered codes kept, by URL
+QR_CODE_MIN_SIZE: Final = 600  # bytes, below any rendered code as a data URI
 
 # Error messages
 ERROR_CANNOT_CONNECT: Final = "cannot_connect"
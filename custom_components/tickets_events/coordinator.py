@@ -1,62 +1,132 @@
 """DataUpdateCoordinator for Tickets & Events."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Sequence
+from datetime import datetime, timedelta
 import logging
 from typing import Any
 
+from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
 from .api import (
+    RateLimiter,
     TicketsEventsApiClient,
     TicketsEventsApiClientCommunicationError,
     TicketsEventsApiClientError,
 )
 from .const import (
+    API_RATE_LIMIT,
+    API_RATE_LIMIT_PERIOD,
+    CANONICAL_CURRENCY,
+    CONF_ATTRIBUTE_BUDGET,
     CONF_CITY_ID,
     CONF_CITY_NAME,
     CONF_CURRENCY,
+    CONF_NEARBY_RADIUS,
     CONF_USE_SAMPLE_DATA,
     DEFAULT_CURRENCY,
+    DEFAULT_MAX_EVENTS,
     DEFAULT_UPDATE_INTERVAL,
     DEFAULT_USE_SAMPLE_DATA,
     DOMAIN,
+    REFRESH_COALESCE_WINDOW,
+    REFRESH_EVENTS,
+    REFRESH_RATES,
+    REFRESH_SEARCH,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
 )
+from .cache import LRUCache
+from .currency import FxRates
+from .helpers import project_event
+from .history import PriceHistory
+from .records import EventRecord
+from .search import normalize_query
+from .store import EventStore
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# Entry options that only change how shared data is displayed
+DISPLAY_OPTIONS = {CONF_ATTRIBUTE_BUDGET, CONF_CURRENCY, CONF_NEARBY_RADIUS}
+
+
+def hub_key(entry: ConfigEntry) -> tuple[str, bool]:
+    """Return the key of the shared coordinator serving a config entry."""
+    return (
+        entry.data.get(CONF_CITY_ID, "auto"),
+        entry.data.get(CONF_USE_SAMPLE_DATA, DEFAULT_USE_SAMPLE_DATA),
+    )
+
+
+@callback
+def async_get_entry_coordinator(
+    hass: HomeAssistant, entry_id: str
+) -> tuple[TicketsEventsDataUpdateCoordinator, str] | None:
+    """Return the coordinator and currency of a loaded config entry."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if not isinstance(coordinator, TicketsEventsDataUpdateCoordinator) or entry is None:
+        return None
+    return coordinator, entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+
+
 class TicketsEventsDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Tickets & Events data."""
+    """Class to manage fetching Tickets & Events data.
 
-    config_entry: ConfigEntry
+    One coordinator is shared by all config entries showing the same city, see
+    TicketsEventsHubs. Prices are fetched in the canonical currency and each
+    entry converts them to its own currency with the shared FxRates table.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
+        fx: FxRates,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         """Initialize."""
-        self.config_entry = entry
-        
         # Get use_sample_data from entry data, default to True
-        use_sample_data = entry.data.get(CONF_USE_SAMPLE_DATA, DEFAULT_USE_SAMPLE_DATA)
+        self.use_sample_data = entry.data.get(CONF_USE_SAMPLE_DATA, DEFAULT_USE_SAMPLE_DATA)
         
         self.api = TicketsEventsApiClient(
             session=aiohttp_client.async_get_clientsession(hass),
-            use_sample_data=use_sample_data,
+            use_sample_data=self.use_sample_data,
+            rate_limiter=rate_limiter,
         )
         
         # Get configuration
         self.city_id = entry.data.get(CONF_CITY_ID, "auto")
         self.city_name = entry.data.get(CONF_CITY_NAME, "Unknown")
-        self.currency = entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+        self.fx = fx
+
+        # Local copy of the fetched events, indexed for search
+        self.store = EventStore()
+        self._search_cache = LRUCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+        self._search_cache_version = self.store.version
+        self.price_history = PriceHistory()
+
+        # Bumped, with the time, only when a refresh brings different data
+        self.data_version = 0
+        self.data_updated: datetime | None = None
+
+        # Config entries attached to this coordinator
+        self.entry_ids: set[str] = set()
+
+        # Latest refresh_events run per part, shared by overlapping requests
+        self._refreshes: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self._refreshed_at: dict[str, float] = {}
         
         super().__init__(
             hass,
@@ -67,6 +137,10 @@ class TicketsEventsDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via library."""
+        return await self._async_fetch(refresh_rates=True)
+
+    async def _async_fetch(self, refresh_rates: bool) -> dict[str, Any]:
+        """Fetch the events, and the exchange rates if stale and refresh_rates."""
         try:
             # If city_id is "auto", resolve location first
             city_id = self.city_id
@@ -86,26 +160,52 @@ class TicketsEventsDataUpdateCoordinator(DataUpdateCoordinator):
                     else:
                         raise UpdateFailed("No city available and location resolution failed")
 
+            if refresh_rates and not self.use_sample_data:
+                await self.fx.async_refresh_if_stale()
+
             # Fetch events for the city
             events_data = await self.api.get_events_by_city(
                 city_id=city_id,
-                currency=self.currency,
+                currency=CANONICAL_CURRENCY,
             )
             
             _LOGGER.debug("Fetched events data: %s events for city %s", 
                          len(events_data.get("events", [])), city_id)
             
+            events = events_data.get("events", [])
+            if self.store.version:
+                # Re-index only the events that changed since the last refresh
+                events_changed = self.store.update(events)
+            else:
+                # The first fill indexes every event, build it off the event loop
+                store = EventStore()
+                events_changed = await self.hass.async_add_executor_job(
+                    store.update, events
+                )
+                self.store = store
+
+            now = dt_util.utcnow()
+            self.price_history.record(self.store.events, now)
+            self.price_history.async_publish(self.hass, now)
+
             # Store city information
             if city_id and city_id != self.city_id:
                 # Update stored city_id if it was auto-detected
                 self.city_id = city_id
 
-            return {
+            # The events themselves live in the store, keep only the metadata
+            data = {
                 "city_id": city_id,
                 "city_name": self.city_name,
-                "currency": self.currency,
-                "events": events_data,
+                "currency": CANONICAL_CURRENCY,
+                "events": {
+                    key: value for key, value in events_data.items() if key != "events"
+                },
             }
+            if events_changed or data != self.data:
+                self.data_version += 1
+                self.data_updated = now
+            return data
 
         except TicketsEventsApiClientCommunicationError as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
@@ -114,45 +214,296 @@ class TicketsEventsDataUpdateCoordinator(DataUpdateCoordinator):
         except Exception as err:
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
+    async def async_refresh_part(self, part: str) -> dict[str, Any]:
+        """Refresh one part of the data: events, rates, search or all.
+
+        Callers asking for a part that is being refreshed, or was refreshed
+        less than REFRESH_COALESCE_WINDOW seconds ago, share that refresh and
+        get its result.
+        """
+        task = self._refreshes.get(part)
+        if task is None or (
+            task.done()
+            and (
+                task.cancelled()
+                or task.exception() is not None
+                or self.hass.loop.time() - self._refreshed_at[part]
+                >= REFRESH_COALESCE_WINDOW
+            )
+        ):
+            task = self.hass.async_create_task(self._async_refresh_part(part))
+            self._refreshes[part] = task
+        else:
+            _LOGGER.debug("Coalescing %s refresh request", part)
+        return await asyncio.shield(task)
+
+    async def _async_refresh_part(self, part: str) -> dict[str, Any]:
+        """Refresh one part of the data and describe the result."""
+        version = self.data_version
+        try:
+            if part == REFRESH_SEARCH:
+                # Searches run on the stored events, forgetting results is enough
+                self._search_cache.clear()
+            elif part == REFRESH_RATES:
+                await self.fx.async_refresh_if_stale(force=True)
+                self.async_update_listeners()
+            elif part == REFRESH_EVENTS:
+                self.async_set_updated_data(await self._async_fetch(refresh_rates=False))
+            else:
+                await self.async_refresh()
+                if not self.last_update_success:
+                    raise self.last_exception
+        finally:
+            self._refreshed_at[part] = self.hass.loop.time()
+
+        return {
+            "refreshed": part,
+            "changed": self.data_version != version,
+            "version": self.data_version,
+            "events": len(self.store),
+        }
+
+    def search_matches(self, query: str) -> list[tuple[EventRecord, float]]:
+        """Return (event, search score) pairs matching query, best match first.
+
+        Matches are cached until the events change, so pages of the same
+        search are cut from one ranking.
+        """
+        # Cached results are only valid for the data they were computed from
+        if self._search_cache_version != self.store.version:
+            self._search_cache.clear()
+            self._search_cache_version = self.store.version
+
+        cache_key = (normalize_query(query),)
+        if (matches := self._search_cache.get(cache_key)) is None:
+            matches = self.store.search_scored(query)
+            self._search_cache.set(cache_key, matches)
+        return matches
+
     async def async_search_events(
         self,
         query: str,
         currency: str | None = None,
+        fallback_to_api: bool = False,
     ) -> dict[str, Any]:
-        """Search for events."""
+        """Search for events.
+
+        Cached events are searched locally and priced in currency. The API is
+        only queried when nothing matched locally and fallback_to_api is set.
+        """
         if currency is None:
-            currency = self.currency
-        
+            currency = CANONICAL_CURRENCY
+
+        events = [event for event, _score in self.search_matches(query)]
+        if events or not fallback_to_api:
+            _LOGGER.debug("Found %d cached events matching '%s'", len(events), query)
+            return {
+                "events": self.fx.localize_events(events[:DEFAULT_MAX_EVENTS], currency),
+                "destination_title": f"Search: {query}",
+                "location_type": "search",
+                "total_count": len(events),
+                "query": query,
+                "currency": currency,
+                "source": "local",
+            }
+
+        cache_key = (normalize_query(query), currency)
+        if (results := self._search_cache.get(cache_key)) is not None:
+            return results
+
         try:
-            return await self.api.search_events(query=query, currency=currency)
+            results = await self.api.search_events(query=query, currency=currency)
         except Exception as err:
             _LOGGER.error("Error searching events: %s", err)
             raise
 
-    async def async_get_events_by_date(
+        self._search_cache.set(cache_key, results)
+        return results
+
+    def events_snapshot(
+        self, currency: str, fields: Sequence[str] | None = None
+    ) -> dict[str, Any]:
+        """Return all stored events priced in currency."""
+        events = self.store.events
+        prices = self.fx.event_prices(events, currency)
+        return {
+            "version": self.store.version,
+            "currency": currency,
+            "events": [
+                project_event(event, currency, price, fields)
+                for event, price in zip(events, prices)
+            ],
+        }
+
+    def events_changes(
         self,
-        date_from: str,
-        date_to: str,
-        currency: str | None = None,
+        version: int,
+        currency: str,
+        fields: Sequence[str] | None = None,
+        reset: bool = False,
     ) -> dict[str, Any]:
-        """Get events by date range."""
-        if currency is None:
-            currency = self.currency
-        
-        city_id = self.city_id
-        if city_id == "auto":
-            # Use the resolved city_id from last update
-            city_id = self.data.get("city_id") if self.data else None
-            if not city_id:
-                raise ValueError("City not resolved yet. Please wait for initial data update.")
-        
+        """Return the events added, changed or removed since a store version.
+
+        When reset is set or the changes are no longer known, every event is
+        returned as changed and "reset" is set.
+        """
+        store = self.store
+        if (changes := None if reset else store.changes_since(version)) is None:
+            events = store.events
+            removed: list[Any] = []
+        else:
+            changed, removed_ids = changes
+            events = [event for event_id in changed if (event := store.get(event_id))]
+            removed = sorted(removed_ids, key=str)
+
+        prices = self.fx.event_prices(events, currency)
+        return {
+            "version": store.version,
+            "currency": currency,
+            "reset": changes is None,
+            "changed": [
+                project_event(event, currency, price, fields)
+                for event, price in zip(events, prices)
+            ],
+            "removed": removed,
+        }
+
+    @property
+    def search_cache_stats(self) -> dict[str, Any]:
+        """Return hit and miss counters of the search cache."""
+        return self._search_cache.as_dict()
+
+
+class TicketsEventsHubs:
+    """Reference-counted coordinators shared between config entries."""
+
+    def __init__(self, hass: HomeAssistant, fx: FxRates) -> None:
+        """Initialize the registry."""
+        self._hass = hass
+        self._fx = fx
+        # One budget of API calls for all coordinators, however many cities
+        self._rate_limiter = RateLimiter(API_RATE_LIMIT, API_RATE_LIMIT_PERIOD)
+        self._lock = asyncio.Lock()
+        self._hubs: dict[tuple[str, bool], TicketsEventsDataUpdateCoordinator] = {}
+        self._entries: dict[str, TicketsEventsDataUpdateCoordinator] = {}
+        # Entry data at attach time, to tell display-only option changes apart
+        self._entry_data: dict[str, dict[str, Any]] = {}
+
+    async def async_attach(self, entry: ConfigEntry) -> TicketsEventsDataUpdateCoordinator:
+        """Return the coordinator for an entry, creating it on first use."""
+        key = hub_key(entry)
+        if key[0] == "auto":
+            key = (await self._async_resolve_city(entry), *key[1:])
+
+        # Entries are set up concurrently, only one may create a given hub
+        async with self._lock:
+            coordinator = self._hubs.get(key)
+            if coordinator is None:
+                coordinator = await self._async_create(entry)
+                self._hubs[key] = coordinator
+            else:
+                _LOGGER.debug("Sharing coordinator for %s with entry %s", key, entry.entry_id)
+
+            coordinator.entry_ids.add(entry.entry_id)
+            self._entries[entry.entry_id] = coordinator
+            self._entry_data[entry.entry_id] = dict(entry.data)
+
+        return coordinator
+
+    async def async_detach(self, entry: ConfigEntry) -> None:
+        """Detach an entry, shutting its coordinator down once unused."""
+        async with self._lock:
+            coordinator = self._entries.pop(entry.entry_id, None)
+            self._entry_data.pop(entry.entry_id, None)
+            if coordinator is None:
+                return
+
+            coordinator.entry_ids.discard(entry.entry_id)
+            if coordinator.entry_ids:
+                return
+
+            for key in [key for key, hub in self._hubs.items() if hub is coordinator]:
+                del self._hubs[key]
+
+        _LOGGER.debug("Shutting down unused coordinator for %s", coordinator.city_id)
+        await coordinator.async_shutdown()
+        await coordinator.api.close()
+
+    @callback
+    def async_targets(
+        self, entry_id: str | None = None, city_id: str | None = None
+    ) -> list[tuple[TicketsEventsDataUpdateCoordinator, str]]:
+        """Return the coordinators matching entry_id and city_id, each once.
+
+        Each comes with the currency of its first matching entry. Without
+        entry_id or city_id every coordinator is returned.
+        """
+        targets: dict[TicketsEventsDataUpdateCoordinator, str] = {}
+        for attached_id, coordinator in self._entries.items():
+            if entry_id is not None and attached_id != entry_id:
+                continue
+            if city_id is not None and str(coordinator.city_id) != city_id:
+                continue
+            targets.setdefault(
+                coordinator,
+                self._entry_data[attached_id].get(CONF_CURRENCY, DEFAULT_CURRENCY),
+            )
+        return list(targets.items())
+
+    @callback
+    def async_display_options_changed(self, entry: ConfigEntry) -> bool:
+        """Return True if only display options of an attached entry changed.
+
+        Such changes are applied in place instead of reloading the entry.
+        """
+        old_data = self._entry_data.get(entry.entry_id)
+        if old_data is None:
+            return False
+
+        new_data = dict(entry.data)
+        changed = {
+            key
+            for key in old_data.keys() | new_data.keys()
+            if old_data.get(key) != new_data.get(key)
+        }
+        if changed - DISPLAY_OPTIONS:
+            return False
+
+        self._entry_data[entry.entry_id] = new_data
+        return True
+
+    async def _async_resolve_city(self, entry: ConfigEntry) -> str:
+        """Resolve the city of an auto-detecting entry, so it can share a hub."""
+        api = TicketsEventsApiClient(
+            session=aiohttp_client.async_get_clientsession(self._hass),
+            use_sample_data=entry.data.get(CONF_USE_SAMPLE_DATA, DEFAULT_USE_SAMPLE_DATA),
+            rate_limiter=self._rate_limiter,
+        )
         try:
-            return await self.api.get_events_by_date(
-                city_id=city_id,
-                date_from=date_from,
-                date_to=date_to,
-                currency=currency,
+            location = await api.resolve_location()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not resolve location for entry %s: %s", entry.entry_id, err)
+            return "auto"
+        return location.get("cityId") or "auto"
+
+    async def _async_create(self, entry: ConfigEntry) -> TicketsEventsDataUpdateCoordinator:
+        """Create a coordinator and fetch its first data."""
+        # The coordinator must outlive the entry that happens to create it, so
+        # keep it from binding to that entry's lifecycle
+        token = config_entries.current_entry.set(None)
+        try:
+            coordinator = TicketsEventsDataUpdateCoordinator(
+                self._hass, entry, self._fx, self._rate_limiter
             )
-        except Exception as err:
-            _LOGGER.error("Error fetching events by date: %s", err)
-            raise
+        finally:
+            config_entries.current_entry.reset(token)
+
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            await coordinator.async_shutdown()
+            raise ConfigEntryNotReady(
+                f"Error fetching events: {coordinator.last_exception}"
+            ) from coordinator.last_exception
+
+        await coordinator.async_register_shutdown()
+        return coordinator
@@ -0,0 +1,148 @@
+"""Currency conversion for Tickets & Events."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+import logging
+from typing import Any
+from xml.etree import ElementTree
+
+import aiohttp
+import async_timeout
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CANONICAL_CURRENCY,
+    CURRENCY_DECIMALS,
+    DEFAULT_FX_RATES,
+    DEFAULT_TIMEOUT,
+    EVENT_CURRENCY,
+    EVENT_PRICE,
+    EVENT_PRICE_EUR,
+    FX_RATES_URL,
+    FX_REFRESH_INTERVAL,
+    FX_STORAGE_KEY,
+    FX_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def round_price(amount: float, currency: str) -> float:
+    """Round a price half-up to the number of decimals used by currency."""
+    decimals = CURRENCY_DECIMALS.get(currency, 2)
+    quantum = Decimal(1).scaleb(-decimals)
+    return float(Decimal(repr(amount)).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def canonical_price(event: Mapping[str, Any]) -> float:
+    """Return the price of an event in the canonical currency."""
+    price = event.get(EVENT_PRICE_EUR)
+    if price is None:
+        price = event.get(EVENT_PRICE) or 0
+    return float(price)
+
+
+def convert_prices(
+    amounts: Sequence[float], rate: float, currency: str
+) -> list[float]:
+    """Convert canonical amounts with one rate, rounded for currency."""
+    if rate == 1:
+        return [round_price(amount, currency) for amount in amounts]
+    return [round_price(amount * rate, currency) for amount in amounts]
+
+
+class FxRates:
+    """Exchange rates from the canonical currency, refreshed weekly and persisted."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize with the bundled fallback rates."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, FX_STORAGE_VERSION, FX_STORAGE_KEY)
+        self._lock = asyncio.Lock()
+        self.rates: dict[str, float] = dict(DEFAULT_FX_RATES)
+        self.updated: datetime | None = None
+
+    async def async_load(self) -> None:
+        """Load the last fetched rates from storage."""
+        if not (stored := await self._store.async_load()):
+            return
+        self.rates.update(stored.get("rates", {}))
+        if updated := stored.get("updated"):
+            self.updated = dt_util.parse_datetime(updated)
+
+    async def async_refresh_if_stale(self, force: bool = False) -> None:
+        """Fetch new rates when the stored ones are older than a week, or force."""
+        async with self._lock:
+            now = dt_util.utcnow()
+            if (
+                not force
+                and self.updated is not None
+                and now - self.updated < FX_REFRESH_INTERVAL
+            ):
+                return
+
+            try:
+                rates = await self._async_fetch()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ElementTree.ParseError) as err:
+                _LOGGER.warning("Could not refresh exchange rates, keeping current ones: %s", err)
+                return
+
+            self.rates.update(rates)
+            self.updated = now
+            await self._store.async_save(
+                {"rates": self.rates, "updated": now.isoformat()}
+            )
+            _LOGGER.debug("Refreshed %d exchange rates", len(rates))
+
+    async def _async_fetch(self) -> dict[str, float]:
+        """Fetch the reference rates published by the ECB."""
+        session = aiohttp_client.async_get_clientsession(self._hass)
+        async with async_timeout.timeout(DEFAULT_TIMEOUT):
+            response = await session.get(FX_RATES_URL)
+            response.raise_for_status()
+            text = await response.text()
+
+        rates = {}
+        for element in ElementTree.fromstring(text).iter():
+            if (currency := element.get("currency")) and (rate := element.get("rate")):
+                rates[currency] = float(rate)
+        rates[CANONICAL_CURRENCY] = 1.0
+        return rates
+
+    def rate(self, currency: str) -> float:
+        """Return how many units of currency one canonical unit buys."""
+        try:
+            return self.rates[currency]
+        except KeyError:
+            _LOGGER.warning("No exchange rate for %s, showing %s prices", currency, CANONICAL_CURRENCY)
+            return 1.0
+
+    def convert(self, amount: float, currency: str) -> float:
+        """Convert one canonical amount to currency."""
+        return round_price(amount * self.rate(currency), currency)
+
+    def convert_many(self, amounts: Sequence[float], currency: str) -> list[float]:
+        """Convert a batch of canonical amounts to currency."""
+        return convert_prices(amounts, self.rate(currency), currency)
+
+    def event_prices(
+        self, events: Sequence[Mapping[str, Any]], currency: str
+    ) -> list[float]:
+        """Return the prices of events in currency."""
+        return self.convert_many([canonical_price(event) for event in events], currency)
+
+    def localize_events(
+        self, events: Sequence[Mapping[str, Any]], currency: str
+    ) -> list[dict[str, Any]]:
+        """Return copies of events priced in currency."""
+        return [
+            {**event, EVENT_PRICE: price, EVENT_CURRENCY: currency}
+            for event, price in zip(events, self.event_prices(events, currency))
+        ]
@@ -0,0 +1,269 @@
+"""Date handling for Tickets & Events."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import date, datetime, tzinfo
+from functools import lru_cache
+import logging
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DATE_CACHE_SIZE, EVENT_DEFAULT_DURATION, EVENT_DEFAULT_START
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_event_date(value: Any) -> date | None:
+    """Return the local date of an ISO date or datetime string."""
+    if not isinstance(value, str):
+        return None
+    return _parse_date_string(value)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_string(value: str) -> date | None:
+    """Parse the date part of an ISO string, cached as the same few dates repeat."""
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def event_dates(event: Mapping[str, Any]) -> set[date]:
+    """Return the dates an event takes place or can be booked on."""
+    return {
+        day
+        for value in (event.get("date"), *(event.get("available_dates") or ()))
+        if (day := parse_event_date(value)) is not None
+    }
+
+
+class OccurrenceSpans:
+    """Start and end of the occurrences on each day, in the local timezone.
+
+    Spans are cached per day. The cache is dropped when the Home Assistant
+    timezone changes, so they always follow the configured timezone.
+    """
+
+    def __init__(self, max_size: int = DATE_CACHE_SIZE) -> None:
+        """Initialize an empty cache."""
+        self.max_size = max_size
+        self._zone: tzinfo | None = None
+        self._spans: dict[date, tuple[datetime, datetime]] = {}
+
+    def __call__(self, day: date) -> tuple[datetime, datetime]:
+        """Return the start and end of an occurrence on day."""
+        if (zone := dt_util.DEFAULT_TIME_ZONE) is not self._zone:
+            self._spans.clear()
+            self._zone = zone
+        if (span := self._spans.get(day)) is None:
+            if len(self._spans) >= self.max_size:
+                self._spans.clear()
+            start = datetime.combine(day, EVENT_DEFAULT_START, zone)
+            span = self._spans[day] = (start, start + EVENT_DEFAULT_DURATION)
+        return span
+
+
+occurrence_span = OccurrenceSpans()
+
+
+def occurrence_start(day: date) -> datetime:
+    """Return when an event on day starts, in the local timezone."""
+    return occurrence_span(day)[0]
+
+
+class DateSet:
+    """Set of dates kept as a bitmask of days after the first one.
+
+    A year of daily availability takes one 365 bit integer instead of 365
+    date objects. Dates are expanded only on request, within a range.
+    """
+
+    __slots__ = ("_first", "_mask")
+
+    def __init__(self, dates: Iterable[date] = ()) -> None:
+        """Pack dates."""
+        ordinals = {day.toordinal() for day in dates}
+        self._first = min(ordinals, default=0)
+        mask = 0
+        for ordinal in ordinals:
+            mask |= 1 << (ordinal - self._first)
+        self._mask = mask
+
+    def __len__(self) -> int:
+        """Return the number of dates."""
+        return self._mask.bit_count()
+
+    def __contains__(self, day: object) -> bool:
+        """Return True if day is in the set."""
+        if not isinstance(day, date) or (offset := day.toordinal() - self._first) < 0:
+            return False
+        return bool(self._mask >> offset & 1)
+
+    def __iter__(self) -> Iterator[date]:
+        """Iterate over the dates in order."""
+        return self._expand(0, self._mask)
+
+    def __repr__(self) -> str:
+        """Return a short representation."""
+        return f"<DateSet {len(self)} dates from {self.first}>"
+
+    @property
+    def first(self) -> date | None:
+        """Return the earliest date."""
+        return date.fromordinal(self._first) if self._mask else None
+
+    @property
+    def last(self) -> date | None:
+        """Return the latest date."""
+        if not self._mask:
+            return None
+        return date.fromordinal(self._first + self._mask.bit_length() - 1)
+
+    def between(self, start: date, end: date) -> Iterator[date]:
+        """Iterate over the dates from start to end, both included."""
+        low = max(start.toordinal() - self._first, 0)
+        high = end.toordinal() - self._first
+        if high < low:
+            return iter(())
+        window = self._mask >> low & ((1 << (high - low + 1)) - 1)
+        return self._expand(low, window)
+
+    def next_from(self, day: date) -> date | None:
+        """Return the first date on or after day."""
+        offset = max(day.toordinal() - self._first, 0)
+        if not (rest := self._mask >> offset):
+            return None
+        return date.fromordinal(self._first + offset + (rest & -rest).bit_length() - 1)
+
+    def _expand(self, offset: int, mask: int) -> Iterator[date]:
+        """Yield the dates of the bits set in mask, shifted by offset."""
+        first = self._first + offset
+        while mask:
+            lowest = mask & -mask
+            yield date.fromordinal(first + lowest.bit_length() - 1)
+            mask ^= lowest
+
+
+def calendar_dates(event: Mapping[str, Any], today: date) -> DateSet:
+    """Return the dates an event is shown on in calendars.
+
+    A specific date wins over available dates, undated events are shown today.
+    """
+    if event_date := event.get("date"):
+        values = [event_date]
+    elif not (values := event.get("available_dates")):
+        return DateSet((today,))
+
+    days = []
+    for value in values:
+        if (day := parse_event_date(value)) is None:
+            _LOGGER.debug("Ignoring date %s of event %s", value, event.get("id"))
+            continue
+        days.append(day)
+    return DateSet(days)
+
+
+class DateIndex:
+    """Events bucketed by the local dates they are available on.
+
+    Events without any date are kept apart, they are treated as available
+    every day.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        # date -> event ids, dicts used as insertion-ordered sets
+        self._buckets: dict[date, dict[Any, None]] = {}
+        self._dates_of: dict[Any, frozenset[date]] = {}
+        self._undated: dict[Any, None] = {}
+        # Sorted keys of _buckets, dropped when a date comes or goes
+        self._dates: list[date] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed events."""
+        return len(self._dates_of) + len(self._undated)
+
+    def add(self, event_id: Any, event: Mapping[str, Any]) -> None:
+        """Index an event, replacing any previous dates."""
+        self.remove(event_id)
+        if not (dates := event_dates(event)):
+            self._undated[event_id] = None
+            return
+        self._dates_of[event_id] = frozenset(dates)
+        for day in dates:
+            if (bucket := self._buckets.get(day)) is None:
+                bucket = self._buckets[day] = {}
+                self._dates = None
+            bucket[event_id] = None
+
+    def remove(self, event_id: Any) -> None:
+        """Remove an event from the index."""
+        self._undated.pop(event_id, None)
+        for day in self._dates_of.pop(event_id, ()):
+            bucket = self._buckets[day]
+            del bucket[event_id]
+            if not bucket:
+                del self._buckets[day]
+                self._dates = None
+
+    def clear(self) -> None:
+        """Remove all events from the index."""
+        self._buckets.clear()
+        self._dates_of.clear()
+        self._undated.clear()
+        self._dates = None
+
+    def on(self, day: date, include_undated: bool = True) -> list[Any]:
+        """Return the ids of the events available on day."""
+        ids = list(self._buckets.get(day, ()))
+        if include_undated:
+            ids.extend(self._undated)
+        return ids
+
+    def count_between(self, start: date, end: date) -> int:
+        """Return an upper bound of the events available from start to end.
+
+        Events on several of the dates are counted once per date.
+        """
+        dates = self.dates
+        return len(self._undated) + sum(
+            len(self._buckets[day])
+            for day in dates[bisect_left(dates, start) : bisect_right(dates, end)]
+        )
+
+    def available(self, event_id: Any, start: date, end: date) -> bool:
+        """Return True if an indexed event is available from start to end."""
+        if event_id in self._undated:
+            return True
+        return any(start <= day <= end for day in self._dates_of.get(event_id, ()))
+
+    def between(
+        self, start: date, end: date, include_undated: bool = True
+    ) -> list[tuple[date, Any]]:
+        """Return (first date, id) of the events available from start to end.
+
+        Both ends are included. Events come by their first date in the range,
+        undated ones first as they are available on start.
+        """
+        firsts: dict[Any, date] = (
+            dict.fromkeys(self._undated, start) if include_undated else {}
+        )
+        dates = self.dates
+        for day in dates[bisect_left(dates, start) : bisect_right(dates, end)]:
+            for event_id in self._buckets[day]:
+                firsts.setdefault(event_id, day)
+        return [(day, event_id) for event_id, day in firsts.items()]
+
+    @property
+    def dates(self) -> list[date]:
+        """Return the dates having events, in order.
+
+        The list is sorted again only after dates were added or removed, and
+        is shared between reads, so it must not be modified.
+        """
+        if self._dates is None:
+            self._dates = sorted(self._buckets)
+        return self._dates
@@ -0,0 +1,43 @@
+"""Diagnostics support for Tickets & Events."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import TicketsEventsDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: TicketsEventsDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+        },
+        "coordinator": {
+            "city_id": coordinator.city_id,
+            "city_name": coordinator.city_name,
+            "last_update_success": coordinator.last_update_success,
+            "shared_by_entries": len(coordinator.entry_ids),
+            "data_version": coordinator.data_version,
+            "data_updated": coordinator.data_updated,
+        },
+        "store": {
+            "events": len(coordinator.store),
+            "version": coordinator.store.version,
+        },
+        "search_cache": coordinator.search_cache_stats,
+        "calendar_texts": coordinator.store.calendar_texts.as_dict(),
+        "price_history": {"events": len(coordinator.price_history)},
+        "fx": {
+            "updated": coordinator.fx.updated,
+            "rates": coordinator.fx.rates,
+        },
+    }
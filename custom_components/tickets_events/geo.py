@@ -0,0 +1,155 @@
+"""Spatial index for Tickets & Events."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+import math
+from typing import Any
+
+from .const import GEO_CELL_SIZE
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in kilometers."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def event_coordinates(event: Mapping[str, Any]) -> tuple[float, float] | None:
+    """Return the (latitude, longitude) of an event, if it has valid ones."""
+    try:
+        latitude = float(event["latitude"])
+        longitude = float(event["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+class GeoIndex:
+    """Grid of fixed-size lat/lon buckets with radius and nearest queries."""
+
+    def __init__(self, cell_size: float = GEO_CELL_SIZE) -> None:
+        """Initialize an empty index with cells of cell_size degrees."""
+        self.cell_size = cell_size
+        self._lon_cells = math.ceil(360 / cell_size)
+        # (lat cell, lon cell) -> {event_id: (latitude, longitude)}
+        self._cells: dict[tuple[int, int], dict[Any, tuple[float, float]]] = {}
+        self._cell_of: dict[Any, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed events."""
+        return len(self._cell_of)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Return the cell containing a point."""
+        return (
+            math.floor(latitude / self.cell_size),
+            math.floor(longitude / self.cell_size) % self._lon_cells,
+        )
+
+    def add(self, event_id: Any, event: Mapping[str, Any]) -> None:
+        """Index an event, replacing any previous position."""
+        self.remove(event_id)
+        if (coordinates := event_coordinates(event)) is None:
+            return
+        cell = self._cell(*coordinates)
+        self._cells.setdefault(cell, {})[event_id] = coordinates
+        self._cell_of[event_id] = cell
+
+    def remove(self, event_id: Any) -> None:
+        """Remove an event from the index."""
+        if (cell := self._cell_of.pop(event_id, None)) is None:
+            return
+        bucket = self._cells[cell]
+        del bucket[event_id]
+        if not bucket:
+            del self._cells[cell]
+
+    def clear(self) -> None:
+        """Remove all events from the index."""
+        self._cells.clear()
+        self._cell_of.clear()
+
+    def within(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> list[tuple[Any, float]]:
+        """Return (event_id, distance_km) within radius_km, nearest first."""
+        if not self._cell_of:
+            return []
+
+        lat_span = radius_km / KM_PER_DEGREE
+        lat_min = math.floor(max(-90.0, latitude - lat_span) / self.cell_size)
+        lat_max = math.floor(min(90.0, latitude + lat_span) / self.cell_size)
+
+        # Longitude degrees shrink towards the poles, widen the box accordingly
+        widest = min(89.9, max(abs(latitude - lat_span), abs(latitude + lat_span)))
+        lon_span = radius_km / (KM_PER_DEGREE * math.cos(math.radians(widest)))
+        if lon_span >= 180:
+            lon_cells = range(self._lon_cells)
+        else:
+            lon_min = math.floor((longitude - lon_span) / self.cell_size)
+            lon_max = math.floor((longitude + lon_span) / self.cell_size)
+            lon_cells = {
+                cell % self._lon_cells for cell in range(lon_min, lon_max + 1)
+            }
+
+        lat_cells = range(lat_min, lat_max + 1)
+        if len(lat_cells) * len(lon_cells) <= len(self._cells):
+            buckets = (
+                self._cells.get((lat_cell, lon_cell))
+                for lat_cell in lat_cells
+                for lon_cell in lon_cells
+            )
+        else:
+            # Large circles cover more cells than are occupied, scan those instead
+            buckets = (
+                bucket
+                for (lat_cell, lon_cell), bucket in self._cells.items()
+                if lat_cell in lat_cells and lon_cell in lon_cells
+            )
+
+        results = []
+        for bucket in buckets:
+            if not bucket:
+                continue
+            for event_id, (event_lat, event_lon) in bucket.items():
+                distance = haversine_km(latitude, longitude, event_lat, event_lon)
+                if distance <= radius_km:
+                    results.append((event_id, distance))
+
+        results.sort(key=lambda item: item[1])
+        return results
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        count: int,
+        max_radius_km: float = MAX_DISTANCE_KM,
+    ) -> list[tuple[Any, float]]:
+        """Return the count nearest (event_id, distance_km), nearest first."""
+        if count <= 0:
+            return []
+
+        # Grow the search circle until it holds enough events
+        radius = self.cell_size * KM_PER_DEGREE
+        if len(self) <= count:
+            radius = max_radius_km
+        while True:
+            radius = min(radius, max_radius_km)
+            results = self.within(latitude, longitude, radius)
+            if len(results) >= count or radius >= max_radius_km:
+                return results[:count]
+            radius *= 2
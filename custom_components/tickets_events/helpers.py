@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import base64
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
 from io import BytesIO
+import json
 import logging
 from typing import Any
 from urllib.parse import urlencode
@@ -10,6 +13,7 @@ from urllib.parse import urlencode
 import qrcode
 
 from .const import (
+    ATTRIBUTE_TRIM_STEPS,
     BOOKING_PARAM_CAMPAIGN,
     BOOKING_PARAM_CURRENCY,
     BOOKING_PARAM_DATE,
@@ -21,23 +25,30 @@ from .const import (
     BOOKING_PARAM_UTM_MEDIUM,
     BOOKING_PARAM_UTM_SOURCE,
     BOOKING_PARAM_VARIANTS,
+    CURRENCY_DECIMALS,
     EVENT_BOOKING_URL,
+    EVENT_BOOKING_URL_FULL,
+    EVENT_CURRENCY,
     EVENT_ID,
+    EVENT_PRICE,
     EVENT_QR_CODE,
     QR_CODE_BORDER,
     QR_CODE_BOX_SIZE,
+    QR_CODE_CACHE_SIZE,
     QR_CODE_ERROR_CORRECTION,
+    QR_CODE_MIN_SIZE,
     QR_CODE_VERSION,
     TRAVELPAYOUTS_PARTNER,
     TRAVELPAYOUTS_UTM_CONTENT,
     TRAVELPAYOUTS_UTM_MEDIUM,
 )
+from .currency import round_price
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def generate_booking_url(
-    event: dict[str, Any],
+    event: Mapping[str, Any],
     currency: str = "EUR",
     date: str | None = None,
     timeslot: str | None = None,
@@ -125,27 +136,69 @@ def generate_qr_code(url: str) -> str:
         return ""
 
 
+@lru_cache(maxsize=QR_CODE_CACHE_SIZE)
+def cached_qr_code(url: str) -> str:
+    """Return the QR code of a URL, rendered once while it stays cached."""
+    return generate_qr_code(url)
+
+
 def process_event_data(
-    event: dict[str, Any],
+    event: Mapping[str, Any],
     currency: str = "EUR",
+    price: float | None = None,
+    qr_code: bool = True,
 ) -> dict[str, Any]:
-    """Process raw event data and add generated fields."""
+    """Return event as a new dict with generated fields added.
+
+    When price is given it replaces the event's price, in currency. Without
+    qr_code the QR code is left out, see add_qr_codes.
+    """
     # Generate booking URL with parameters
     booking_url_full = generate_booking_url(event, currency=currency)
-    
-    # Generate QR code
-    qr_code_data = generate_qr_code(booking_url_full) if booking_url_full else ""
-    
+
     # Add generated fields to event
     processed_event = {
         **event,
-        "booking_url_with_params": booking_url_full,
-        EVENT_QR_CODE: qr_code_data,
+        EVENT_BOOKING_URL_FULL: booking_url_full,
     }
+    if qr_code:
+        processed_event[EVENT_QR_CODE] = (
+            cached_qr_code(booking_url_full) if booking_url_full else ""
+        )
+    if price is not None:
+        processed_event[EVENT_PRICE] = price
+        processed_event[EVENT_CURRENCY] = currency
     
     return processed_event
 
 
+def project_event(
+    event: Mapping[str, Any],
+    currency: str,
+    price: float,
+    fields: Sequence[str] | None = None,
+) -> dict[str, Any]:
+    """Return the requested fields of event as a dict, priced in currency.
+
+    All stored fields are returned when fields is None.
+    """
+    if fields is None:
+        projected = dict(event)
+        projected[EVENT_PRICE] = price
+        projected[EVENT_CURRENCY] = currency
+        return projected
+
+    projected = {}
+    for field in fields:
+        if field == EVENT_PRICE:
+            projected[field] = price
+        elif field == EVENT_CURRENCY:
+            projected[field] = currency
+        elif (value := event.get(field)) is not None:
+            projected[field] = value
+    return projected
+
+
 def format_price(price: float, currency: str) -> str:
     """Format price with currency symbol."""
     currency_symbols = {
@@ -162,9 +215,155 @@ def format_price(price: float, currency: str) -> str:
     
     symbol = currency_symbols.get(currency, currency)
     
-    # Format based on currency
-    if currency in ["JPY", "CNY"]:
-        # No decimals for these currencies
-        return f"{symbol}{int(price)}"
+    # Round half-up to the decimals used by the currency (none for JPY/CNY)
+    decimals = CURRENCY_DECIMALS.get(currency, 2)
+    return f"{symbol}{round_price(price, currency):.{decimals}f}"
+
+
+def format_description(event: Mapping[str, Any], price: float, currency: str) -> str:
+    """Format event description for calendars, with price in currency."""
+    description_parts = []
+
+    # Add main description
+    if desc := event.get("description"):
+        description_parts.append(desc)
+
+    # Add price
+    if price > 0:
+        description_parts.append(f"\n💰 Price: {format_price(price, currency)}")
     else:
-        return f"{symbol}{price:.2f}"
+        description_parts.append("\n💰 Free Entry")
+
+    # Add rating
+    if rating := event.get("rating"):
+        rating_count = event.get("rating_count", 0)
+        description_parts.append(f"⭐ Rating: {rating}/5 ({rating_count} reviews)")
+
+    # Add type
+    if event_type := event.get("type"):
+        description_parts.append(f"📍 Type: {event_type.replace('_', ' ').title()}")
+
+    # Add booking URL
+    if booking_url := event.get("booking_url"):
+        description_parts.append(f"\n🎫 Book now: {booking_url}")
+
+    return "\n".join(description_parts)
+
+
+def format_location(event: Mapping[str, Any]) -> str:
+    """Format event location as "city, country"."""
+    return f"{event.get('city', '')}, {event.get('country', '')}".strip(", ")
+
+
+class CalendarTextCache:
+    """Calendar description and location of events, rendered once per content.
+
+    Entries are kept per event id along with the store revision they were
+    rendered from, so every occurrence of an event shares the same strings
+    until the event changes. Descriptions are kept per currency.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        # event id -> (revision, location, {currency: (price, description)})
+        self._entries: dict[Any, tuple[int | None, str, dict[str, tuple[float, str]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached events."""
+        return len(self._entries)
+
+    def get(
+        self,
+        event: Mapping[str, Any],
+        revision: int | None,
+        price: float,
+        currency: str,
+    ) -> tuple[str, str]:
+        """Return the description and location of an event."""
+        event_id = event.get(EVENT_ID)
+        entry = self._entries.get(event_id)
+        if entry is None or entry[0] != revision:
+            entry = (revision, format_location(event), {})
+            self._entries[event_id] = entry
+
+        descriptions = entry[2]
+        cached = descriptions.get(currency)
+        if cached is not None and cached[0] == price:
+            self.hits += 1
+            return cached[1], entry[1]
+
+        self.misses += 1
+        description = format_description(event, price, currency)
+        descriptions[currency] = (price, description)
+        return description, entry[1]
+
+    def discard(self, event_id: Any) -> None:
+        """Forget the strings of an event."""
+        self._entries.pop(event_id, None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def json_size(value: Any) -> int:
+    """Return the size in bytes of value serialized as compact JSON."""
+    return len(
+        json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+    )
+
+
+def add_qr_codes(events: list[dict[str, Any]], max_bytes: int) -> int:
+    """Add the QR codes of booking URLs to events in order, within max_bytes.
+
+    Stops at the first code that does not fit, and before rendering one when
+    less than QR_CODE_MIN_SIZE is left. Returns the number of bytes added.
+    """
+    added = 0
+    for event in events:
+        if not (url := event.get(EVENT_BOOKING_URL_FULL)):
+            continue
+        if max_bytes - added < QR_CODE_MIN_SIZE:
+            break
+        qr_code = cached_qr_code(url)
+        # The field and its comma in an event that has other fields
+        size = json_size({EVENT_QR_CODE: qr_code}) - 1
+        if added + size > max_bytes:
+            break
+        event[EVENT_QR_CODE] = qr_code
+        added += size
+    return added
+
+
+def fit_events(events: list[dict[str, Any]], max_bytes: int) -> list[dict[str, Any]]:
+    """Trim events in place until they serialize to at most max_bytes.
+
+    The ATTRIBUTE_TRIM_STEPS are applied to every event in turn, then events
+    are dropped from the end. Returns the events that were kept.
+    """
+    sizes = [json_size(event) for event in events]
+    # Brackets plus the commas between events
+    total = sum(sizes) + len(events) + 1
+
+    for field, keep in ATTRIBUTE_TRIM_STEPS:
+        if total <= max_bytes:
+            return events
+        for position, event in enumerate(events):
+            value = event.get(field)
+            if value is None or (keep is not None and len(value) <= keep):
+                continue
+            if keep is None:
+                del event[field]
+            else:
+                event[field] = value[:keep]
+            size = json_size(event)
+            total += size - sizes[position]
+            sizes[position] = size
+
+    count = len(events)
+    while count and total > max_bytes:
+        count -= 1
+        total -= sizes[count] + 1
+    return events[:count]
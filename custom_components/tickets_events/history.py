@@ -0,0 +1,164 @@
+"""Price history of Tickets & Events events."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+import logging
+import math
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CANONICAL_CURRENCY,
+    DOMAIN,
+    EVENT_ID,
+    EVENT_TITLE,
+    PRICE_HISTORY_MAX_EVENTS,
+    PRICE_HISTORY_SIZE,
+)
+from .currency import canonical_price
+
+_LOGGER = logging.getLogger(__name__)
+
+_STATISTIC_ID_RE = re.compile(r"[^a-z0-9_]+")
+
+
+def price_statistic_id(event_id: Any) -> str:
+    """Return the external statistic id of an event's price."""
+    object_id = _STATISTIC_ID_RE.sub("_", str(event_id).lower()).strip("_")
+    return f"{DOMAIN}:price_{object_id}"
+
+
+class PriceRing:
+    """Fixed-size ring buffer of (timestamp, price) samples."""
+
+    __slots__ = ("timestamps", "prices", "head", "count")
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty buffer holding size samples."""
+        self.timestamps = array("d", bytes(8 * size))
+        self.prices = array("d", bytes(8 * size))
+        self.head = 0  # Where the next sample goes
+        self.count = 0
+
+    def append(self, timestamp: float, price: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        size = len(self.prices)
+        self.timestamps[self.head] = timestamp
+        self.prices[self.head] = price
+        self.head = (self.head + 1) % size
+        self.count = min(self.count + 1, size)
+
+    @property
+    def last_price(self) -> float | None:
+        """Return the most recent price."""
+        if not self.count:
+            return None
+        return self.prices[self.head - 1]
+
+    def samples(self, since: float = -math.inf) -> list[tuple[float, float]]:
+        """Return the samples taken at or after since, oldest first."""
+        size = len(self.prices)
+        start = (self.head - self.count) % size
+        samples = []
+        for offset in range(self.count):
+            position = (start + offset) % size
+            if (timestamp := self.timestamps[position]) >= since:
+                samples.append((timestamp, self.prices[position]))
+        return samples
+
+
+class PriceHistory:
+    """Price samples of the events in the store, one ring buffer per event."""
+
+    def __init__(
+        self,
+        size: int = PRICE_HISTORY_SIZE,
+        max_events: int = PRICE_HISTORY_MAX_EVENTS,
+    ) -> None:
+        """Initialize an empty history."""
+        self.size = size
+        self.max_events = max_events
+        self._rings: dict[Any, PriceRing] = {}
+        self._titles: dict[Any, str] = {}
+
+    def __len__(self) -> int:
+        """Return the number of tracked events."""
+        return len(self._rings)
+
+    def __contains__(self, event_id: Any) -> bool:
+        """Return True if the event is tracked."""
+        return event_id in self._rings
+
+    def get(self, event_id: Any) -> PriceRing | None:
+        """Return the buffer of an event."""
+        return self._rings.get(event_id)
+
+    def record(self, events: Iterable[Mapping[str, Any]], when: datetime) -> None:
+        """Sample the canonical price of events.
+
+        Events no longer present are forgotten. At most max_events are
+        tracked, in the order given.
+        """
+        timestamp = when.timestamp()
+        rings: dict[Any, PriceRing] = {}
+        for event in events:
+            if len(rings) >= self.max_events:
+                break
+            if (event_id := event.get(EVENT_ID)) is None:
+                continue
+            ring = self._rings.get(event_id) or PriceRing(self.size)
+            ring.append(timestamp, canonical_price(event))
+            rings[event_id] = ring
+            self._titles[event_id] = event.get(EVENT_TITLE) or str(event_id)
+
+        for event_id in self._titles.keys() - rings.keys():
+            del self._titles[event_id]
+        self._rings = rings
+
+    @callback
+    def async_publish(self, hass: HomeAssistant, when: datetime) -> None:
+        """Import the samples of the hour containing when as statistics.
+
+        The recorder replaces rows with the same start, so publishing the same
+        hour again after another sample only updates it.
+        """
+        if "recorder" not in hass.config.components:
+            return
+
+        from homeassistant.components.recorder.models import (
+            StatisticData,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        hour = dt_util.as_utc(when).replace(minute=0, second=0, microsecond=0)
+        since = hour.timestamp()
+        for event_id, ring in self._rings.items():
+            if not (prices := [price for _ts, price in ring.samples(since)]):
+                continue
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{self._titles[event_id]} price",
+                source=DOMAIN,
+                statistic_id=price_statistic_id(event_id),
+                unit_of_measurement=CANONICAL_CURRENCY,
+            )
+            statistics = [
+                StatisticData(
+                    start=hour,
+                    mean=sum(prices) / len(prices),
+                    min=min(prices),
+                    max=max(prices),
+                )
+            ]
+            async_add_external_statistics(hass, metadata, statistics)
+
+        _LOGGER.debug("Published price statistics of %d events", len(self._rings))
@@ -0,0 +1,120 @@
+"""iCalendar (RFC 5545) export of Tickets & Events."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from datetime import date, datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, EVENT_BOOKING_URL, EVENT_ID, EVENT_TITLE
+from .dates import calendar_dates, occurrence_span
+from .helpers import format_description, format_location
+
+Describe = Callable[[Mapping[str, Any], float, str], tuple[str, str]]
+
+CRLF = "\r\n"
+MAX_LINE_OCTETS = 75
+
+_ESCAPES = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": ""})
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value."""
+    return value.translate(_ESCAPES)
+
+
+def fold_line(line: str) -> str:
+    """Return a content line folded at 75 octets, with its line break."""
+    if len(line) <= MAX_LINE_OCTETS // 4 or len(line.encode()) <= MAX_LINE_OCTETS:
+        return line + CRLF
+
+    # Continuation lines start with a space, which counts towards their length
+    parts = []
+    current: list[str] = []
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        width = len(char.encode())
+        if size + width > limit:
+            parts.append("".join(current))
+            current = []
+            size = 0
+            limit = MAX_LINE_OCTETS - 1
+        current.append(char)
+        size += width
+    parts.append("".join(current))
+    return f"{CRLF} ".join(parts) + CRLF
+
+
+def format_utc(when: datetime) -> str:
+    """Format a DATE-TIME value in UTC."""
+    return dt_util.as_utc(when).strftime("%Y%m%dT%H%M%SZ")
+
+
+def iter_calendar(
+    name: str,
+    events: Iterable[Mapping[str, Any]],
+    prices: Iterable[float],
+    currency: str,
+    first_day: date,
+    last_day: date,
+    today: date,
+    stamp: datetime,
+    describe: Describe | None = None,
+) -> Iterator[str]:
+    """Yield a VCALENDAR piece by piece, one VEVENT per occurrence.
+
+    Occurrences are the calendar dates of each event from first_day to
+    last_day, both included. describe returns the description and location
+    of an event, e.g. from the store's cache.
+    """
+    yield "".join(
+        fold_line(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:-//{DOMAIN}//Home Assistant//EN",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{escape_text(name)}",
+        )
+    )
+
+    dtstamp = format_utc(stamp)
+    for event, price in zip(events, prices):
+        days = calendar_dates(event, today).between(first_day, last_day)
+        if (day := next(days, None)) is None:
+            continue
+
+        if describe is None:
+            description = format_description(event, price, currency)
+            location = format_location(event)
+        else:
+            description, location = describe(event, price, currency)
+
+        # Everything but the dates is shared by the occurrences of an event
+        lines = [
+            f"DTSTAMP:{dtstamp}",
+            f"SUMMARY:{escape_text(event.get(EVENT_TITLE) or 'Event')}",
+            f"DESCRIPTION:{escape_text(description)}",
+            f"LOCATION:{escape_text(location)}",
+        ]
+        if url := event.get(EVENT_BOOKING_URL):
+            lines.append(f"URL:{url}")
+        body = "".join(fold_line(line) for line in lines)
+        event_id = escape_text(str(event.get(EVENT_ID)))
+        while day is not None:
+            start, end = occurrence_span(day)
+            yield "".join(
+                (
+                    "BEGIN:VEVENT" + CRLF,
+                    fold_line(f"UID:{event_id}_{day.isoformat()}@{DOMAIN}"),
+                    f"DTSTART:{format_utc(start)}{CRLF}",
+                    f"DTEND:{format_utc(end)}{CRLF}",
+                    body,
+                    "END:VEVENT" + CRLF,
+                )
+            )
+            day = next(days, None)
+
+    yield "END:VCALENDAR" + CRLF
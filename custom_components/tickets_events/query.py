@@ -0,0 +1,366 @@
+"""Query language over the stored events of Tickets & Events.
+
+A query is a list of space separated terms, all of which must hold:
+
+    museum type:museum,tour price<=30 rating>=4.5 date:today..today+7 is:paid sort:-rating
+
+Terms without a known field are searched for in the text of the events.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from datetime import date, timedelta
+import heapq
+import operator
+import re
+import shlex
+from typing import Any, NamedTuple
+
+from .const import (
+    CURRENCY_DECIMALS,
+    EVENT_CITY,
+    EVENT_ID,
+    EVENT_RATING,
+    EVENT_TITLE,
+    EVENT_TYPE,
+)
+from .currency import FxRates
+from .records import EventRecord
+from .search import fold_text
+from .store import EventStore
+
+SORT_FIELDS = ("title", "price", "rating", "date")
+
+Condition = tuple[Callable[[float, float], bool], float]
+Match = tuple[EventRecord, float]
+
+_OPERATORS: dict[str, Callable[[float, float], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+_TERM_RE = re.compile(r"(?P<field>[a-z]+)(?P<op>>=|<=|>|<|=|:)(?P<value>.*)", re.IGNORECASE)
+_DAY_RE = re.compile(r"today(?:(?P<sign>[+-])(?P<days>\d+))?")
+_FIELDS = frozenset({"type", "city", "price", "rating", "date", "is", "sort"})
+
+
+class QueryError(ValueError):
+    """Raised for a query that cannot be parsed."""
+
+
+class EventQuery(NamedTuple):
+    """Conditions of a query, all of which must hold, and its order.
+
+    Without sort, events matching text come best match first and the others
+    in API order.
+    """
+
+    text: str = ""
+    types: frozenset[str] = frozenset()
+    city: str | None = None  # Accent-folded
+    price: tuple[Condition, ...] = ()
+    rating: tuple[Condition, ...] = ()
+    date_from: date | None = None
+    date_to: date | None = None
+    sort: str | None = None
+    descending: bool = False
+
+
+def parse_query(text: str, today: date) -> EventQuery:
+    """Parse a query, with relative dates counted from today."""
+    try:
+        terms = shlex.split(text)
+    except ValueError as err:
+        raise QueryError(f"Invalid query: {err}") from err
+
+    words: list[str] = []
+    types: set[str] = set()
+    city: str | None = None
+    conditions: dict[str, list[Condition]] = {"price": [], "rating": []}
+    date_from: date | None = None
+    date_to: date | None = None
+    sort: str | None = None
+    descending = False
+
+    for term in terms:
+        match = _TERM_RE.fullmatch(term)
+        if match is None or (field := match["field"].casefold()) not in _FIELDS:
+            words.append(term)
+            continue
+
+        op, value = match["op"], match["value"]
+        if not value:
+            raise QueryError(f"Missing value in {term}")
+        if field in conditions:
+            conditions[field].extend(_parse_numbers(term, op, value))
+            continue
+        if op not in (":", "="):
+            raise QueryError(f"Use {field}:<value> instead of {term}")
+
+        if field == "type":
+            types.update(part for part in value.split(",") if part)
+        elif field == "city":
+            city = fold_text(value)
+        elif field == "date":
+            low, high = _parse_range(term, value, lambda day: _parse_day(term, day, today))
+            date_from = max(date_from or date.min, low or date.min)
+            date_to = min(date_to or date.max, high or date.max)
+        elif field == "is":
+            if (flag := value.casefold()) == "free":
+                conditions["price"].append((operator.eq, 0.0))
+            elif flag == "paid":
+                conditions["price"].append((operator.gt, 0.0))
+            else:
+                raise QueryError(f"Unknown {term}, use is:free or is:paid")
+        else:
+            descending = value.startswith("-")
+            if (sort := value.lstrip("-").casefold()) not in SORT_FIELDS:
+                raise QueryError(f"Unknown sort {value}, use one of {', '.join(SORT_FIELDS)}")
+
+    return EventQuery(
+        text=" ".join(words),
+        types=frozenset(types),
+        city=city,
+        price=tuple(conditions["price"]),
+        rating=tuple(conditions["rating"]),
+        date_from=date_from,
+        date_to=date_to,
+        sort=sort,
+        descending=descending,
+    )
+
+
+def _parse_range(
+    term: str, value: str, parse: Callable[[str], Any]
+) -> tuple[Any | None, Any | None]:
+    """Parse "low..high" (either side may be left out) or a single value."""
+    low, separator, high = value.partition("..")
+    if not separator:
+        single = parse(value)
+        return single, single
+    if not low and not high:
+        raise QueryError(f"Missing bounds in {term}")
+    return (parse(low) if low else None, parse(high) if high else None)
+
+
+def _parse_numbers(term: str, op: str, value: str) -> list[Condition]:
+    """Return the conditions of a price or rating term."""
+
+    def parse(number: str) -> float:
+        try:
+            return float(number)
+        except ValueError as err:
+            raise QueryError(f"Invalid number in {term}") from err
+
+    if op in _OPERATORS:
+        return [(_OPERATORS[op], parse(value))]
+    low, high = _parse_range(term, value, parse)
+    if low is not None and low == high:
+        return [(operator.eq, low)]
+    return [
+        *([(operator.ge, low)] if low is not None else []),
+        *([(operator.le, high)] if high is not None else []),
+    ]
+
+
+def _parse_day(term: str, value: str, today: date) -> date:
+    """Parse an ISO date, today or today+/-days."""
+    if match := _DAY_RE.fullmatch(value.casefold()):
+        days = int(match["days"] or 0)
+        return today + timedelta(days=-days if match["sign"] == "-" else days)
+    try:
+        return date.fromisoformat(value)
+    except ValueError as err:
+        raise QueryError(f"Invalid date in {term}") from err
+
+
+def _bounds(conditions: Sequence[Condition]) -> tuple[float | None, float | None]:
+    """Return the smallest range, both ends included, holding the conditions."""
+    low: float | None = None
+    high: float | None = None
+    for op, bound in conditions:
+        if op in (operator.ge, operator.gt, operator.eq):
+            low = bound if low is None else max(low, bound)
+        if op in (operator.le, operator.lt, operator.eq):
+            high = bound if high is None else min(high, bound)
+    return low, high
+
+
+def _holds(conditions: Sequence[Condition], value: float | None) -> bool:
+    """Return True if value meets every condition."""
+    if not conditions:
+        return True
+    return value is not None and all(op(value, bound) for op, bound in conditions)
+
+
+def sort_value(sort: str, event: EventRecord, price: float) -> Any:
+    """Return the value an event is sorted on, None when it has none."""
+    if sort == "price":
+        return price
+    if sort == "title":
+        return fold_text(event.get(EVENT_TITLE) or "")
+    if sort == "rating":
+        return event.get(EVENT_RATING)
+    return event.get("date") or min(event.get("available_dates") or [None], key=str)
+
+
+def sort_key(query: EventQuery) -> Callable[[Match], tuple[Any, ...]] | None:
+    """Return the key ordering (event, price) matches by the sort field.
+
+    Matches without the value go last in either direction, when ordered by
+    this key with reverse set to query.descending.
+    """
+    if (sort := query.sort) is None:
+        return None
+    present, missing = (1, 0) if query.descending else (0, 1)
+
+    def key(match: Match) -> tuple[Any, ...]:
+        if (value := sort_value(sort, *match)) is None:
+            return (missing,)
+        return (present, value)
+
+    return key
+
+
+def select_events(
+    store: EventStore,
+    fx: FxRates,
+    query: EventQuery,
+    currency: str,
+    limit: int | None = None,
+) -> tuple[list[Match], list[Match]]:
+    """Return the first limit (event, price) matches in order, and all matches.
+
+    Candidates come from the index the query narrows down most, the other
+    conditions are checked on each candidate. Only the first limit matches
+    are ordered, with a bounded heap instead of sorting them all.
+    """
+    ids, scores = _candidates(store, query, fx.rate(currency), currency)
+    events = store.events if ids is None else [store.get(event_id) for event_id in ids]
+    if query.text and scores is None:
+        # Score only the candidates of the more selective index
+        within = [event.get(EVENT_ID) for event in events]
+        scores = dict(store.search_index.search(query.text, within=within))
+
+    date_index = store.date_index
+    checked = [
+        event
+        for event in events
+        if (scores is None or event.get(EVENT_ID) in scores)
+        and (not query.types or event.get(EVENT_TYPE) in query.types)
+        and (query.city is None or fold_text(event.get(EVENT_CITY) or "") == query.city)
+        and (
+            query.date_from is None
+            or date_index.available(event.get(EVENT_ID), query.date_from, query.date_to)
+        )
+        and _holds(query.rating, event.get(EVENT_RATING))
+    ]
+    prices = fx.event_prices(checked, currency)
+    matches = [
+        (event, price)
+        for event, price in zip(checked, prices)
+        if _holds(query.price, price)
+    ]
+
+    key, descending = _order(store, query, scores)
+    if limit is None:
+        return sorted(matches, key=key, reverse=descending), matches
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(limit, matches, key=key), matches
+
+
+def scored_events(
+    store: EventStore, query: EventQuery, matches: Sequence[Match]
+) -> list[tuple[EventRecord, float]]:
+    """Return the (event, score) pairs of unsorted matches, to merge them on.
+
+    Text queries keep their search scores, other matches score by their place
+    in API order, so rankings of several entries interleave.
+    """
+    events = [event for event, _price in matches]
+    if not query.text:
+        return [(event, -rank) for rank, event in enumerate(events)]
+    within = [event.get(EVENT_ID) for event in events]
+    scores = dict(store.search_index.search(query.text, within=within))
+    return [(event, scores[event.get(EVENT_ID)]) for event in events]
+
+
+def _order(
+    store: EventStore, query: EventQuery, scores: dict[Any, float] | None
+) -> tuple[Callable[[Match], tuple[Any, ...]], bool]:
+    """Return the key and direction matches are ordered by."""
+    if (key := sort_key(query)) is not None:
+        return key, query.descending
+
+    if scores is not None:
+
+        def by_score(match: Match) -> tuple[Any, ...]:
+            # Best match first, API order between equal scores
+            event_id = match[0].get(EVENT_ID)
+            return (scores[event_id], -store.position(event_id))
+
+        return by_score, True
+
+    def by_position(match: Match) -> tuple[Any, ...]:
+        return (store.position(match[0].get(EVENT_ID)),)
+
+    return by_position, False
+
+
+def _candidates(
+    store: EventStore, query: EventQuery, rate: float, currency: str
+) -> tuple[list[Any] | None, dict[Any, float] | None]:
+    """Return the ids yielded by the most selective index, None for all events.
+
+    Each index the query can use tells how many events it would yield,
+    without listing them, and the smallest wins. When that is the text
+    index the search scores come along.
+    """
+    plans: list[tuple[int, str]] = []
+    if query.types:
+        plans.append((sum(store.type_index.count(value) for value in query.types), "type"))
+    if query.date_from is not None:
+        plans.append((store.date_index.count_between(query.date_from, query.date_to), "date"))
+    if query.price:
+        low, high = _canonical_bounds(_bounds(query.price), rate, currency)
+        plans.append((store.price_index.count(low, high), "price"))
+    if query.rating:
+        plans.append((store.rating_index.count(*_bounds(query.rating)), "rating"))
+    if query.text:
+        plans.append((store.search_index.estimate(query.text), "text"))
+    if not plans:
+        return None, None
+
+    _estimate, source = min(plans, key=lambda plan: plan[0])
+    if source == "type":
+        ids = [event_id for value in query.types for event_id in store.type_index.ids(value)]
+    elif source == "date":
+        ids = [
+            event_id
+            for _day, event_id in store.date_index.between(query.date_from, query.date_to)
+        ]
+    elif source == "price":
+        ids = store.price_index.ids(low, high)
+    elif source == "rating":
+        ids = store.rating_index.ids(*_bounds(query.rating))
+    else:
+        scores = dict(store.search_index.search(query.text))
+        return list(scores), scores
+    return ids, None
+
+
+def _canonical_bounds(
+    bounds: tuple[float | None, float | None], rate: float, currency: str
+) -> tuple[float | None, float | None]:
+    """Convert price bounds in currency to canonical ones.
+
+    Shown prices are rounded, so the range is widened by one unit of the
+    last decimal; the exact prices are checked afterwards.
+    """
+    step = 10 ** -CURRENCY_DECIMALS.get(currency, 2)
+    low, high = bounds
+    return (
+        None if low is None else (low - step) / rate,
+        None if high is None else (high + step) / rate,
+    )
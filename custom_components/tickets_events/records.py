@@ -0,0 +1,127 @@
+"""Compact in-memory representation of Tickets & Events events."""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+import sys
+from typing import Any
+
+from .const import (
+    EVENT_BOOKING_URL,
+    EVENT_BOOKING_URL_FULL,
+    EVENT_CITY,
+    EVENT_CURRENCY,
+    EVENT_DESCRIPTION,
+    EVENT_ID,
+    EVENT_IMAGES,
+    EVENT_IS_CHECKOUT_DISABLED,
+    EVENT_PRICE,
+    EVENT_PRICE_EUR,
+    EVENT_RATING,
+    EVENT_RATING_COUNT,
+    EVENT_TITLE,
+    EVENT_TYPE,
+)
+
+# Fields stored in slots, anything else the API sends goes to a per-event dict
+EVENT_FIELDS = (
+    EVENT_ID,
+    EVENT_TITLE,
+    EVENT_DESCRIPTION,
+    EVENT_CITY,
+    "country",
+    EVENT_PRICE,
+    EVENT_PRICE_EUR,
+    EVENT_CURRENCY,
+    EVENT_RATING,
+    EVENT_RATING_COUNT,
+    EVENT_TYPE,
+    EVENT_IS_CHECKOUT_DISABLED,
+    "date",
+    "available_dates",
+    "latitude",
+    "longitude",
+    EVENT_IMAGES,
+    EVENT_BOOKING_URL,
+    EVENT_BOOKING_URL_FULL,
+)
+_FIELD_SET = frozenset(EVENT_FIELDS)
+
+# Low-cardinality strings shared by many events
+_INTERNED_FIELDS = frozenset({EVENT_CITY, "country", EVENT_CURRENCY, EVENT_TYPE, "date"})
+
+_MISSING = object()
+
+
+def _intern(value: Any) -> Any:
+    """Return the interned copy of a string, other values unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class EventRecord(Mapping[str, Any]):
+    """Read-only event with its known fields in slots.
+
+    Records behave like the event dict they were built from, so indexes and
+    helpers read them unchanged. Use as_dict() where a real dict is needed,
+    e.g. in state attributes and service responses.
+    """
+
+    __slots__ = (*EVENT_FIELDS, "_extra")
+
+    def __init__(self, event: Mapping[str, Any]) -> None:
+        """Store the fields of an event dict."""
+        extra = None
+        for key, value in event.items():
+            if key not in _FIELD_SET:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if key in _INTERNED_FIELDS:
+                value = _intern(value)
+            elif key == "available_dates" and isinstance(value, list):
+                value = tuple(_intern(date) for date in value)
+            elif key == EVENT_IMAGES and isinstance(value, list) and all(
+                isinstance(image, dict) for image in value
+            ):
+                value = tuple(tuple(image.items()) for image in value)
+            object.__setattr__(self, key, value)
+        object.__setattr__(self, "_extra", extra)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject changes, records are shared between readers."""
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a field, materializing packed lists."""
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            if type(value) is tuple:
+                if key == EVENT_IMAGES:
+                    return [dict(image) for image in value]
+                return list(value)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the field names the event was built with."""
+        for key in EVENT_FIELDS:
+            if getattr(self, key, _MISSING) is not _MISSING:
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        return sum(1 for _key in self)
+
+    def __repr__(self) -> str:
+        """Return a short representation."""
+        return f"<EventRecord {self.get(EVENT_ID)!r}: {self.get(EVENT_TITLE)!r}>"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the event as a new dict."""
+        return {key: self[key] for key in self}
@@ -4,6 +4,10 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Final
 
+from .const import DEFAULT_FX_RATES, EVENT_CURRENCY, EVENT_PRICE
+from .currency import canonical_price, convert_prices
+from .geo import event_coordinates, haversine_km
+
 # Calculate dynamic dates for sample data
 TODAY = datetime.now().strftime("%Y-%m-%d")
 TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -421,6 +425,19 @@ SAMPLE_EVENTS: Final = [
 ]
 
 
+def _localize(events: list[dict], currency: str) -> list[dict]:
+    """Return copies of events priced in currency, like the API does."""
+    prices = convert_prices(
+        [canonical_price(event) for event in events],
+        DEFAULT_FX_RATES.get(currency, 1.0),
+        currency,
+    )
+    return [
+        {**event, EVENT_PRICE: price, EVENT_CURRENCY: currency}
+        for event, price in zip(events, prices)
+    ]
+
+
 def get_sample_events_response(
     city_id: str | None = None,
     currency: str = "EUR",
@@ -432,10 +449,7 @@ def get_sample_events_response(
     if city_id:
         events = [e for e in events if e.get("cityId") == city_id]
     
-    # Convert prices if currency is different
-    # For sample data, we'll keep the original currency
-    
-    events = events[:limit]
+    events = _localize(events[:limit], currency)
     
     city_name = "Multiple Cities"
     if city_id:
@@ -464,7 +478,7 @@ def search_sample_events(query: str, currency: str = "EUR", limit: int = 50) ->
         or query_lower in e.get("type", "").lower()
     ]
     
-    filtered_events = filtered_events[:limit]
+    filtered_events = _localize(filtered_events[:limit], currency)
     
     return {
         "events": filtered_events,
@@ -485,8 +499,25 @@ def get_nearby_sample_events(
     limit: int = 50,
 ) -> dict:
     """Get sample nearby events."""
-    # For sample data, return events from Bucharest (approx coordinates)
-    return get_sample_events_response("c76753", currency, limit)
+    distances = []
+    for event in SAMPLE_EVENTS:
+        if (coordinates := event_coordinates(event)) is None:
+            continue
+        distance = haversine_km(latitude, longitude, *coordinates)
+        if distance <= radius:
+            distances.append((distance, event))
+    distances.sort(key=lambda item: item[0])
+
+    events = _localize([event for _distance, event in distances[:limit]], currency)
+
+    return {
+        "events": events,
+        "destination_title": "Nearby",
+        "destination_url": "https://www.tiqets.com",
+        "location_type": "nearby",
+        "total_count": len(events),
+        "currency": currency,
+    }
 
 
 def resolve_sample_location(ip_address: str | None = None) -> dict:
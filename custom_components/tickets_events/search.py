@@ -0,0 +1,269 @@
+"""Local full-text search index for Tickets & Events."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+import heapq
+import math
+from operator import itemgetter
+import re
+import unicodedata
+from typing import Any
+
+from .const import (
+    EVENT_ID,
+    SEARCH_BM25_B,
+    SEARCH_BM25_K1,
+    SEARCH_FIELD_WEIGHTS,
+    SEARCH_PREFIX_WEIGHT,
+)
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def fold_text(text: str) -> str:
+    """Lowercase text and strip accents (e.g. "Muzeul Ţăranului" -> "muzeul taranului")."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
+
+
+def normalize_query(query: str) -> str:
+    """Return query with case and whitespace folded, for use as a cache key."""
+    return " ".join(query.split()).casefold()
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into accent-folded tokens."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(fold_text(str(text)))
+
+
+def merge_ranked(
+    rankings: Sequence[Sequence[tuple[Mapping[str, Any], float]]],
+    limit: int | None = None,
+) -> list[Mapping[str, Any]]:
+    """Merge lists of (event, score) pairs ranked best first, keeping each id once.
+
+    Events are taken by decreasing score whichever list they come from,
+    earlier lists winning ties. At most limit events are taken, and the lists
+    are only read as far as needed.
+    """
+    merged = heapq.merge(*rankings, key=itemgetter(1), reverse=True)
+    return unique_events((event for event, _score in merged), limit)
+
+
+def unique_events(
+    events: Iterable[Mapping[str, Any]], limit: int | None = None
+) -> list[Mapping[str, Any]]:
+    """Return the first limit events, skipping ids seen before.
+
+    events is only consumed as far as needed.
+    """
+    seen: set[Any] = set()
+    unique: list[Mapping[str, Any]] = []
+    for event in events:
+        if limit is not None and len(unique) >= limit:
+            break
+        if (event_id := event.get(EVENT_ID)) is not None:
+            if event_id in seen:
+                continue
+            seen.add(event_id)
+        unique.append(event)
+    return unique
+
+
+class EventSearchIndex:
+    """Inverted index over events with BM25 ranking and prefix matching."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        # term -> {event_id: weighted term frequency}
+        self._postings: dict[str, dict[Any, float]] = {}
+        # event_id -> {term: weighted term frequency}, used for removal
+        self._documents: dict[Any, dict[str, float]] = {}
+        self._doc_lengths: dict[Any, float] = {}
+        self._total_length = 0.0
+        # Sorted vocabulary for prefix lookups, rebuilt lazily after changes
+        self._vocabulary: list[str] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed events."""
+        return len(self._documents)
+
+    def __contains__(self, event_id: Any) -> bool:
+        """Return True if the event is indexed."""
+        return event_id in self._documents
+
+    def add(self, event_id: Any, event: Mapping[str, Any]) -> None:
+        """Index an event, replacing any previous version of it."""
+        if event_id in self._documents:
+            self.remove(event_id)
+
+        terms: dict[str, float] = {}
+        length = 0.0
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            tokens = tokenize(event.get(field))
+            length += weight * len(tokens)
+            for token, count in Counter(tokens).items():
+                terms[token] = terms.get(token, 0.0) + weight * count
+
+        self._documents[event_id] = terms
+        self._doc_lengths[event_id] = length
+        self._total_length += length
+
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = {event_id: frequency}
+                self._vocabulary = None
+            else:
+                postings[event_id] = frequency
+
+    def remove(self, event_id: Any) -> None:
+        """Remove an event from the index."""
+        terms = self._documents.pop(event_id, None)
+        if terms is None:
+            return
+
+        self._total_length -= self._doc_lengths.pop(event_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[event_id]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+
+    def clear(self) -> None:
+        """Remove all events from the index."""
+        self._postings.clear()
+        self._documents.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0.0
+        self._vocabulary = None
+
+    def estimate(self, query: str) -> int:
+        """Return an upper bound of the number of events matching query."""
+        if (expanded := self._expand_query(query)) is None:
+            return 0
+        return expanded[0][0]
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        within: Iterable[Any] | None = None,
+    ) -> list[tuple[Any, float]]:
+        """Return (event_id, score) pairs matching every query term, best first.
+
+        With within, only those events are scored.
+        """
+        if (expanded := self._expand_query(query)) is None:
+            return []
+
+        scores: dict[Any, float] | None = (
+            None if within is None else dict.fromkeys(within, 0.0)
+        )
+        for _matches, query_term, terms in expanded:
+            scores = self._score_term(query_term, terms, scores)
+            if not scores:
+                return []
+
+        if limit is None:
+            return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _expand_query(self, query: str) -> list[tuple[int, str, list[str]]] | None:
+        """Return (matches, query term, indexed terms) by increasing matches.
+
+        Every query term is expanded to the indexed terms it prefixes, so
+        searches can intersect starting from the rarest one and later terms
+        only score the surviving candidates. None when nothing can match.
+        """
+        query_terms = tokenize(query)
+        if not query_terms or not self._documents:
+            return None
+
+        expanded = []
+        for query_term in dict.fromkeys(query_terms):
+            terms = self._expand_prefix(query_term)
+            if not terms:
+                return None
+            matches = sum(len(self._postings[term]) for term in terms)
+            expanded.append((matches, query_term, terms))
+        expanded.sort(key=lambda item: item[0])
+        return expanded
+
+    def _score_term(
+        self,
+        query_term: str,
+        terms: list[str],
+        candidates: dict[Any, float] | None,
+    ) -> dict[Any, float]:
+        """Add the BM25 score of one query term to the candidate events.
+
+        With no candidates every event containing one of the terms is scored.
+        """
+        document_count = len(self._documents)
+        average_length = self._total_length / document_count or 1.0
+        doc_lengths = self._doc_lengths
+        k1 = SEARCH_BM25_K1
+        length_factor = k1 * SEARCH_BM25_B / average_length
+        base_norm = k1 * (1 - SEARCH_BM25_B)
+        best: dict[Any, float] = {}
+
+        for term in terms:
+            postings = self._postings[term]
+            boost = 1.0 if term == query_term else SEARCH_PREFIX_WEIGHT
+            frequency = len(postings)
+            weight = boost * (k1 + 1) * math.log(
+                1 + (document_count - frequency + 0.5) / (frequency + 0.5)
+            )
+
+            if candidates is None:
+                matched = postings.items()
+            elif len(candidates) < frequency:
+                matched = [
+                    (event_id, postings[event_id])
+                    for event_id in candidates
+                    if event_id in postings
+                ]
+            else:
+                matched = [
+                    (event_id, term_frequency)
+                    for event_id, term_frequency in postings.items()
+                    if event_id in candidates
+                ]
+
+            for event_id, term_frequency in matched:
+                score = weight * term_frequency / (
+                    term_frequency + base_norm + length_factor * doc_lengths[event_id]
+                )
+                # Keep the best match when several expansions hit the same event
+                if score > best.get(event_id, 0.0):
+                    best[event_id] = score
+
+        if candidates is None:
+            return best
+        return {
+            event_id: candidates[event_id] + score for event_id, score in best.items()
+        }
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        """Return all indexed terms starting with prefix."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+
+        vocabulary = self._vocabulary
+        matches = []
+        for position in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            term = vocabulary[position]
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
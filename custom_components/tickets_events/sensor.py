@@ -1,7 +1,9 @@
 """Sensor platform for Tickets & Events integration."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
+import heapq
+import itertools
 import logging
 from typing import Any
 
@@ -11,24 +13,54 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_AVERAGE_RATING,
+    ATTR_CATEGORY,
     ATTR_DESTINATION_TITLE,
     ATTR_DESTINATION_URL,
+    ATTR_EVENT_ID,
     ATTR_EVENTS,
     ATTR_LAST_UPDATED,
     ATTR_LOCATION_TYPE,
+    ATTR_MEDIAN_PRICE,
+    ATTR_MIN_PRICE,
+    ATTR_RATING_COUNT,
+    CONF_ATTRIBUTE_BUDGET,
     CONF_CURRENCY,
+    CONF_NEARBY_ENTITY,
+    CONF_NEARBY_RADIUS,
+    DEFAULT_ATTRIBUTE_BUDGET,
+    DEFAULT_CURRENCY,
     DEFAULT_MAX_EVENTS,
+    DEFAULT_NEARBY_RADIUS,
     DOMAIN,
+    EVENT_BOOKING_URL,
+    EVENT_ID,
+    EVENT_PRICE,
+    EVENT_TITLE,
+    EVENT_TYPE,
+    SENSOR_CATEGORY,
     SENSOR_NEARBY,
+    SENSOR_NEXT,
     SENSOR_TODAY,
 )
 from .coordinator import TicketsEventsDataUpdateCoordinator
-from .helpers import process_event_data
+from .currency import canonical_price
+from .dates import occurrence_start
+from .helpers import add_qr_codes, fit_events, json_size, process_event_data
+from .records import EventRecord
+from .stats import CategoryStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,15 +77,47 @@ async def async_setup_entry(
     sensors = [
         TicketsEventsTodaySensor(coordinator, entry),
         TicketsEventsNearbySensor(coordinator, entry),
+        TicketsEventsNextEventSensor(coordinator, entry),
     ]
 
     async_add_entities(sensors)
 
+    # One sensor per event type, following the types present in the store
+    categories: dict[str, TicketsEventsCategorySensor] = {}
+
+    @callback
+    def async_update_categories() -> None:
+        """Add sensors for new event types and remove those for vanished ones."""
+        if not coordinator.data:
+            return
+        current = set(coordinator.store.category_stats)
+
+        if new := [
+            TicketsEventsCategorySensor(coordinator, entry, category)
+            for category in sorted(current - categories.keys())
+        ]:
+            categories.update((sensor.category, sensor) for sensor in new)
+            async_add_entities(new)
+
+        registry = er.async_get(hass)
+        for category in categories.keys() - current:
+            sensor = categories.pop(category)
+            if sensor.registry_entry is not None:
+                # Removing the registry entry also removes the entity
+                registry.async_remove(sensor.entity_id)
+            else:
+                hass.async_create_task(sensor.async_remove())
+
+    async_update_categories()
+    entry.async_on_unload(coordinator.async_add_listener(async_update_categories))
+
 
 class TicketsEventsBaseSensor(CoordinatorEntity, SensorEntity):
     """Base class for Tickets & Events sensors."""
 
     _attr_has_entity_name = True
+    # The event list is the bulk of the payload and only useful live
+    _unrecorded_attributes = frozenset({ATTR_EVENTS})
 
     def __init__(
         self,
@@ -69,6 +133,12 @@ class TicketsEventsBaseSensor(CoordinatorEntity, SensorEntity):
         # Entity IDs
         self._attr_unique_id = f"{entry.entry_id}_{sensor_type}"
         self._attr_translation_key = sensor_type
+        self._attributes_cache: tuple[tuple[Any, ...], dict[str, Any]] | None = None
+
+    @property
+    def currency(self) -> str:
+        """Return the currency this entry shows prices in."""
+        return self.entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
 
     @property
     def available(self) -> bool:
@@ -87,36 +157,77 @@ class TicketsEventsBaseSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return additional state attributes."""
+        """Return additional state attributes.
+
+        The payload is rebuilt only when its inputs change, see _attributes_key.
+        """
         if not self.coordinator.data:
             return {}
 
+        key = self._attributes_key()
+        if self._attributes_cache is None or self._attributes_cache[0] != key:
+            self._attributes_cache = (key, self._build_attributes())
+        return self._attributes_cache[1]
+
+    def _attributes_key(self) -> tuple[Any, ...]:
+        """Return what the state attributes depend on."""
+        return (
+            self.coordinator.data_version,
+            self.coordinator.fx.updated,
+            self.currency,
+            self.entry.data.get(CONF_ATTRIBUTE_BUDGET, DEFAULT_ATTRIBUTE_BUDGET),
+        )
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes from the coordinator data."""
         events_data = self.coordinator.data.get("events", {})
-        events = self._get_events()
+        events = self._get_events()[:DEFAULT_MAX_EVENTS]
+        currency = self.currency
+        prices = self.coordinator.fx.event_prices(events, currency)
         
-        # Process events to add QR codes and full booking URLs
+        # Process events to add local prices and full booking URLs. QR codes
+        # are the largest field and the first trimmed, so they are added last
+        # into the budget the rest leaves.
         processed_events = [
-            process_event_data(event, self.coordinator.currency)
-            for event in events[:DEFAULT_MAX_EVENTS]
+            process_event_data(event, currency, price, qr_code=False)
+            for event, price in zip(events, prices)
         ]
 
-        return {
+        attributes = {
             ATTR_EVENTS: processed_events,
             ATTR_DESTINATION_TITLE: events_data.get("destinationTitle", ""),
             ATTR_DESTINATION_URL: events_data.get("destinationUrl", ""),
             ATTR_LOCATION_TYPE: events_data.get("locationType", "city"),
-            ATTR_LAST_UPDATED: datetime.now().isoformat(),
-            CONF_CURRENCY: self.coordinator.currency,
+            ATTR_LAST_UPDATED: self.coordinator.data_updated.isoformat(),
+            CONF_CURRENCY: currency,
         }
 
-    def _get_events(self) -> list[dict[str, Any]]:
-        """Get events list from coordinator data."""
+        # Trim the events until the whole payload fits the byte budget
+        budget = self.entry.data.get(CONF_ATTRIBUTE_BUDGET, DEFAULT_ATTRIBUTE_BUDGET)
+        size = json_size(attributes)
+        if size > budget:
+            other_size = size - json_size(processed_events)
+            attributes[ATTR_EVENTS] = fit_events(processed_events, budget - other_size)
+            _LOGGER.debug(
+                "Trimmed %s attributes from %d to %d bytes (budget %d), keeping %d of %d events",
+                self.entity_id,
+                size,
+                json_size(attributes),
+                budget,
+                len(attributes[ATTR_EVENTS]),
+                len(processed_events),
+            )
+        else:
+            size += add_qr_codes(processed_events, budget - size)
+            _LOGGER.debug("%s attributes use %d of %d bytes", self.entity_id, size, budget)
+
+        return attributes
+
+    def _get_events(self) -> list[EventRecord]:
+        """Get events list from the coordinator's store."""
         if not self.coordinator.data:
             return []
-        
-        events_data = self.coordinator.data.get("events", {})
-        # The API response contains events under "events" key
-        return events_data.get("events", [])
+        return self.coordinator.store.events
 
 
 class TicketsEventsTodaySensor(TicketsEventsBaseSensor):
@@ -132,12 +243,47 @@ class TicketsEventsTodaySensor(TicketsEventsBaseSensor):
         """Initialize the today events sensor."""
         super().__init__(coordinator, entry, SENSOR_TODAY)
         self._attr_name = "Today Events"
+        self._today = dt_util.now().date()
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Switch to the next day's events at local midnight."""
+        await super().async_added_to_hass()
+        self._today = dt_util.now().date()
+        self._async_schedule_rollover()
+        self.async_on_remove(self._async_cancel_rollover)
 
-    def _get_events(self) -> list[dict[str, Any]]:
-        """Get today's events."""
-        # For now, return all events
-        # In a real implementation, you'd filter by today's date
-        return super()._get_events()
+    @callback
+    def _async_schedule_rollover(self) -> None:
+        """Schedule the switch to the next day."""
+        next_midnight = dt_util.start_of_local_day() + timedelta(days=1)
+        self._unsub_rollover = async_track_point_in_time(
+            self.hass, self._async_rollover, next_midnight
+        )
+
+    @callback
+    def _async_cancel_rollover(self) -> None:
+        """Cancel the pending switch to the next day."""
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+
+    @callback
+    def _async_rollover(self, now: datetime) -> None:
+        """Show the events of the new day."""
+        self._today = dt_util.as_local(now).date()
+        self._async_schedule_rollover()
+        self.async_write_ha_state()
+
+    def _attributes_key(self) -> tuple[Any, ...]:
+        """Return what the state attributes depend on, including the day."""
+        return (*super()._attributes_key(), self._today)
+
+    def _get_events(self) -> list[EventRecord]:
+        """Get the events available today, from the store's date buckets."""
+        if not self.coordinator.data:
+            return []
+        return self.coordinator.store.on_date(self._today)
 
 
 class TicketsEventsNearbySensor(TicketsEventsBaseSensor):
@@ -154,7 +300,250 @@ class TicketsEventsNearbySensor(TicketsEventsBaseSensor):
         super().__init__(coordinator, entry, SENSOR_NEARBY)
         self._attr_name = "Nearby Events"
 
-    def _get_events(self) -> list[dict[str, Any]]:
-        """Get nearby events."""
-        # Return all events from the configured city
-        return super()._get_events()
+    async def async_added_to_hass(self) -> None:
+        """Follow the tracked person, device tracker or zone."""
+        await super().async_added_to_hass()
+
+        if entity_id := self.entry.data.get(CONF_NEARBY_ENTITY):
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass, [entity_id], self._async_tracked_entity_moved
+                )
+            )
+
+    @callback
+    def _async_tracked_entity_moved(self, event: Event) -> None:
+        """Re-query the spatial index when the tracked entity moves."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+        if old_state is not None and (
+            old_state.attributes.get(ATTR_LATITUDE),
+            old_state.attributes.get(ATTR_LONGITUDE),
+        ) == (
+            new_state.attributes.get(ATTR_LATITUDE),
+            new_state.attributes.get(ATTR_LONGITUDE),
+        ):
+            return
+        self.async_write_ha_state()
+
+    def _attributes_key(self) -> tuple[Any, ...]:
+        """Return what the state attributes depend on, including the search circle."""
+        return (
+            *super()._attributes_key(),
+            self._get_center(),
+            self.entry.data.get(CONF_NEARBY_RADIUS, DEFAULT_NEARBY_RADIUS),
+        )
+
+    def _get_center(self) -> tuple[float, float]:
+        """Return the point to search around.
+
+        This is the tracked entity's position when it has one, otherwise the
+        Home Assistant home location.
+        """
+        if entity_id := self.entry.data.get(CONF_NEARBY_ENTITY):
+            state = self.hass.states.get(entity_id)
+            if state is not None:
+                latitude = state.attributes.get(ATTR_LATITUDE)
+                longitude = state.attributes.get(ATTR_LONGITUDE)
+                if latitude is not None and longitude is not None:
+                    return float(latitude), float(longitude)
+        return self.hass.config.latitude, self.hass.config.longitude
+
+    def _get_events(self) -> list[EventRecord]:
+        """Get events within the configured radius, nearest first."""
+        if not self.coordinator.data:
+            return []
+
+        latitude, longitude = self._get_center()
+        radius = self.entry.data.get(CONF_NEARBY_RADIUS, DEFAULT_NEARBY_RADIUS)
+        return self.coordinator.store.nearby(latitude, longitude, radius)
+
+
+class TicketsEventsNextEventSensor(CoordinatorEntity, SensorEntity):
+    """Start time of the next event occurrence.
+
+    Upcoming occurrences are kept in a min-heap rebuilt only when the events
+    change. A single timer fires at the next start to move on to the one
+    after it, nothing is polled.
+    """
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:calendar-clock"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(
+        self,
+        coordinator: TicketsEventsDataUpdateCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the next event sensor."""
+        super().__init__(coordinator)
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_NEXT}"
+        self._attr_name = "Next Event"
+        # (start timestamp, sequence, event id), the sequence breaks ties
+        self._heap: list[tuple[float, int, Any]] = []
+        self._heap_version: int | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Build the heap and start the timer."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_timer)
+        self._async_rebuild()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Rebuild the heap when the events changed."""
+        if self.coordinator.store.version != self._heap_version:
+            self._async_rebuild()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_rebuild(self) -> None:
+        """Collect the upcoming occurrences of all events."""
+        store = self.coordinator.store
+        today = dt_util.now().date()
+        sequence = itertools.count()
+        heap = []
+        for day in store.date_index.dates:
+            if day < today:
+                continue
+            start = occurrence_start(day).timestamp()
+            heap.extend(
+                (start, next(sequence), event_id)
+                for event_id in store.date_index.on(day, include_undated=False)
+            )
+        heapq.heapify(heap)
+        self._heap = heap
+        self._heap_version = store.version
+        self._async_advance()
+
+    @callback
+    def _async_advance(self, now: datetime | None = None) -> None:
+        """Drop occurrences started by now and schedule the next transition."""
+        timestamp = (now or dt_util.utcnow()).timestamp()
+        heap = self._heap
+        while heap and heap[0][0] <= timestamp:
+            heapq.heappop(heap)
+
+        self._async_cancel_timer()
+        if heap:
+            self._unsub_timer = async_track_point_in_time(
+                self.hass,
+                self._async_transition,
+                dt_util.utc_from_timestamp(heap[0][0]),
+            )
+
+    @callback
+    def _async_transition(self, now: datetime) -> None:
+        """Move on to the following occurrence."""
+        self._unsub_timer = None
+        self._async_advance(now)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the pending transition."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @property
+    def _next_event(self) -> EventRecord | None:
+        """Return the event of the next occurrence."""
+        if not self._heap:
+            return None
+        return self.coordinator.store.get(self._heap[0][2])
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the next occurrence starts."""
+        if not self._heap:
+            return None
+        return dt_util.utc_from_timestamp(self._heap[0][0])
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the next event."""
+        if (event := self._next_event) is None:
+            return {}
+        currency = self.entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+        return {
+            ATTR_EVENT_ID: event.get(EVENT_ID),
+            EVENT_TITLE: event.get(EVENT_TITLE),
+            EVENT_TYPE: event.get(EVENT_TYPE),
+            EVENT_PRICE: self.coordinator.fx.convert(canonical_price(event), currency),
+            CONF_CURRENCY: currency,
+            EVENT_BOOKING_URL: event.get(EVENT_BOOKING_URL),
+        }
+
+
+class TicketsEventsCategorySensor(CoordinatorEntity, SensorEntity):
+    """Number of events of one type, with price and rating statistics."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:shape"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: TicketsEventsDataUpdateCoordinator,
+        entry: ConfigEntry,
+        category: str,
+    ) -> None:
+        """Initialize the sensor for category."""
+        super().__init__(coordinator)
+        self.entry = entry
+        self.category = category
+        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_CATEGORY}_{category}"
+        self._attr_name = f"{category.replace('_', ' ').title()} Events"
+
+    @property
+    def currency(self) -> str:
+        """Return the currency this entry shows prices in."""
+        return self.entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+
+    @property
+    def _stats(self) -> CategoryStats | None:
+        """Return the statistics of the category."""
+        return self.coordinator.store.category_stats.get(self.category)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self._stats is not None
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the number of events of the category."""
+        if (stats := self._stats) is None:
+            return None
+        return stats.count
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the price and rating statistics, prices in the entry currency."""
+        if (stats := self._stats) is None:
+            return {}
+
+        currency = self.currency
+        fx = self.coordinator.fx
+        return {
+            ATTR_CATEGORY: self.category,
+            ATTR_MIN_PRICE: (
+                fx.convert(stats.min_price, currency)
+                if stats.min_price is not None
+                else None
+            ),
+            ATTR_MEDIAN_PRICE: (
+                fx.convert(stats.median_price, currency)
+                if stats.median_price is not None
+                else None
+            ),
+            ATTR_AVERAGE_RATING: stats.average_rating,
+            ATTR_RATING_COUNT: stats.rating_count,
+            CONF_CURRENCY: currency,
+        }
@@ -1,56 +1,114 @@
 """Services for Tickets & Events integration."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+import heapq
 import logging
-from typing import Any
+from operator import itemgetter
+from typing import Any, TypeVar
 
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_CITY_ID,
+    ATTR_CURSOR,
     ATTR_DATE,
     ATTR_DATE_FROM,
     ATTR_DATE_TO,
+    ATTR_ENTRY_ID,
     ATTR_EVENT_ID,
+    ATTR_EVENT_IDS,
+    ATTR_FALLBACK_TO_API,
+    ATTR_FIELDS,
     ATTR_LANGUAGE,
+    ATTR_LIMIT,
+    ATTR_QR_CODE,
     ATTR_QUERY,
     ATTR_SENSOR,
     ATTR_TICKETS,
     ATTR_TIMESLOT,
     CONF_CURRENCY,
+    DATA_HUBS,
+    DEFAULT_MAX_EVENTS,
     DOMAIN,
+    EVENT_ID,
+    REFRESH_ALL,
+    REFRESH_TARGETS,
     SERVICE_GENERATE_BOOKING_URL,
+    SERVICE_GENERATE_BOOKING_URLS,
     SERVICE_GET_EVENTS_BY_DATE,
+    SERVICE_MAX_PAGE_SIZE,
+    SERVICE_QUERY_EVENTS,
     SERVICE_REFRESH_EVENTS,
     SERVICE_SEARCH_EVENTS,
     SUPPORTED_CURRENCIES,
     SUPPORTED_LANGUAGES,
 )
-from .coordinator import TicketsEventsDataUpdateCoordinator
-from .helpers import generate_booking_url
+from .coordinator import TicketsEventsDataUpdateCoordinator, TicketsEventsHubs
+from .helpers import generate_booking_url, generate_qr_code, project_event
+from .query import QueryError, parse_query, scored_events, select_events, sort_key
+from .search import merge_ranked, unique_events
+from .websocket_api import FIELDS_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+Target = tuple[TicketsEventsDataUpdateCoordinator, str]
+
 # Service schemas
+# Every service acts on the entries matching these, or on all entries
+TARGET_FIELDS = {
+    vol.Optional(ATTR_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_CITY_ID): cv.string,
+}
+
+# Services listing events return them a page at a time
+PAGE_FIELDS = {
+    vol.Optional(ATTR_FIELDS): FIELDS_SCHEMA,
+    vol.Optional(ATTR_LIMIT, default=DEFAULT_MAX_EVENTS): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=SERVICE_MAX_PAGE_SIZE)
+    ),
+    vol.Optional(ATTR_CURSOR): cv.string,
+}
+
 SEARCH_EVENTS_SCHEMA = vol.Schema(
     {
+        **TARGET_FIELDS,
+        **PAGE_FIELDS,
         vol.Required(ATTR_QUERY): cv.string,
         vol.Optional(CONF_CURRENCY): vol.In(SUPPORTED_CURRENCIES),
+        vol.Optional(ATTR_FALLBACK_TO_API, default=False): cv.boolean,
     }
 )
 
 GET_EVENTS_BY_DATE_SCHEMA = vol.Schema(
     {
-        vol.Required(ATTR_DATE_FROM): cv.string,
-        vol.Required(ATTR_DATE_TO): cv.string,
+        **TARGET_FIELDS,
+        **PAGE_FIELDS,
+        vol.Required(ATTR_DATE_FROM): cv.date,
+        vol.Required(ATTR_DATE_TO): cv.date,
+        vol.Optional(CONF_CURRENCY): vol.In(SUPPORTED_CURRENCIES),
+    }
+)
+
+QUERY_EVENTS_SCHEMA = vol.Schema(
+    {
+        **TARGET_FIELDS,
+        **PAGE_FIELDS,
+        vol.Required(ATTR_QUERY): cv.string,
         vol.Optional(CONF_CURRENCY): vol.In(SUPPORTED_CURRENCIES),
     }
 )
 
 GENERATE_BOOKING_URL_SCHEMA = vol.Schema(
     {
+        **TARGET_FIELDS,
         vol.Required(ATTR_EVENT_ID): cv.positive_int,
         vol.Optional(ATTR_DATE): cv.string,
         vol.Optional(ATTR_TIMESLOT): cv.string,
@@ -60,64 +118,313 @@ GENERATE_BOOKING_URL_SCHEMA = vol.Schema(
     }
 )
 
+GENERATE_BOOKING_URLS_SCHEMA = vol.Schema(
+    {
+        **TARGET_FIELDS,
+        vol.Required(ATTR_EVENT_IDS): vol.All(
+            cv.ensure_list, [cv.positive_int], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_DATE): cv.string,
+        vol.Optional(ATTR_TIMESLOT): cv.string,
+        vol.Optional(ATTR_TICKETS): dict,
+        vol.Optional(ATTR_LANGUAGE): vol.In(SUPPORTED_LANGUAGES),
+        vol.Optional(CONF_CURRENCY): vol.In(SUPPORTED_CURRENCIES),
+        vol.Optional(ATTR_QR_CODE, default=False): cv.boolean,
+    }
+)
+
 REFRESH_EVENTS_SCHEMA = vol.Schema(
     {
-        vol.Optional(ATTR_SENSOR): cv.string,
+        **TARGET_FIELDS,
+        vol.Optional(ATTR_SENSOR): vol.In(REFRESH_TARGETS),
     }
 )
 
 
-async def async_setup_services(
-    hass: HomeAssistant,
-    coordinator: TicketsEventsDataUpdateCoordinator,
-) -> None:
-    """Set up services for Tickets & Events."""
+@callback
+def _async_targets(hass: HomeAssistant, call: ServiceCall) -> list[Target]:
+    """Return the coordinators a call is for, with the currency to use for each."""
+    hubs: TicketsEventsHubs = hass.data[DOMAIN][DATA_HUBS]
+    targets = hubs.async_targets(
+        call.data.get(ATTR_ENTRY_ID), call.data.get(ATTR_CITY_ID)
+    )
+    if (currency := call.data.get(CONF_CURRENCY)) is not None:
+        return [(coordinator, currency) for coordinator, _currency in targets]
+    return targets
+
+
+def _no_targets(call: ServiceCall) -> dict[str, Any]:
+    """Return the response to a call matching no entry."""
+    _LOGGER.error(
+        "No Tickets & Events entry matches entry_id %s and city_id %s",
+        call.data.get(ATTR_ENTRY_ID),
+        call.data.get(ATTR_CITY_ID),
+    )
+    return {
+        "success": False,
+        "error": "No matching Tickets & Events entry",
+    }
+
+
+async def _async_gather(
+    targets: list[Target],
+    job: Callable[[TicketsEventsDataUpdateCoordinator, str], Awaitable[_T]],
+    action: str,
+) -> tuple[list[_T], list[Exception]]:
+    """Run job for every target concurrently, returning results and errors.
+
+    The coordinators share one API rate limit, so fanning out does not
+    multiply the calls allowed.
+    """
+    outcomes = await asyncio.gather(
+        *(job(coordinator, currency) for coordinator, currency in targets),
+        return_exceptions=True,
+    )
+    results: list[_T] = []
+    errors: list[Exception] = []
+    for (coordinator, _currency), outcome in zip(targets, outcomes):
+        if isinstance(outcome, Exception):
+            _LOGGER.error("Error %s for %s: %s", action, coordinator.city_name, outcome)
+            errors.append(outcome)
+        else:
+            results.append(outcome)
+    return results, errors
+
+
+def _versions(targets: list[Target]) -> str:
+    """Return the store versions of targets, as kept in cursors."""
+    return "-".join(str(coordinator.store.version) for coordinator, _currency in targets)
+
+
+def _page_offset(call: ServiceCall, targets: list[Target]) -> int | None:
+    """Return where the page asked for starts, None if its cursor is stale.
+
+    A cursor holds the store versions it was made for, so following pages
+    come from the same ranking as long as the events do not change.
+    """
+    if (cursor := call.data.get(ATTR_CURSOR)) is None:
+        return 0
+    versions, _, offset = cursor.rpartition(":")
+    if versions != _versions(targets) or not offset.isdigit():
+        return None
+    return int(offset)
+
+
+def _cursor_expired() -> dict[str, Any]:
+    """Return the response to a call with a stale cursor."""
+    _LOGGER.debug("Cursor expired, events changed since the first page")
+    return {
+        "success": False,
+        "error": "Events changed, request the first page again",
+    }
+
+
+def _page(
+    call: ServiceCall,
+    targets: list[Target],
+    currency: str,
+    events: Sequence[Mapping[str, Any]],
+    offset: int,
+    total: int,
+) -> dict[str, Any]:
+    """Return the projected page of events from offset, and the next cursor."""
+    page = events[offset : offset + call.data[ATTR_LIMIT]]
+    prices = targets[0][0].fx.event_prices(page, currency)
+    end = offset + len(page)
+    return {
+        "events": [
+            project_event(event, currency, price, call.data.get(ATTR_FIELDS))
+            for event, price in zip(page, prices)
+        ],
+        "total_count": total,
+        "next_cursor": f"{_versions(targets)}:{end}" if end < total else None,
+    }
+
+
+def _find_event(
+    targets: list[Target], event_id: int
+) -> tuple[Any, str] | tuple[None, None]:
+    """Return an event and the currency of the first target having it."""
+    for coordinator, currency in targets:
+        if (event := coordinator.store.get(event_id)) is not None:
+            return event, currency
+    return None, None
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up services for Tickets & Events.
+
+    Services are registered once for all entries. A call acts on the entry
+    given by entry_id, the entries of city_id, or else on every entry.
+    """
 
     async def handle_search_events(call: ServiceCall) -> None:
         """Handle search events service."""
         query = call.data[ATTR_QUERY]
-        currency = call.data.get(CONF_CURRENCY)
-        
-        _LOGGER.debug("Searching events with query: %s", query)
-        
-        try:
-            results = await coordinator.async_search_events(query, currency)
-            _LOGGER.info("Found %d events matching '%s'", len(results.get("offeringCards", [])), query)
-            
-            # Return results
-            return {
-                "success": True,
-                "results": results,
+        fallback_to_api = call.data[ATTR_FALLBACK_TO_API]
+        if not (targets := _async_targets(hass, call)):
+            return _no_targets(call)
+        if (offset := _page_offset(call, targets)) is None:
+            return _cursor_expired()
+
+        # Results merged from several cities are priced in one currency
+        currency = targets[0][1]
+
+        _LOGGER.debug("Searching %d cities for: %s", len(targets), query)
+
+        rankings = [coordinator.search_matches(query) for coordinator, _currency in targets]
+        if any(rankings) or not fallback_to_api:
+            events = merge_ranked(rankings, offset + call.data[ATTR_LIMIT])
+            total = len(
+                {event.get(EVENT_ID) for ranking in rankings for event, _score in ranking}
+            )
+            results = {
+                **_page(call, targets, currency, events, offset, total),
+                "destination_title": f"Search: {query}",
+                "location_type": "search",
+                "query": query,
+                "currency": currency,
+                "source": "local",
             }
-        except Exception as err:
-            _LOGGER.error("Error searching events: %s", err)
-            return {
-                "success": False,
-                "error": str(err),
+        else:
+            # The search endpoint is not per city, one call answers every target
+            found, errors = await _async_gather(
+                targets[:1],
+                lambda coordinator, _currency: coordinator.async_search_events(
+                    query, currency, fallback_to_api
+                ),
+                "searching events",
+            )
+            if not found:
+                return {
+                    "success": False,
+                    "error": str(errors[0]),
+                }
+
+            # API results are not stored, so they come as a single page
+            events = unique_events(found[0].get("events", []), call.data[ATTR_LIMIT])
+            if (fields := call.data.get(ATTR_FIELDS)) is not None:
+                events = [
+                    {field: event[field] for field in fields if field in event}
+                    for event in events
+                ]
+            results = {
+                "events": events,
+                "total_count": len(events),
+                "next_cursor": None,
+                "destination_title": f"Search: {query}",
+                "location_type": "search",
+                "query": query,
+                "currency": currency,
+                "source": "api",
             }
 
+        _LOGGER.info("Found %d events matching '%s'", results["total_count"], query)
+        return {
+            "success": True,
+            "results": results,
+        }
+
     async def handle_get_events_by_date(call: ServiceCall) -> None:
-        """Handle get events by date service."""
+        """Handle get events by date service.
+
+        Events come from the stored events, by their first date in the range.
+        """
         date_from = call.data[ATTR_DATE_FROM]
         date_to = call.data[ATTR_DATE_TO]
-        currency = call.data.get(CONF_CURRENCY)
-        
-        _LOGGER.debug("Getting events from %s to %s", date_from, date_to)
-        
-        try:
-            results = await coordinator.async_get_events_by_date(date_from, date_to, currency)
-            _LOGGER.info("Found %d events in date range", len(results.get("offeringCards", [])))
-            
+        if date_to < date_from:
             return {
-                "success": True,
-                "results": results,
+                "success": False,
+                "error": "date_to is before date_from",
             }
-        except Exception as err:
-            _LOGGER.error("Error getting events by date: %s", err)
+        if not (targets := _async_targets(hass, call)):
+            return _no_targets(call)
+        if (offset := _page_offset(call, targets)) is None:
+            return _cursor_expired()
+
+        currency = targets[0][1]
+
+        _LOGGER.debug("Getting events from %s to %s", date_from, date_to)
+
+        spans = [
+            coordinator.store.between(date_from, date_to)
+            for coordinator, _currency in targets
+        ]
+        merged = heapq.merge(*spans, key=itemgetter(0))
+        events = unique_events(
+            (event for _day, event in merged), offset + call.data[ATTR_LIMIT]
+        )
+        total = len({event.get(EVENT_ID) for span in spans for _day, event in span})
+
+        _LOGGER.info("Found %d events in date range", total)
+        return {
+            "success": True,
+            "results": {
+                **_page(call, targets, currency, events, offset, total),
+                "date_from": date_from.isoformat(),
+                "date_to": date_to.isoformat(),
+                "currency": currency,
+            },
+        }
+
+    async def handle_query_events(call: ServiceCall) -> None:
+        """Handle query events service.
+
+        The query is evaluated against the indexes of each targeted entry,
+        see the query module for its language.
+        """
+        if not (targets := _async_targets(hass, call)):
+            return _no_targets(call)
+        try:
+            query = parse_query(call.data[ATTR_QUERY], dt_util.now().date())
+        except QueryError as err:
+            _LOGGER.error("Invalid event query: %s", err)
             return {
                 "success": False,
                 "error": str(err),
             }
+        if (offset := _page_offset(call, targets)) is None:
+            return _cursor_expired()
+
+        currency = targets[0][1]
+        wanted = offset + call.data[ATTR_LIMIT]
+        selected = [
+            select_events(coordinator.store, coordinator.fx, query, currency, wanted)
+            for coordinator, _currency in targets
+        ]
+
+        # Sorted matches merge on their values, rankings on their scores
+        if (key := sort_key(query)) is not None:
+            merged = heapq.merge(
+                *(first for first, _matches in selected),
+                key=key,
+                reverse=query.descending,
+            )
+            events = unique_events((event for event, _price in merged), wanted)
+        else:
+            events = merge_ranked(
+                [
+                    scored_events(coordinator.store, query, first)
+                    for (coordinator, _currency), (first, _matches) in zip(
+                        targets, selected
+                    )
+                ],
+                wanted,
+            )
+        # Entries may share events, which are listed once
+        total = len(
+            {event.get(EVENT_ID) for _first, matches in selected for event, _price in matches}
+        )
+
+        _LOGGER.debug("Query %r matched %d events", call.data[ATTR_QUERY], total)
+        return {
+            "success": True,
+            "results": {
+                **_page(call, targets, currency, events, offset, total),
+                "query": call.data[ATTR_QUERY],
+                "currency": currency,
+            },
+        }
 
     async def handle_generate_booking_url(call: ServiceCall) -> None:
         """Handle generate booking URL service."""
@@ -126,28 +433,28 @@ async def async_setup_services(
         timeslot = call.data.get(ATTR_TIMESLOT)
         tickets = call.data.get(ATTR_TICKETS)
         language = call.data.get(ATTR_LANGUAGE)
-        currency = call.data.get(CONF_CURRENCY, coordinator.currency)
-        
+        if not (targets := _async_targets(hass, call)):
+            return _no_targets(call)
+
         _LOGGER.debug("Generating booking URL for event ID: %s", event_id)
-        
+
         # Find event in coordinator data
-        if not coordinator.data:
+        if not any(coordinator.data for coordinator, _currency in targets):
             _LOGGER.error("No event data available")
             return {
                 "success": False,
                 "error": "No event data available",
             }
-        
-        events = coordinator.data.get("events", {}).get("offeringCards", [])
-        event = next((e for e in events if e.get("id") == event_id), None)
-        
+
+        event, currency = _find_event(targets, event_id)
+
         if not event:
             _LOGGER.error("Event ID %s not found", event_id)
             return {
                 "success": False,
                 "error": f"Event ID {event_id} not found",
             }
-        
+
         # Generate URL
         try:
             booking_url = generate_booking_url(
@@ -158,9 +465,9 @@ async def async_setup_services(
                 tickets=tickets,
                 language=language,
             )
-            
+
             _LOGGER.info("Generated booking URL for event: %s", event.get("title"))
-            
+
             return {
                 "success": True,
                 "booking_url": booking_url,
@@ -174,25 +481,95 @@ async def async_setup_services(
                 "error": str(err),
             }
 
+    async def handle_generate_booking_urls(call: ServiceCall) -> None:
+        """Handle generate booking URLs service, for many events at once."""
+        event_ids = list(dict.fromkeys(call.data[ATTR_EVENT_IDS]))
+        options = {
+            "date": call.data.get(ATTR_DATE),
+            "timeslot": call.data.get(ATTR_TIMESLOT),
+            "tickets": call.data.get(ATTR_TICKETS),
+            "language": call.data.get(ATTR_LANGUAGE),
+        }
+        if not (targets := _async_targets(hass, call)):
+            return _no_targets(call)
+
+        _LOGGER.debug("Generating booking URLs for %d events", len(event_ids))
+
+        results = []
+        missing = []
+        for event_id in event_ids:
+            event, currency = _find_event(targets, event_id)
+            if event is None:
+                missing.append(event_id)
+                continue
+            results.append(
+                {
+                    "event_id": event_id,
+                    "event_title": event.get("title"),
+                    "booking_url": generate_booking_url(
+                        event=event, currency=currency, **options
+                    ),
+                }
+            )
+
+        if call.data[ATTR_QR_CODE] and results:
+            # Rendering PNGs is CPU bound, keep it off the event loop
+            qr_codes = await asyncio.gather(
+                *(
+                    hass.async_add_executor_job(generate_qr_code, result["booking_url"])
+                    for result in results
+                )
+            )
+            for result, qr_code in zip(results, qr_codes):
+                result[ATTR_QR_CODE] = qr_code
+
+        if missing:
+            _LOGGER.warning("Event IDs not found: %s", missing)
+
+        return {
+            "success": bool(results),
+            "urls": results,
+            "missing": missing,
+        }
+
     async def handle_refresh_events(call: ServiceCall) -> None:
-        """Handle refresh events service."""
+        """Handle refresh events service.
+
+        Only the data behind the given sensor is refreshed, and requests
+        arriving together share one refresh.
+        """
         sensor = call.data.get(ATTR_SENSOR)
-        
-        _LOGGER.debug("Refreshing events (sensor: %s)", sensor or "all")
-        
-        try:
-            await coordinator.async_request_refresh()
-            _LOGGER.info("Events refreshed successfully")
-            
+        part = REFRESH_TARGETS[sensor] if sensor else REFRESH_ALL
+        if not (targets := _async_targets(hass, call)):
+            return _no_targets(call)
+
+        _LOGGER.debug("Refreshing %s (sensor: %s)", part, sensor or "all")
+
+        refreshed, errors = await _async_gather(
+            targets,
+            lambda coordinator, _currency: coordinator.async_refresh_part(part),
+            "refreshing events",
+        )
+        if errors:
             return {
-                "success": True,
+                "success": False,
+                "error": str(errors[0]),
             }
-        except Exception as err:
-            _LOGGER.error("Error refreshing events: %s", err)
+
+        _LOGGER.info("Events refreshed successfully")
+
+        if len(targets) == 1:
             return {
-                "success": False,
-                "error": str(err),
+                "success": True,
+                **refreshed[0],
             }
+        return {
+            "success": True,
+            "refreshed": part,
+            "changed": any(result["changed"] for result in refreshed),
+            "events": sum(result["events"] for result in refreshed),
+            "cities": len(refreshed),
+        }
 
     # Register services
     hass.services.async_register(
@@ -211,6 +588,14 @@ async def async_setup_services(
         supports_response="optional",
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_EVENTS,
+        handle_query_events,
+        schema=QUERY_EVENTS_SCHEMA,
+        supports_response="optional",
+    )
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_GENERATE_BOOKING_URL,
@@ -219,11 +604,21 @@ async def async_setup_services(
         supports_response="optional",
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GENERATE_BOOKING_URLS,
+        handle_generate_booking_urls,
+        schema=GENERATE_BOOKING_URLS_SCHEMA,
+        supports_response="optional",
+    )
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_REFRESH_EVENTS,
         handle_refresh_events,
         schema=REFRESH_EVENTS_SCHEMA,
+        supports_response="optional",
     )
 
     _LOGGER.info("Services registered for %s", DOMAIN)
+
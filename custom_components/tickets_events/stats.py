@@ -0,0 +1,44 @@
+"""Aggregate statistics over Tickets & Events events."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from statistics import median
+from typing import Any, NamedTuple
+
+from .const import EVENT_RATING, EVENT_RATING_COUNT
+from .currency import canonical_price
+
+
+class CategoryStats(NamedTuple):
+    """Statistics of one category, prices in the canonical currency."""
+
+    count: int
+    min_price: float | None
+    median_price: float | None
+    average_rating: float | None
+    rating_count: int
+
+
+def compute_stats(events: Iterable[Mapping[str, Any]]) -> CategoryStats:
+    """Return the statistics of events in one pass.
+
+    The average rating is weighted by each event's number of ratings.
+    """
+    prices = []
+    weighted_sum = 0.0
+    rating_count = 0
+    for event in events:
+        prices.append(canonical_price(event))
+        rating = event.get(EVENT_RATING)
+        count = event.get(EVENT_RATING_COUNT) or 0
+        if rating is not None and count > 0:
+            weighted_sum += float(rating) * count
+            rating_count += count
+
+    return CategoryStats(
+        count=len(prices),
+        min_price=min(prices) if prices else None,
+        median_price=median(prices) if prices else None,
+        average_rating=round(weighted_sum / rating_count, 2) if rating_count else None,
+        rating_count=rating_count,
+    )
@@ -0,0 +1,343 @@
+"""In-memory event store for Tickets & Events."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date
+import logging
+from typing import Any
+
+from .const import EVENT_ID, EVENT_RATING, EVENT_TYPE, STORE_CHANGELOG_SIZE
+from .currency import canonical_price
+from .dates import DateIndex
+from .geo import GeoIndex
+from .helpers import CalendarTextCache
+from .records import EventRecord
+from .search import EventSearchIndex
+from .stats import CategoryStats, compute_stats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+_MISSING = object()
+
+
+def _same_event(record: EventRecord, event: Mapping[str, Any]) -> bool:
+    """Return True if a stored record holds the same fields as an API event."""
+    return len(record) == len(event) and all(
+        record.get(key, _MISSING) == value for key, value in event.items()
+    )
+
+
+class FieldIndex:
+    """Event ids grouped by the value of one field."""
+
+    def __init__(self, field: str) -> None:
+        """Initialize an empty index on field."""
+        self.field = field
+        # value -> event ids, dicts used as insertion-ordered sets
+        self._buckets: dict[Any, dict[Any, None]] = {}
+        self._value_of: dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct values."""
+        return len(self._buckets)
+
+    def add(self, event_id: Any, event: Mapping[str, Any]) -> None:
+        """Index an event, replacing any previous value."""
+        self.remove(event_id)
+        if (value := event.get(self.field)) is None:
+            return
+        self._buckets.setdefault(value, {})[event_id] = None
+        self._value_of[event_id] = value
+
+    def remove(self, event_id: Any) -> None:
+        """Remove an event from the index."""
+        if (value := self._value_of.pop(event_id, None)) is None:
+            return
+        bucket = self._buckets[value]
+        del bucket[event_id]
+        if not bucket:
+            del self._buckets[value]
+
+    def clear(self) -> None:
+        """Remove all events from the index."""
+        self._buckets.clear()
+        self._value_of.clear()
+
+    def values(self) -> list[Any]:
+        """Return the indexed values."""
+        return list(self._buckets)
+
+    def ids(self, value: Any) -> list[Any]:
+        """Return the ids of the events having value."""
+        return list(self._buckets.get(value, ()))
+
+    def count(self, value: Any) -> int:
+        """Return the number of events having value."""
+        return len(self._buckets.get(value, ()))
+
+
+class RangeIndex:
+    """Event ids sorted by a numeric value, for range lookups.
+
+    Built once from a snapshot of the events; events without a value are
+    left out.
+    """
+
+    def __init__(
+        self,
+        events: Iterable[tuple[Any, Mapping[str, Any]]],
+        value: Callable[[Mapping[str, Any]], float | None],
+    ) -> None:
+        """Index the (event_id, event) pairs on value(event)."""
+        pairs = sorted(
+            (
+                (number, event_id)
+                for event_id, event in events
+                if (number := value(event)) is not None
+            ),
+            key=lambda pair: pair[0],
+        )
+        self._values = [number for number, _event_id in pairs]
+        self._ids = [event_id for _number, event_id in pairs]
+
+    def __len__(self) -> int:
+        """Return the number of indexed events."""
+        return len(self._ids)
+
+    def _span(self, low: float | None, high: float | None) -> tuple[int, int]:
+        """Return the positions of the values from low to high, both included."""
+        first = 0 if low is None else bisect_left(self._values, low)
+        last = len(self._values) if high is None else bisect_right(self._values, high)
+        return first, max(first, last)
+
+    def count(self, low: float | None, high: float | None) -> int:
+        """Return the number of events valued from low to high."""
+        first, last = self._span(low, high)
+        return last - first
+
+    def ids(self, low: float | None, high: float | None) -> list[Any]:
+        """Return the ids of the events valued from low to high, lowest first."""
+        first, last = self._span(low, high)
+        return self._ids[first:last]
+
+
+def _rating(event: Mapping[str, Any]) -> float | None:
+    """Return the rating of an event, if rated."""
+    if (rating := event.get(EVENT_RATING)) is None:
+        return None
+    return float(rating)
+
+
+class EventStore:
+    """Events of one coordinator, keyed by id, with their local indexes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._events: dict[Any, EventRecord] = {}
+        # Store version each event last changed in
+        self._revisions: dict[Any, int] = {}
+        self.search_index = EventSearchIndex()
+        self.geo_index = GeoIndex()
+        self.date_index = DateIndex()
+        self.type_index = FieldIndex(EVENT_TYPE)
+        self.calendar_texts = CalendarTextCache()
+        self._category_stats: dict[Any, CategoryStats] | None = None
+        # Sorted on demand, once per version
+        self._price_index: RangeIndex | None = None
+        self._rating_index: RangeIndex | None = None
+        # API order of the events
+        self._positions: dict[Any, int] = {}
+        # Bumped whenever the stored events change
+        self.version = 0
+        # (version, changed or added ids, removed ids) of the latest updates
+        self._changelog: deque[tuple[int, frozenset[Any], frozenset[Any]]] = deque(
+            maxlen=STORE_CHANGELOG_SIZE
+        )
+
+    def __len__(self) -> int:
+        """Return the number of stored events."""
+        return len(self._events)
+
+    def __contains__(self, event_id: Any) -> bool:
+        """Return True if the event is stored."""
+        return event_id in self._events
+
+    @property
+    def events(self) -> list[EventRecord]:
+        """Return all events in API order."""
+        return list(self._events.values())
+
+    def get(self, event_id: Any) -> EventRecord | None:
+        """Return an event by id."""
+        return self._events.get(event_id)
+
+    def position(self, event_id: Any) -> int:
+        """Return the place of a stored event in API order."""
+        return self._positions[event_id]
+
+    def describe(
+        self, event: Mapping[str, Any], price: float, currency: str
+    ) -> tuple[str, str]:
+        """Return the calendar description and location of a stored event."""
+        return self.calendar_texts.get(
+            event, self._revisions.get(event.get(EVENT_ID)), price, currency
+        )
+
+    def update(self, events: list[dict[str, Any]]) -> bool:
+        """Replace the stored events, re-indexing only what changed.
+
+        Unchanged events keep their existing record, so only new and changed
+        ones are converted. Returns True if any event was added, changed or
+        removed.
+        """
+        new_events: dict[Any, EventRecord] = {}
+        changed: list[Any] = []
+
+        for event in events:
+            event_id = event.get(EVENT_ID)
+            if event_id is None:
+                continue
+            record = self._events.get(event_id)
+            if record is not None and _same_event(record, event):
+                new_events[event_id] = record
+            else:
+                new_events[event_id] = EventRecord(event)
+                changed.append(event_id)
+
+        removed = [
+            event_id for event_id in self._events if event_id not in new_events
+        ]
+
+        for event_id in removed:
+            self.search_index.remove(event_id)
+            self.geo_index.remove(event_id)
+            self.date_index.remove(event_id)
+            self.type_index.remove(event_id)
+            self.calendar_texts.discard(event_id)
+        for event_id in changed:
+            self.calendar_texts.discard(event_id)
+            self.search_index.add(event_id, new_events[event_id])
+            self.geo_index.add(event_id, new_events[event_id])
+            self.date_index.add(event_id, new_events[event_id])
+            self.type_index.add(event_id, new_events[event_id])
+
+        self._positions = {event_id: place for place, event_id in enumerate(new_events)}
+        self._events = new_events
+        if changed or removed:
+            self.version += 1
+            for event_id in removed:
+                del self._revisions[event_id]
+            for event_id in changed:
+                self._revisions[event_id] = self.version
+            self._category_stats = None
+            self._price_index = None
+            self._rating_index = None
+            self._changelog.append(
+                (self.version, frozenset(changed), frozenset(removed))
+            )
+
+        _LOGGER.debug(
+            "Event store updated: %d events, %d changed, %d removed",
+            len(new_events),
+            len(changed),
+            len(removed),
+        )
+        return bool(changed or removed)
+
+    def changes_since(self, version: int) -> tuple[set[Any], set[Any]] | None:
+        """Return the (changed or added, removed) ids since version.
+
+        Returns None when version is unknown or too old to diff against.
+        """
+        if version == self.version:
+            return set(), set()
+        if not 0 <= version < self.version or not self._changelog:
+            return None
+        if self._changelog[0][0] > version + 1:
+            return None
+
+        changed: set[Any] = set()
+        removed: set[Any] = set()
+        for entry_version, entry_changed, entry_removed in self._changelog:
+            if entry_version <= version:
+                continue
+            changed -= entry_removed
+            removed -= entry_changed
+            changed |= entry_changed
+            removed |= entry_removed
+        return changed, removed
+
+    def search(self, query: str, limit: int | None = None) -> list[EventRecord]:
+        """Return events matching query, best match first."""
+        return [event for event, _score in self.search_scored(query, limit)]
+
+    def search_scored(
+        self, query: str, limit: int | None = None
+    ) -> list[tuple[EventRecord, float]]:
+        """Return (event, search score) pairs matching query, best match first."""
+        return [
+            (self._events[event_id], score)
+            for event_id, score in self.search_index.search(query, limit)
+        ]
+
+    @property
+    def category_stats(self) -> dict[Any, CategoryStats]:
+        """Return statistics per event type, computed once per version."""
+        if self._category_stats is None:
+            self._category_stats = {
+                event_type: compute_stats(
+                    self._events[event_id] for event_id in self.type_index.ids(event_type)
+                )
+                for event_type in self.type_index.values()
+            }
+        return self._category_stats
+
+    @property
+    def price_index(self) -> RangeIndex:
+        """Return the events sorted by canonical price, built once per version."""
+        if self._price_index is None:
+            self._price_index = RangeIndex(self._events.items(), canonical_price)
+        return self._price_index
+
+    @property
+    def rating_index(self) -> RangeIndex:
+        """Return the rated events sorted by rating, built once per version."""
+        if self._rating_index is None:
+            self._rating_index = RangeIndex(self._events.items(), _rating)
+        return self._rating_index
+
+    def on_date(self, day: date) -> list[EventRecord]:
+        """Return the events available on a local date, undated ones included."""
+        return [self._events[event_id] for event_id in self.date_index.on(day)]
+
+    def between(self, start: date, end: date) -> list[tuple[date, EventRecord]]:
+        """Return (first date, event) of the events available from start to end."""
+        return [
+            (day, self._events[event_id])
+            for day, event_id in self.date_index.between(start, end)
+        ]
+
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int | None = None,
+    ) -> list[EventRecord]:
+        """Return events within radius_km of a point, nearest first."""
+        matches = self.geo_index.within(latitude, longitude, radius_km)
+        if limit is not None:
+            matches = matches[:limit]
+        return [self._events[event_id] for event_id, _distance in matches]
+
+    def nearest(
+        self, latitude: float, longitude: float, count: int
+    ) -> list[EventRecord]:
+        """Return the count events closest to a point, nearest first."""
+        return [
+            self._events[event_id]
+            for event_id, _distance in self.geo_index.nearest(latitude, longitude, count)
+        ]
@@ -0,0 +1,62 @@
+"""Day index for Tickets & Events calendars."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import date
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class Timeline(Generic[_T]):
+    """Items occurring on some days, bucketed by day for range queries.
+
+    Each day keeps the items occurring on it in the order they were given,
+    so a range of days is answered from its own buckets by bisecting the
+    sorted days, however long before it an item starts or after it ends.
+    Buckets only hold references to the items, nothing is built per
+    occurrence.
+    """
+
+    def __init__(self, items: Iterable[tuple[_T, Iterable[date]]]) -> None:
+        """Index (item, days) pairs."""
+        self._items: list[_T] = []
+        self._buckets: dict[date, list[_T]] = {}
+        for item, days in items:
+            self._items.append(item)
+            for day in days:
+                self._buckets.setdefault(day, []).append(item)
+        self._days = sorted(self._buckets)
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[_T]:
+        """Iterate over all items in order."""
+        return iter(self._items)
+
+    def between(self, first_day: date, last_day: date) -> Iterator[tuple[date, _T]]:
+        """Yield (day, item) of the occurrences from first_day to last_day, by day.
+
+        Both ends are included.
+        """
+        days = self._days
+        for day in days[bisect_left(days, first_day) : bisect_right(days, last_day)]:
+            for item in self._buckets[day]:
+                yield day, item
+
+    def first_from(self, day: date) -> tuple[date, _T] | None:
+        """Return (day, item) of the first occurrence on or after day."""
+        if (index := bisect_left(self._days, day)) == len(self._days):
+            return None
+        first = self._days[index]
+        return first, self._buckets[first][0]
+
+    def first(self) -> tuple[date, _T] | None:
+        """Return (day, item) of the earliest occurrence."""
+        if not self._days:
+            return None
+        first = self._days[0]
+        return first, self._buckets[first][0]
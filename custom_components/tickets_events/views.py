@@ -0,0 +1,229 @@
+"""HTTP API for Tickets & Events."""
+from __future__ import annotations
+
+from datetime import date, datetime
+from email.utils import formatdate
+from http import HTTPStatus
+import logging
+import zlib
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .cache import LRUCache
+from .const import (
+    DOMAIN,
+    ICS_CHUNK_SIZE,
+    ICS_DEFAULT_FUTURE,
+    ICS_DEFAULT_PAST,
+    SUPPORTED_CURRENCIES,
+    VIEW_CACHE_SIZE,
+    VIEW_CACHE_TTL,
+)
+from .coordinator import async_get_entry_coordinator
+from .ics import iter_calendar
+from .records import EVENT_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _http_date(when: datetime) -> str:
+    """Format a datetime as an HTTP date."""
+    return formatdate(dt_util.as_utc(when).timestamp(), usegmt=True)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header covers etag."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class TicketsEventsView(HomeAssistantView):
+    """Serve the events of a config entry as JSON.
+
+    Query parameters: currency, fields (comma separated) and since (a store
+    version, to get only the changes after it). Responses carry an ETag built
+    from the store version, so unchanged polls are answered with 304 before
+    anything is serialized.
+    """
+
+    url = f"/api/{DOMAIN}/{{entry_id}}/events"
+    name = f"api:{DOMAIN}:events"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        # (entry id, ETag) -> serialized body, shared by clients polling the same version
+        self._bodies = LRUCache(VIEW_CACHE_SIZE, VIEW_CACHE_TTL)
+
+    async def get(self, request: web.Request, entry_id: str) -> web.StreamResponse:
+        """Return a snapshot of the events, or the changes since a version."""
+        hass: HomeAssistant = request.app["hass"]
+        if (found := async_get_entry_coordinator(hass, entry_id)) is None:
+            return self.json_message("Entry not found", HTTPStatus.NOT_FOUND)
+        coordinator, currency = found
+
+        query = request.query
+        currency = query.get("currency", currency)
+        if currency not in SUPPORTED_CURRENCIES:
+            return self.json_message("Unsupported currency", HTTPStatus.BAD_REQUEST)
+
+        fields = None
+        if raw_fields := query.get("fields"):
+            fields = [field.strip() for field in raw_fields.split(",")]
+            if not set(fields) <= set(EVENT_FIELDS):
+                return self.json_message("Unknown field", HTTPStatus.BAD_REQUEST)
+
+        since = None
+        if "since" in query:
+            try:
+                since = int(query["since"])
+            except ValueError:
+                return self.json_message("Invalid since", HTTPStatus.BAD_REQUEST)
+
+        # Everything the body depends on goes into the tag
+        fx_updated = coordinator.fx.updated
+        etag = "-".join(
+            (
+                str(coordinator.store.version),
+                currency,
+                str(int(fx_updated.timestamp())) if fx_updated else "0",
+                f"{zlib.crc32(','.join(fields).encode()):x}" if fields else "all",
+                "full" if since is None else f"since{since}",
+            )
+        )
+        etag = f'"{etag}"'
+        headers = {hdrs.ETAG: etag, hdrs.CACHE_CONTROL: "no-cache"}
+
+        if _etag_matches(request.headers.get(hdrs.IF_NONE_MATCH), etag):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        if (body := self._bodies.get((entry_id, etag))) is None:
+            if since is None:
+                payload = coordinator.events_snapshot(currency, fields)
+            else:
+                payload = coordinator.events_changes(since, currency, fields)
+            body = json_bytes(payload)
+            self._bodies.set((entry_id, etag), body)
+            _LOGGER.debug("Serialized %d bytes of events for %s", len(body), etag)
+
+        response = web.Response(
+            body=body, content_type="application/json", headers=headers
+        )
+        # Compressed when the client accepts it
+        response.enable_compression()
+        return response
+
+
+class TicketsEventsCalendarView(HomeAssistantView):
+    """Serve the events of a config entry as an iCalendar feed.
+
+    Query parameters: currency, start and end (ISO dates, both included,
+    default a week ago to 90 days ahead). The document is streamed in chunks
+    straight from the store. ETag and Last-Modified follow the data version,
+    so subscribed calendars polling an unchanged feed get a 304.
+    """
+
+    url = f"/api/{DOMAIN}/{{entry_id}}/events.ics"
+    name = f"api:{DOMAIN}:calendar"
+
+    async def get(self, request: web.Request, entry_id: str) -> web.StreamResponse:
+        """Stream the occurrences of the events within the date window."""
+        hass: HomeAssistant = request.app["hass"]
+        if (found := async_get_entry_coordinator(hass, entry_id)) is None:
+            return self.json_message("Entry not found", HTTPStatus.NOT_FOUND)
+        coordinator, currency = found
+
+        query = request.query
+        currency = query.get("currency", currency)
+        if currency not in SUPPORTED_CURRENCIES:
+            return self.json_message("Unsupported currency", HTTPStatus.BAD_REQUEST)
+
+        today = dt_util.now().date()
+        try:
+            first_day = date.fromisoformat(query.get("start", ""))
+        except ValueError:
+            if "start" in query:
+                return self.json_message("Invalid start", HTTPStatus.BAD_REQUEST)
+            first_day = today - ICS_DEFAULT_PAST
+        try:
+            last_day = date.fromisoformat(query.get("end", ""))
+        except ValueError:
+            if "end" in query:
+                return self.json_message("Invalid end", HTTPStatus.BAD_REQUEST)
+            last_day = today + ICS_DEFAULT_FUTURE
+        if last_day < first_day:
+            return self.json_message("End before start", HTTPStatus.BAD_REQUEST)
+
+        # Undated events are shown today, so the day goes into the tag too
+        fx_updated = coordinator.fx.updated
+        etag = "-".join(
+            (
+                str(coordinator.store.version),
+                currency,
+                str(int(fx_updated.timestamp())) if fx_updated else "0",
+                f"{first_day:%Y%m%d}",
+                f"{last_day:%Y%m%d}",
+                f"{today:%Y%m%d}",
+            )
+        )
+        etag = f'"{etag}"'
+        headers = {hdrs.ETAG: etag, hdrs.CACHE_CONTROL: "no-cache"}
+        modified = max(
+            (when for when in (coordinator.data_updated, fx_updated) if when),
+            default=None,
+        )
+        if modified is not None:
+            modified = modified.replace(microsecond=0)
+            headers[hdrs.LAST_MODIFIED] = _http_date(modified)
+
+        if hdrs.IF_NONE_MATCH in request.headers:
+            not_modified = _etag_matches(request.headers[hdrs.IF_NONE_MATCH], etag)
+        else:
+            since = request.if_modified_since
+            not_modified = since is not None and modified is not None and modified <= since
+        if not_modified:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        events = coordinator.store.events
+        entry = hass.config_entries.async_get_entry(entry_id)
+        pieces = iter_calendar(
+            entry.title if entry else DOMAIN,
+            events,
+            coordinator.fx.event_prices(events, currency),
+            currency,
+            first_day,
+            last_day,
+            today,
+            coordinator.data_updated or dt_util.utcnow(),
+            coordinator.store.describe,
+        )
+
+        response = web.StreamResponse(headers=headers)
+        response.content_type = "text/calendar"
+        response.charset = "utf-8"
+        # Compressed when the client accepts it
+        response.enable_compression()
+        await response.prepare(request)
+
+        chunk: list[str] = []
+        size = 0
+        for piece in pieces:
+            chunk.append(piece)
+            size += len(piece)
+            if size >= ICS_CHUNK_SIZE:
+                await response.write("".join(chunk).encode())
+                chunk.clear()
+                size = 0
+        if chunk:
+            await response.write("".join(chunk).encode())
+        await response.write_eof()
+        return response
@@ -0,0 +1,281 @@
+"""Websocket API for Tickets & Events."""
+from __future__ import annotations
+
+import logging
+import operator
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EVENT_CITY,
+    EVENT_TYPE,
+    WS_DEFAULT_PAGE_SIZE,
+    WS_MAX_PAGE_SIZE,
+)
+from .coordinator import TicketsEventsDataUpdateCoordinator, async_get_entry_coordinator
+from .helpers import project_event
+from .query import SORT_FIELDS, EventQuery, QueryError, parse_query, select_events
+from .records import EVENT_FIELDS, EventRecord
+from .search import fold_text
+
+_LOGGER = logging.getLogger(__name__)
+
+ERR_CURSOR_EXPIRED = "cursor_expired"
+
+FILTER_SCHEMA = vol.Schema(
+    {
+        vol.Optional("query"): cv.string,
+        vol.Optional(EVENT_TYPE): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(EVENT_CITY): cv.string,
+        vol.Optional("min_price"): vol.Coerce(float),
+        vol.Optional("max_price"): vol.Coerce(float),
+        vol.Optional("min_rating"): vol.Coerce(float),
+    }
+)
+
+FIELDS_SCHEMA = vol.All(cv.ensure_list, [vol.In(EVENT_FIELDS)])
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_list_events)
+    websocket_api.async_register_command(hass, websocket_query_events)
+    websocket_api.async_register_command(hass, websocket_subscribe_events)
+
+
+def query_events(
+    coordinator: TicketsEventsDataUpdateCoordinator,
+    currency: str,
+    filters: dict[str, Any],
+    sort: str | None = None,
+    descending: bool = False,
+    limit: int | None = None,
+) -> tuple[list[tuple[EventRecord, float]], int]:
+    """Return the first limit (event, price in currency) pairs matching filters.
+
+    The number of matching events comes along. Without sort, events keep
+    the search ranking for a query and the API order otherwise.
+    """
+    city = filters.get(EVENT_CITY)
+    min_rating = filters.get("min_rating")
+    query = EventQuery(
+        text=filters.get("query") or "",
+        types=frozenset(filters.get(EVENT_TYPE, ())),
+        city=fold_text(city) if city else None,
+        price=tuple(
+            (op, bound)
+            for op, bound in (
+                (operator.ge, filters.get("min_price")),
+                (operator.le, filters.get("max_price")),
+            )
+            if bound is not None
+        ),
+        rating=() if min_rating is None else ((operator.ge, min_rating),),
+        sort=sort,
+        descending=descending,
+    )
+    selected, matches = select_events(
+        coordinator.store, coordinator.fx, query, currency, limit
+    )
+    return selected, len(matches)
+
+
+def _parse_cursor(cursor: str) -> tuple[int, int] | None:
+    """Return the (store version, offset) encoded in a cursor."""
+    try:
+        version, offset = (int(part) for part in cursor.split(":"))
+    except ValueError:
+        return None
+    return version, max(offset, 0)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/events/list",
+        vol.Required("entry_id"): cv.string,
+        vol.Optional("filter", default={}): FILTER_SCHEMA,
+        vol.Optional("sort"): vol.In(SORT_FIELDS),
+        vol.Optional("descending", default=False): cv.boolean,
+        vol.Optional("limit", default=WS_DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=WS_MAX_PAGE_SIZE)
+        ),
+        vol.Optional("cursor"): cv.string,
+        vol.Optional("fields"): FIELDS_SCHEMA,
+    }
+)
+@callback
+def websocket_list_events(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one page of events.
+
+    The cursor of the next page is only valid while the events are unchanged;
+    after a refresh the client gets a cursor_expired error and starts over.
+    """
+    if (found := async_get_entry_coordinator(hass, msg["entry_id"])) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Entry not found")
+        return
+    coordinator, currency = found
+    if (offset := _page_offset(connection, msg, coordinator.store.version)) is None:
+        return
+
+    matches, total = query_events(
+        coordinator,
+        currency,
+        msg["filter"],
+        msg.get("sort"),
+        msg["descending"],
+        offset + msg["limit"],
+    )
+    _send_page(connection, msg, coordinator, currency, matches[offset:], offset, total)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/events/query",
+        vol.Required("entry_id"): cv.string,
+        vol.Required("query"): cv.string,
+        vol.Optional("limit", default=WS_DEFAULT_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=WS_MAX_PAGE_SIZE)
+        ),
+        vol.Optional("cursor"): cv.string,
+        vol.Optional("fields"): FIELDS_SCHEMA,
+    }
+)
+@callback
+def websocket_query_events(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one page of the events matching a query.
+
+    The query language is described in the query module, e.g.
+    "type:museum price<=20 sort:-rating". Pages work as in events/list.
+    """
+    if (found := async_get_entry_coordinator(hass, msg["entry_id"])) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Entry not found")
+        return
+    coordinator, currency = found
+    try:
+        query = parse_query(msg["query"], dt_util.now().date())
+    except QueryError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    if (offset := _page_offset(connection, msg, coordinator.store.version)) is None:
+        return
+
+    selected, matches = select_events(
+        coordinator.store, coordinator.fx, query, currency, offset + msg["limit"]
+    )
+    _send_page(
+        connection, msg, coordinator, currency, selected[offset:], offset, len(matches)
+    )
+
+
+def _page_offset(
+    connection: websocket_api.ActiveConnection, msg: dict[str, Any], version: int
+) -> int | None:
+    """Return where the requested page starts, or send an error and None."""
+    if "cursor" not in msg:
+        return 0
+    if (parsed := _parse_cursor(msg["cursor"])) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid cursor")
+        return None
+    if parsed[0] != version:
+        connection.send_error(
+            msg["id"], ERR_CURSOR_EXPIRED, "Events changed, request the first page again"
+        )
+        return None
+    return parsed[1]
+
+
+def _send_page(
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+    coordinator: TicketsEventsDataUpdateCoordinator,
+    currency: str,
+    page: list[tuple[EventRecord, float]],
+    offset: int,
+    total: int,
+) -> None:
+    """Send a page of (event, price) pairs starting at offset."""
+    version = coordinator.store.version
+    end = offset + len(page)
+    fields = msg.get("fields")
+    connection.send_result(
+        msg["id"],
+        {
+            "events": [
+                project_event(event, currency, price, fields) for event, price in page
+            ],
+            "total": total,
+            "next_cursor": f"{version}:{end}" if end < total else None,
+            "version": version,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/events/subscribe",
+        vol.Required("entry_id"): cv.string,
+        vol.Optional("fields"): FIELDS_SCHEMA,
+        vol.Optional("version"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+@callback
+def websocket_subscribe_events(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Push the events changed by each refresh.
+
+    Every message is an events_changes payload: the new store version, the
+    added or changed events and the ids of removed events. The result holds
+    the changes since the version the client already has, or every event
+    without one. All events are sent again, as a reset, when the entry
+    currency or the exchange rates change the prices.
+    """
+    if (found := async_get_entry_coordinator(hass, msg["entry_id"])) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Entry not found")
+        return
+    coordinator, currency = found
+    fields = msg.get("fields")
+    # Nothing is missed between the client's last read and the first push
+    changes = coordinator.events_changes(
+        msg.get("version", 0), currency, fields, reset="version" not in msg
+    )
+    version = changes["version"]
+    rates_updated = coordinator.fx.updated
+
+    @callback
+    def async_coordinator_updated() -> None:
+        """Send the differences since the last message."""
+        nonlocal currency, rates_updated, version
+        if (found := async_get_entry_coordinator(hass, msg["entry_id"])) is None:
+            return
+        # Currency options are applied in place, without a reload
+        repriced = (found[1], coordinator.fx.updated) != (currency, rates_updated)
+        if coordinator.store.version == version and not repriced:
+            return
+        currency, rates_updated = found[1], coordinator.fx.updated
+        changes = coordinator.events_changes(version, currency, fields, reset=repriced)
+        version = changes["version"]
+        connection.send_message(websocket_api.event_message(msg["id"], changes))
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_listener(
+        async_coordinator_updated
+    )
+    connection.send_result(msg["id"], changes)
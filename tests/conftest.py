@@ -0,0 +1,44 @@
+"""Fixtures for Tickets & Events tests."""
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tickets_events.const import DOMAIN
+
+ENTRY_DATA = {
+    "city_id": "c76753",
+    "currency": "EUR",
+    "use_sample_data": True,
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Allow loading the integration from custom_components in every test."""
+
+
+@pytest.fixture
+def add_entry(hass: HomeAssistant) -> Callable[..., MockConfigEntry]:
+    """Return a function adding a sample data entry, data overriding ENTRY_DATA."""
+
+    def add(title: str = "Tickets & Events", **data: Any) -> MockConfigEntry:
+        entry = MockConfigEntry(domain=DOMAIN, data={**ENTRY_DATA, **data}, title=title)
+        entry.add_to_hass(hass)
+        return entry
+
+    return add
+
+
+@pytest.fixture
+async def config_entry(
+    hass: HomeAssistant, add_entry: Callable[..., MockConfigEntry]
+) -> MockConfigEntry:
+    """Return a set up entry with the sample data."""
+    entry = add_entry()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -0,0 +1,29 @@
+"""Test caching utilities for Tickets & Events."""
+from unittest.mock import patch
+
+from custom_components.tickets_events.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test the oldest unused entry is evicted first."""
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.as_dict()["hits"] == 3
+    assert cache.as_dict()["misses"] == 1
+
+
+def test_lru_cache_expires_entries():
+    """Test entries expire after the TTL."""
+    cache = LRUCache(max_size=2, ttl=60)
+    with patch("custom_components.tickets_events.cache.time.monotonic", return_value=0):
+        cache.set("a", 1)
+    with patch("custom_components.tickets_events.cache.time.monotonic", return_value=61):
+        assert cache.get("a") is None
+    assert len(cache) == 0
@@ -1,5 +1,5 @@
 """Test the config flow for Tickets & Events."""
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -17,6 +17,7 @@ def mock_api_client():
         "custom_components.tickets_events.config_flow.TicketsEventsApiClient"
     ) as mock_client:
         mock_instance = mock_client.return_value
+        mock_instance.get_cities = AsyncMock()
         mock_instance.get_cities.return_value = [
             {
                 "id": "c76753",
@@ -61,7 +62,9 @@ async def test_form_user_create_entry(hass: HomeAssistant) -> None:
     assert result2["title"] == "Tickets & Events"
     assert result2["data"] == {
         "city_id": "c76753",
+        "city_name": "Bucharest",
         "currency": "EUR",
+        "use_sample_data": True,
     }
 
 
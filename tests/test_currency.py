@@ -0,0 +1,26 @@
+"""Test currency conversion for Tickets & Events."""
+from custom_components.tickets_events.currency import (
+    canonical_price,
+    convert_prices,
+    round_price,
+)
+
+
+def test_round_price():
+    """Test rounding to the decimals of each currency."""
+    assert round_price(12.345, "EUR") == 12.35
+    assert round_price(1234.5, "JPY") == 1235
+    assert round_price(99.49, "CNY") == 99
+
+
+def test_canonical_price_prefers_eur():
+    """Test the EUR price is used as the canonical price."""
+    assert canonical_price({"price": 40.50, "price_eur": 47.30, "currency": "GBP"}) == 47.30
+    assert canonical_price({"price": 16.0}) == 16.0
+    assert canonical_price({}) == 0
+
+
+def test_convert_prices():
+    """Test batch conversion with one rate."""
+    assert convert_prices([10.0, 32.9, 0], 162.0, "JPY") == [1620, 5330, 0]
+    assert convert_prices([10.0, 32.9], 1.08, "USD") == [10.8, 35.53]
@@ -0,0 +1,113 @@
+"""Test the date handling for Tickets & Events."""
+from datetime import date, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.tickets_events.dates import (
+    DateIndex,
+    DateSet,
+    event_dates,
+    occurrence_span,
+)
+
+EVENTS = [
+    {"id": 1, "date": "2025-12-01", "available_dates": ["2025-12-01", "2025-12-02"]},
+    {"id": 2, "date": "2025-12-02T19:30:00"},
+    {"id": 3},
+    {"id": 4, "available_dates": ["not a date", "2025-12-03"]},
+]
+
+
+def test_event_dates():
+    """Test dates are read from date and available_dates."""
+    assert event_dates(EVENTS[0]) == {date(2025, 12, 1), date(2025, 12, 2)}
+    assert event_dates(EVENTS[1]) == {date(2025, 12, 2)}
+    assert event_dates(EVENTS[2]) == set()
+    assert event_dates(EVENTS[3]) == {date(2025, 12, 3)}
+
+
+def test_date_index_buckets():
+    """Test events are found by day, undated ones on every day."""
+    index = DateIndex()
+    for event in EVENTS:
+        index.add(event["id"], event)
+
+    assert index.on(date(2025, 12, 1)) == [1, 3]
+    assert index.on(date(2025, 12, 2), include_undated=False) == [1, 2]
+    assert index.on(date(2025, 12, 4)) == [3]
+    assert index.dates == [date(2025, 12, 1), date(2025, 12, 2), date(2025, 12, 3)]
+    # Dates are sorted once until they change
+    assert index.dates is index.dates
+    dates = index.dates
+    index.add(5, {"id": 5, "date": "2025-12-03"})
+    assert index.dates is dates
+
+    index.add(1, {"id": 1, "date": "2025-12-03"})
+    index.remove(2)
+    assert index.on(date(2025, 12, 2), include_undated=False) == []
+    assert index.on(date(2025, 12, 3), include_undated=False) == [4, 5, 1]
+    assert index.dates == [date(2025, 12, 3)]
+    index.add(6, {"id": 6, "date": "2025-11-30"})
+    assert index.dates == [date(2025, 11, 30), date(2025, 12, 3)]
+    assert len(index) == 5
+
+
+def test_date_index_between():
+    """Test events in a date range come by their first date in it."""
+    index = DateIndex()
+    for event in EVENTS:
+        index.add(event["id"], event)
+
+    assert index.between(date(2025, 12, 2), date(2025, 12, 31)) == [
+        (date(2025, 12, 2), 3),
+        (date(2025, 12, 2), 1),
+        (date(2025, 12, 2), 2),
+        (date(2025, 12, 3), 4),
+    ]
+    assert index.between(
+        date(2025, 12, 3), date(2025, 12, 3), include_undated=False
+    ) == [(date(2025, 12, 3), 4)]
+    assert index.between(date(2025, 12, 5), date(2025, 12, 1), include_undated=False) == []
+
+
+def test_date_set():
+    """Test dates are packed and expanded by range."""
+    daily = [date(2025, 12, 1) + timedelta(days=offset) for offset in range(365)]
+    dates = DateSet([*daily[::2], date(2025, 12, 1)])
+
+    assert len(dates) == 183
+    assert dates.first == date(2025, 12, 1)
+    assert dates.last == date(2026, 11, 30)
+    assert date(2025, 12, 3) in dates
+    assert date(2025, 12, 2) not in dates
+    assert date(2025, 11, 30) not in dates
+    assert list(dates.between(date(2025, 12, 2), date(2025, 12, 7))) == [
+        date(2025, 12, 3),
+        date(2025, 12, 5),
+        date(2025, 12, 7),
+    ]
+    assert list(dates.between(date(2027, 1, 1), date(2027, 2, 1))) == []
+    assert dates.next_from(date(2025, 12, 2)) == date(2025, 12, 3)
+    assert dates.next_from(date(2020, 1, 1)) == date(2025, 12, 1)
+    assert dates.next_from(date(2026, 12, 1)) is None
+    assert list(dates)[:2] == [date(2025, 12, 1), date(2025, 12, 3)]
+
+    assert len(DateSet()) == 0
+    assert DateSet().first is None
+
+
+def test_occurrence_span_follows_timezone():
+    """Test cached spans are dropped when the timezone changes."""
+    zone = dt_util.DEFAULT_TIME_ZONE
+    try:
+        dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Bucharest"))
+        start, end = occurrence_span(date(2025, 12, 1))
+        assert occurrence_span(date(2025, 12, 1))[0] is start
+        assert start.isoformat() == "2025-12-01T10:00:00+02:00"
+        assert end - start == timedelta(hours=8)
+
+        dt_util.set_default_time_zone(dt_util.get_time_zone("America/New_York"))
+        start, _end = occurrence_span(date(2025, 12, 1))
+        assert start.isoformat() == "2025-12-01T10:00:00-05:00"
+    finally:
+        dt_util.set_default_time_zone(zone)
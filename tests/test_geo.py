@@ -0,0 +1,62 @@
+"""Test the spatial index for Tickets & Events."""
+import pytest
+
+from custom_components.tickets_events.geo import GeoIndex, haversine_km
+from custom_components.tickets_events.sample_data import get_nearby_sample_events
+
+PALACE = {"latitude": 44.4276, "longitude": 26.0879}
+VILLAGE_MUSEUM = {"latitude": 44.4722, "longitude": 26.0764}
+LOUVRE = {"latitude": 48.8606, "longitude": 2.3376}
+FIJI = {"latitude": -17.7134, "longitude": 179.9}
+SAMOA = {"latitude": -13.7590, "longitude": -172.1046}
+
+
+def _build_index() -> GeoIndex:
+    index = GeoIndex()
+    for event_id, event in enumerate([PALACE, VILLAGE_MUSEUM, LOUVRE, FIJI, SAMOA]):
+        index.add(event_id, event)
+    index.add(99, {"title": "No coordinates"})
+    return index
+
+
+def test_haversine_km():
+    """Test great-circle distances."""
+    assert haversine_km(44.4268, 26.1025, 44.4268, 26.1025) == 0
+    assert haversine_km(44.4268, 26.1025, 48.8566, 2.3522) == pytest.approx(1870, rel=0.01)
+
+
+def test_within_radius():
+    """Test radius queries return events inside the circle, nearest first."""
+    index = _build_index()
+    assert len(index) == 5
+    assert [event_id for event_id, _ in index.within(44.4268, 26.1025, 10)] == [0, 1]
+    assert [event_id for event_id, _ in index.within(44.4268, 26.1025, 2)] == [0]
+
+
+def test_within_across_antimeridian():
+    """Test the search circle wraps around longitude 180."""
+    index = _build_index()
+    assert [event_id for event_id, _ in index.within(-15.5, -177.0, 800)] == [3, 4]
+
+
+def test_nearest():
+    """Test k-nearest queries grow the search circle as needed."""
+    index = _build_index()
+    assert [event_id for event_id, _ in index.nearest(48.85, 2.35, 1)] == [2]
+    assert [event_id for event_id, _ in index.nearest(48.85, 2.35, 3)] == [2, 1, 0]
+    assert len(index.nearest(0, 0, 10)) == 5
+
+
+def test_remove():
+    """Test removed events are no longer returned."""
+    index = _build_index()
+    index.remove(0)
+    assert [event_id for event_id, _ in index.within(44.4268, 26.1025, 10)] == [1]
+
+
+def test_nearby_sample_events_filters_by_radius():
+    """Test the sample API honours the location and radius."""
+    bucharest = get_nearby_sample_events(44.4268, 26.1025, radius=20)
+    assert bucharest["events"]
+    assert all(event["city"] == "Bucharest" for event in bucharest["events"])
+    assert get_nearby_sample_events(0, 0, radius=50)["events"] == []
@@ -1,8 +1,10 @@
 """Test helpers for Tickets & Events."""
 from custom_components.tickets_events.helpers import (
+    fit_events,
     format_price,
     generate_booking_url,
     generate_qr_code,
+    json_size,
 )
 
 
@@ -21,6 +23,12 @@ def test_format_price_jpy():
     assert format_price(1500.00, "JPY") == "¥1500"
 
 
+def test_format_price_rounds_half_up():
+    """Test prices are rounded, not truncated."""
+    assert format_price(1499.7, "JPY") == "¥1500"
+    assert format_price(2.675, "EUR") == "€2.68"
+
+
 def test_generate_booking_url():
     """Test booking URL generation."""
     event = {
@@ -42,3 +50,39 @@ def test_generate_qr_code():
     
     assert qr_code.startswith("data:image/png;base64,")
     assert len(qr_code) > 100  # QR code should have substantial data
+
+
+def _heavy_events(count: int) -> list[dict]:
+    return [
+        {
+            "id": event_id,
+            "title": f"Event {event_id}",
+            "description": "x" * 500,
+            "images": [{"url": f"https://example.com/{n}.jpg"} for n in range(3)],
+            "qr_code_data": "data:image/png;base64," + "A" * 2000,
+        }
+        for event_id in range(count)
+    ]
+
+
+def test_fit_events_trims_in_priority_order():
+    """Test QR codes go first, then extra images, then long descriptions."""
+    events = fit_events(_heavy_events(10), 12000)
+    assert len(events) == 10
+    assert json_size(events) <= 12000
+    assert all("qr_code_data" not in event for event in events)
+    assert all(len(event["images"]) == 3 for event in events)
+
+    events = fit_events(_heavy_events(10), 5000)
+    assert len(events) == 10
+    assert json_size(events) <= 5000
+    assert all(len(event["images"]) == 1 for event in events)
+    assert all(len(event["description"]) == 200 for event in events)
+
+
+def test_fit_events_drops_last_events():
+    """Test events are dropped from the end when trimming is not enough."""
+    events = fit_events(_heavy_events(10), 200)
+    assert json_size(events) <= 200
+    assert [event["id"] for event in events] == list(range(len(events)))
+    assert fit_events(_heavy_events(2), 0) == []
@@ -0,0 +1,48 @@
+"""Test the price history for Tickets & Events."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.tickets_events.history import (
+    PriceHistory,
+    PriceRing,
+    price_statistic_id,
+)
+
+START = datetime(2025, 12, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def test_price_ring_overwrites_oldest():
+    """Test the ring keeps the latest samples, oldest first."""
+    ring = PriceRing(3)
+    assert ring.last_price is None
+    for sample in range(5):
+        ring.append(float(sample), sample * 10.0)
+    assert ring.samples() == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+    assert ring.samples(since=3.0) == [(3.0, 30.0), (4.0, 40.0)]
+    assert ring.last_price == 40.0
+
+
+def test_price_history_follows_events():
+    """Test events are sampled while present and forgotten when gone."""
+    history = PriceHistory(size=4, max_events=2)
+    events = [
+        {"id": 1, "title": "Tour", "price_eur": 10.0},
+        {"id": 2, "title": "Museum", "price": 5.0},
+        {"id": 3, "title": "Show", "price_eur": 50.0},
+    ]
+    history.record(events, START)
+    history.record(
+        [{**events[0], "price_eur": 12.0}, events[1]], START + timedelta(hours=1)
+    )
+    assert len(history) == 2
+    assert 3 not in history
+    assert [price for _ts, price in history.get(1).samples()] == [10.0, 12.0]
+
+    history.record(events[1:2], START + timedelta(hours=2))
+    assert 1 not in history
+    assert history.get(2).count == 3
+
+
+def test_price_statistic_id():
+    """Test statistic ids are valid for the recorder."""
+    assert price_statistic_id(976227) == "tickets_events:price_976227"
+    assert price_statistic_id("Ab-12 x") == "tickets_events:price_ab_12_x"
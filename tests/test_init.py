@@ -0,0 +1,375 @@
+"""Test setup and unload of Tickets & Events."""
+from collections.abc import Callable
+from datetime import timedelta
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.tickets_events.const import DOMAIN
+from custom_components.tickets_events.dates import DateSet
+from custom_components.tickets_events.helpers import cached_qr_code, json_size
+from custom_components.tickets_events.timeline import Timeline
+
+
+async def test_entries_share_coordinator(
+    hass: HomeAssistant, add_entry: Callable[..., MockConfigEntry]
+) -> None:
+    """Test entries for the same city share one coordinator."""
+    first = add_entry()
+    second = add_entry()
+    other_currency = add_entry(currency="USD")
+    other_city = add_entry(city_id="c67097")
+
+    assert await hass.config_entries.async_setup(first.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][first.entry_id]
+    assert hass.data[DOMAIN][second.entry_id] is coordinator
+    assert hass.data[DOMAIN][other_currency.entry_id] is coordinator
+    assert hass.data[DOMAIN][other_city.entry_id] is not coordinator
+    assert coordinator.entry_ids == {
+        first.entry_id,
+        second.entry_id,
+        other_currency.entry_id,
+    }
+
+    for entry in (first, second):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert coordinator.entry_ids == {other_currency.entry_id}
+
+    assert await hass.config_entries.async_unload(other_currency.entry_id)
+    await hass.async_block_till_done()
+    assert not coordinator.entry_ids
+
+
+async def test_currency_change_does_not_refetch(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test changing the currency converts prices locally."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    with patch.object(
+        coordinator.api, "get_events_by_city", wraps=coordinator.api.get_events_by_city
+    ) as get_events:
+        hass.config_entries.async_update_entry(
+            config_entry, data={**config_entry.data, "currency": "JPY"}
+        )
+        await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][config_entry.entry_id] is coordinator
+    get_events.assert_not_called()
+
+    state = hass.states.get("sensor.today_events")
+    assert state.attributes["currency"] == "JPY"
+    assert {event["currency"] for event in state.attributes["events"]} == {"JPY"}
+
+
+async def test_unchanged_refresh_keeps_attributes(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test a refresh with the same data neither rebuilds nor restamps attributes."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    state = hass.states.get("sensor.today_events")
+    data_version = coordinator.data_version
+
+    with patch(
+        "custom_components.tickets_events.sensor.process_event_data",
+        side_effect=AssertionError("attributes rebuilt"),
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert coordinator.data_version == data_version
+    new_state = hass.states.get("sensor.today_events")
+    assert new_state.attributes == state.attributes
+    assert new_state.attributes["last_updated"] == coordinator.data_updated.isoformat()
+
+
+async def test_today_sensor_rolls_over_at_midnight(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test the Today sensor switches to the next day's bucket at midnight."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    today = dt_util.now().date()
+    tomorrow = today + timedelta(days=1)
+    events = [
+        {"id": 1, "title": "Today", "date": today.isoformat()},
+        {"id": 2, "title": "Tomorrow", "date": tomorrow.isoformat()},
+        {
+            "id": 3,
+            "title": "Both",
+            "available_dates": [today.isoformat(), tomorrow.isoformat()],
+        },
+    ]
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events}
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    state = hass.states.get("sensor.today_events")
+    assert [event["title"] for event in state.attributes["events"]] == ["Today", "Both"]
+
+    async_fire_time_changed(hass, dt_util.start_of_local_day() + timedelta(days=1, seconds=1))
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.today_events")
+    assert state.state == "2"
+    assert {event["title"] for event in state.attributes["events"]} == {"Tomorrow", "Both"}
+
+
+async def test_category_sensors_follow_types(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test a sensor is added per event type and removed with the type."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    events = [
+        {"id": 1, "type": "tour", "price_eur": 10.0, "rating": 5.0, "rating_count": 1},
+        {"id": 2, "type": "tour", "price_eur": 30.0, "rating": 4.0, "rating_count": 3},
+        {"id": 3, "type": "museum", "price_eur": 5.0},
+    ]
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events}
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.tour_events")
+    assert state.state == "2"
+    assert state.attributes["min_price"] == 10.0
+    assert state.attributes["median_price"] == 20.0
+    assert state.attributes["average_rating"] == 4.25
+    assert hass.states.get("sensor.museum_events").state == "1"
+
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events[2:]}
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.tour_events") is None
+    assert hass.states.get("sensor.museum_events").state == "1"
+
+
+async def test_next_event_sensor_follows_timer(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test the Next Event sensor moves on when an occurrence starts."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    tomorrow = dt_util.now().date() + timedelta(days=1)
+    later = tomorrow + timedelta(days=2)
+    events = [
+        {"id": 1, "title": "Later", "date": later.isoformat()},
+        {"id": 2, "title": "Tomorrow", "available_dates": [tomorrow.isoformat()]},
+    ]
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events}
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.next_event")
+    assert state.attributes["title"] == "Tomorrow"
+    start = dt_util.parse_datetime(state.state)
+    assert dt_util.as_local(start).date() == tomorrow
+
+    async_fire_time_changed(hass, start + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.next_event")
+    assert state.attributes["title"] == "Later"
+
+
+async def test_calendar_built_once_per_version(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test the calendar reuses its events until the data changes."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    calendar = next(
+        entity
+        for entity in hass.data["calendar"].entities
+        if entity.unique_id == f"{config_entry.entry_id}_calendar"
+    )
+
+    tomorrow = dt_util.now().date() + timedelta(days=1)
+    events = [
+        {"id": 1, "title": "Tour", "available_dates": [tomorrow.isoformat()]},
+        {"id": 2, "title": "Show", "date": (tomorrow + timedelta(days=1)).isoformat()},
+        {
+            "id": 4,
+            "title": "Garden",
+            "available_dates": [
+                (tomorrow + timedelta(days=offset)).isoformat()
+                for offset in range(-30, 335)
+            ],
+        },
+    ]
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events}
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    timeline = calendar._get_timeline()
+    assert calendar._get_timeline() is timeline
+    assert calendar.event.start.date() >= dt_util.now().date()
+
+    start = dt_util.start_of_local_day(tomorrow)
+    found = await calendar.async_get_events(hass, start, start + timedelta(days=1))
+    assert sorted(event.summary for event in found) == ["Garden", "Tour"]
+
+    events.append({"id": 3, "title": "Museum", "date": tomorrow.isoformat()})
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events}
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert calendar._get_timeline() is not timeline
+    found = await calendar.async_get_events(hass, start, start + timedelta(days=1))
+    assert {event.summary for event in found} == {"Tour", "Museum", "Garden"}
+
+
+async def test_calendar_reads_only_the_requested_days(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test calendar reads do not scan series spanning the whole year."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    calendar = next(
+        entity
+        for entity in hass.data["calendar"].entities
+        if entity.unique_id == f"{config_entry.entry_id}_calendar"
+    )
+
+    # Weekly series over a year, a seventh of them on any day
+    tomorrow = dt_util.now().date() + timedelta(days=1)
+    events = [
+        {
+            "id": event_id,
+            "title": f"Weekly {event_id}",
+            "available_dates": [
+                (tomorrow + timedelta(days=event_id % 7 + 7 * week)).isoformat()
+                for week in range(52)
+            ],
+        }
+        for event_id in range(700)
+    ]
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events}
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    calendar._get_timeline()
+
+    start = dt_util.start_of_local_day(tomorrow + timedelta(days=3))
+    with patch.object(DateSet, "between", side_effect=AssertionError), patch.object(
+        DateSet, "next_from", side_effect=AssertionError
+    ), patch.object(
+        calendar, "_occurrence", wraps=calendar._occurrence
+    ) as occurrence, patch.object(
+        Timeline, "first_from", autospec=True, side_effect=Timeline.first_from
+    ) as first_from:
+        found = await calendar.async_get_events(hass, start, start + timedelta(days=1))
+        assert len(found) == occurrence.call_count == 100
+        assert {event.summary for event in found} == {
+            f"Weekly {event_id}" for event_id in range(3, 700, 7)
+        }
+
+        occurrence.reset_mock()
+        assert calendar.event.summary == "Weekly 0"
+        assert calendar.event.summary == "Weekly 0"
+        # Found when the state was written after the refresh, kept until it starts
+        assert first_from.call_count == 0
+        assert occurrence.call_count == 2
+
+        started = calendar.event.start + timedelta(seconds=1)
+        with patch(
+            "custom_components.tickets_events.calendar.dt_util.now",
+            return_value=started,
+        ):
+            assert calendar.event.summary == "Weekly 1"
+
+
+async def test_combined_calendar(
+    hass: HomeAssistant, add_entry: Callable[..., MockConfigEntry]
+) -> None:
+    """Test the combined calendar merges entries and shows shared events once."""
+    first = add_entry()
+    other_currency = add_entry(currency="USD")
+    other_city = add_entry(city_id="c67097")
+    assert await hass.config_entries.async_setup(first.entry_id)
+    await hass.async_block_till_done()
+
+    tomorrow = (dt_util.now().date() + timedelta(days=1)).isoformat()
+    day_after = (dt_util.now().date() + timedelta(days=2)).isoformat()
+    city_events = {
+        first.entry_id: [
+            {"id": 1, "title": "River cruise", "date": tomorrow},
+            {"id": 2, "title": "Show", "date": day_after},
+        ],
+        other_city.entry_id: [
+            {"id": 1, "title": "River cruise", "date": tomorrow},
+            {"id": 3, "title": "Museum", "date": tomorrow},
+        ],
+    }
+    for entry_id, events in city_events.items():
+        coordinator = hass.data[DOMAIN][entry_id]
+        with patch.object(
+            coordinator.api, "get_events_by_city", return_value={"events": events}
+        ):
+            await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("calendar.all_events_calendar") is not None
+    combined = hass.data[DOMAIN]["calendars"].combined
+    start = dt_util.start_of_local_day(dt_util.now() + timedelta(days=1))
+    events = await combined.async_get_events(hass, start, start + timedelta(days=2))
+    assert [event.summary for event in events][2:] == ["Show"]
+    assert sorted(event.summary for event in events[:2]) == ["Museum", "River cruise"]
+
+    # Another entry takes the combined calendar over
+    assert await hass.config_entries.async_unload(first.entry_id)
+    await hass.async_block_till_done()
+    combined = hass.data[DOMAIN]["calendars"].combined
+    assert combined is not None
+    assert hass.states.get("calendar.all_events_calendar").state != "unavailable"
+    events = await combined.async_get_events(hass, start, start + timedelta(days=2))
+    assert len(events) == 3
+
+
+async def test_qr_codes_rendered_within_budget(
+    hass: HomeAssistant, add_entry: Callable[..., MockConfigEntry]
+) -> None:
+    """Test QR codes are only rendered when the attribute budget can hold them."""
+    cached_qr_code.cache_clear()
+    entry = add_entry(attribute_budget=4096)
+    with patch(
+        "custom_components.tickets_events.helpers.generate_qr_code",
+        return_value="data:image/png;base64," + "A" * 1000,
+    ) as generate_qr_code:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        attributes = hass.states.get("sensor.today_events").attributes
+        assert attributes["events"]
+        assert all("qr_code_data" not in event for event in attributes["events"])
+        generate_qr_code.assert_not_called()
+
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, "attribute_budget": 16384}
+        )
+        await hass.async_block_till_done()
+
+    attributes = hass.states.get("sensor.today_events").attributes
+    with_qr_codes = [event for event in attributes["events"] if "qr_code_data" in event]
+    assert with_qr_codes
+    assert generate_qr_code.call_count <= len(with_qr_codes) + 1
+    assert json_size(dict(attributes)) <= 16384
+    cached_qr_code.cache_clear()
@@ -0,0 +1,110 @@
+"""Test the event query language for Tickets & Events."""
+from datetime import date
+import operator
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tickets_events.currency import FxRates
+from custom_components.tickets_events.query import (
+    EventQuery,
+    QueryError,
+    parse_query,
+    select_events,
+)
+from custom_components.tickets_events.store import EventStore
+
+TODAY = date(2025, 12, 1)
+
+EVENTS = [
+    {"id": 1, "title": "Old Town Tour", "type": "tour", "price_eur": 20.0, "rating": 4.5,
+     "available_dates": ["2025-12-01", "2025-12-02"]},
+    {"id": 2, "title": "Art Museum", "type": "museum", "price_eur": 12.0, "rating": 4.8,
+     "date": "2025-12-05"},
+    {"id": 3, "title": "Village Museum", "type": "museum", "price_eur": 0.0},
+    {"id": 4, "title": "Night Tour", "type": "tour", "price_eur": 35.0, "rating": 4.9,
+     "date": "2025-12-02"},
+    {"id": 5, "title": "Palace Tour", "type": "tour", "price_eur": 25.0, "rating": 4.1,
+     "date": "2025-12-09"},
+]
+
+
+def test_parse_query():
+    """Test fields, ranges, flags and free text are parsed."""
+    query = parse_query(
+        'type:tour,museum price:10..30 rating>=4.5 date:today..today+7 is:paid '
+        'sort:-rating "old town"',
+        TODAY,
+    )
+    assert query.text == "old town"
+    assert query.types == {"tour", "museum"}
+    assert query.price == ((operator.ge, 10.0), (operator.le, 30.0), (operator.gt, 0.0))
+    assert query.rating == ((operator.ge, 4.5),)
+    assert (query.date_from, query.date_to) == (TODAY, date(2025, 12, 8))
+    assert (query.sort, query.descending) == ("rating", True)
+
+    query = parse_query("date:2025-12-03 city:Bucureşti 10:30", TODAY)
+    assert (query.date_from, query.date_to) == (date(2025, 12, 3), date(2025, 12, 3))
+    assert query.city == "bucuresti"
+    assert query.text == "10:30"
+    assert parse_query("", TODAY) == EventQuery()
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["price<=cheap", "date:soon", "sort:color", "is:maybe", "type>tour", "price:..", '"open'],
+)
+def test_parse_query_errors(text: str):
+    """Test invalid queries are rejected."""
+    with pytest.raises(QueryError):
+        parse_query(text, TODAY)
+
+
+async def test_select_events(hass: HomeAssistant) -> None:
+    """Test queries are answered from the indexes, in order and top-K."""
+    store = EventStore()
+    store.update(EVENTS)
+    fx = FxRates(hass)
+
+    def ids(text: str, limit: int | None = None) -> tuple[list[int], int]:
+        selected, matches = select_events(
+            store, fx, parse_query(text, TODAY), "EUR", limit
+        )
+        return [event["id"] for event, _price in selected], len(matches)
+
+    assert ids("type:tour price<=30") == ([1, 5], 2)
+    assert ids("rating>4.4 sort:-rating", limit=2) == ([4, 2], 3)
+    assert ids("is:free") == ([3], 1)
+    assert ids("is:paid sort:price", limit=1) == ([2], 4)
+    assert ids("date:today..today+4") == ([1, 2, 3, 4], 4)
+    assert ids("date:2025-12-02 type:tour sort:-price") == ([4, 1], 2)
+    assert ids("museum is:paid") == ([2], 1)
+    assert ids("tour sort:title") == ([4, 1, 5], 3)
+    # Unrated events go last whichever the direction
+    assert ids("type:museum sort:rating") == ([2, 3], 2)
+    assert ids("type:museum sort:-rating") == ([2, 3], 2)
+
+    # Prices are compared as shown in the requested currency
+    selected, _matches = select_events(
+        store, fx, parse_query("price<=70", TODAY), "RON", None
+    )
+    assert {event["id"] for event, _price in selected} == {2, 3}
+    assert all(price <= 70 for _event, price in selected)
+
+
+def test_store_range_indexes():
+    """Test prices and ratings are sorted once per store version."""
+    store = EventStore()
+    store.update(EVENTS)
+
+    assert store.price_index.ids(10, 25) == [2, 1, 5]
+    assert store.price_index.count(None, 0) == 1
+    assert store.rating_index.count(4.5, None) == 3
+    assert len(store.rating_index) == 4
+    assert store.price_index is store.price_index
+
+    index = store.price_index
+    store.update(EVENTS[:2])
+    assert store.price_index is not index
+    assert store.price_index.count(None, None) == 2
@@ -0,0 +1,67 @@
+"""Test the compact event records for Tickets & Events."""
+import sys
+
+import pytest
+
+from custom_components.tickets_events.records import EventRecord
+from custom_components.tickets_events.store import EventStore
+
+EVENT = {
+    "id": 1,
+    "title": "Palace of the Parliament Tour",
+    "city": "Bucharest",
+    "country": "Romania",
+    "price": 15.0,
+    "type": "tour",
+    "available_dates": ["2025-12-01", "2025-12-02"],
+    "images": [{"url": "https://example.com/1.jpg", "alt": "Palace"}],
+    "destinationId": 42,
+}
+
+
+def test_record_reads_like_dict():
+    """Test records expose the same fields and values as the source dict."""
+    record = EventRecord(EVENT)
+    assert record == EVENT
+    assert record.as_dict() == EVENT
+    assert {**record} == EVENT
+    assert record.get("rating") is None
+    assert record["destinationId"] == 42
+    with pytest.raises(KeyError):
+        record["rating"]
+
+
+def test_record_interns_shared_strings():
+    """Test low-cardinality strings are shared between records."""
+    first = EventRecord(EVENT)
+    second = EventRecord({**EVENT, "city": "".join(["Buch", "arest"])})
+    assert first["city"] is second["city"] is sys.intern("Bucharest")
+
+
+def test_record_is_read_only():
+    """Test records cannot be changed by readers."""
+    record = EventRecord(EVENT)
+    with pytest.raises(AttributeError):
+        record.title = "Changed"
+
+
+def test_store_keeps_unchanged_records():
+    """Test refreshing with unchanged events reuses the existing records."""
+    store = EventStore()
+    store.update([EVENT])
+    record = store.get(1)
+    store.update([dict(EVENT)])
+    assert store.get(1) is record
+    store.update([{**EVENT, "price": 20.0}])
+    assert store.get(1) is not record
+    assert store.get(1)["price"] == 20.0
+
+    # Packed lists and dicts are compared field by field too
+    record = store.get(1)
+    assert not store.update([{**EVENT, "price": 20.0}])
+    assert store.update([{**EVENT, "price": 20.0, "available_dates": ["2025-12-01"]}])
+    assert store.get(1) is not record
+    record = store.get(1)
+    assert store.update([{**record, "images": [{"url": "https://example.com/2.jpg"}]}])
+    assert store.update([{key: value for key, value in EVENT.items() if key != "type"}])
+    assert store.get(1).get("type") is None
@@ -0,0 +1,142 @@
+"""Test the local search index for Tickets & Events."""
+from custom_components.tickets_events.search import (
+    EventSearchIndex,
+    merge_ranked,
+    normalize_query,
+    tokenize,
+)
+from custom_components.tickets_events.store import EventStore
+
+EVENTS = [
+    {
+        "id": 1,
+        "title": "Muzeul Ţăranului Român",
+        "description": "Peasant traditions and crafts",
+        "type": "museum",
+        "city": "Bucharest",
+    },
+    {
+        "id": 2,
+        "title": "Palace of the Parliament Tour",
+        "description": "Guided tour of the palace",
+        "type": "tour",
+        "city": "Bucharest",
+    },
+    {
+        "id": 3,
+        "title": "Louvre Museum",
+        "description": "The world's largest art museum",
+        "type": "museum",
+        "city": "Paris",
+    },
+]
+
+
+def _build_index() -> EventSearchIndex:
+    index = EventSearchIndex()
+    for event in EVENTS:
+        index.add(event["id"], event)
+    return index
+
+
+def test_tokenize_folds_accents():
+    """Test tokens are lowercased and accent-free."""
+    assert tokenize("Muzeul Ţăranului, boat_tour") == ["muzeul", "taranului", "boat", "tour"]
+
+
+def test_search_accent_insensitive():
+    """Test queries match regardless of accents."""
+    index = _build_index()
+    assert [event_id for event_id, _ in index.search("taranului")] == [1]
+    assert [event_id for event_id, _ in index.search("ŢĂRANULUI")] == [1]
+
+
+def test_search_prefix_and_all_terms():
+    """Test prefix matching and that every query term must match."""
+    index = _build_index()
+    assert {event_id for event_id, _ in index.search("muse")} == {1, 3}
+    assert [event_id for event_id, _ in index.search("museum paris")] == [3]
+    assert index.search("museum rome") == []
+
+
+def test_search_ranks_title_matches_first():
+    """Test events matching in more weighted fields rank higher."""
+    index = _build_index()
+    results = index.search("palace")
+    assert results[0][0] == 2
+
+
+def test_store_update_is_incremental():
+    """Test the store re-indexes changed events and drops removed ones."""
+    store = EventStore()
+    assert store.update(EVENTS)
+    assert not store.update([dict(event) for event in EVENTS])
+
+    assert store.update([EVENTS[0], {**EVENTS[2], "title": "Orsay Gallery"}])
+    assert 2 not in store
+    assert [event["id"] for event in store.search("orsay")] == [3]
+    assert store.search("louvre") == []
+
+
+def test_normalize_query():
+    """Test cache keys ignore case and extra whitespace."""
+    assert normalize_query("  Old   TOWN tour ") == "old town tour"
+
+
+def test_merge_ranked():
+    """Test rankings are merged by score without repeating events."""
+    first = [({"id": 1}, 9.0), ({"id": 2}, 3.0), ({"id": 3}, 1.0)]
+    second = [({"id": 4}, 5.0), ({"id": 1}, 3.0), ({"id": 5}, 3.0)]
+
+    merged = merge_ranked([first, second])
+    assert [event["id"] for event in merged] == [1, 4, 2, 5, 3]
+    merged = merge_ranked([first, second], limit=3)
+    assert [event["id"] for event in merged] == [1, 4, 2]
+    assert merge_ranked([]) == []
+
+
+def test_store_changes_since():
+    """Test the store reports what changed since an older version."""
+    store = EventStore()
+    store.update(EVENTS)
+    version = store.version
+    assert store.changes_since(version) == (set(), set())
+
+    store.update([{**EVENTS[0], "title": "Renamed"}, EVENTS[1]])
+    store.update([{**EVENTS[0], "title": "Renamed"}, EVENTS[1], EVENTS[2]])
+    assert store.changes_since(version) == ({1, 3}, set())
+    assert store.changes_since(version + 1) == ({3}, set())
+    assert store.changes_since(store.version + 1) is None
+
+
+def test_store_calendar_texts():
+    """Test calendar texts are rendered once per event content and evicted."""
+    store = EventStore()
+    store.update(
+        [
+            {"id": 1, "title": "Tour", "city": "Paris", "country": "France"},
+            {"id": 2, "title": "Show", "description": "Loud"},
+        ]
+    )
+    tour = store.get(1)
+
+    description, location = store.describe(tour, 10.0, "EUR")
+    assert location == "Paris, France"
+    assert "€10.00" in description
+    assert store.describe(tour, 10.0, "EUR") == (description, location)
+    assert store.calendar_texts.as_dict() == {"size": 1, "hits": 1, "misses": 1}
+
+    # A new price or a changed event renders again
+    assert "€12.00" in store.describe(tour, 12.0, "EUR")[0]
+    store.update(
+        [
+            {"id": 1, "title": "Tour", "city": "Lyon", "country": "France"},
+            {"id": 2, "title": "Show", "description": "Loud"},
+        ]
+    )
+    assert len(store.calendar_texts) == 0
+    assert store.describe(store.get(1), 12.0, "EUR")[1] == "Lyon, France"
+    store.describe(store.get(2), 0.0, "EUR")
+
+    store.update([{"id": 2, "title": "Show", "description": "Loud"}])
+    assert len(store.calendar_texts) == 1
@@ -0,0 +1,261 @@
+"""Test the Tickets & Events services."""
+import asyncio
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tickets_events.const import DOMAIN
+
+
+async def test_generate_booking_urls(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test booking URLs and QR codes are generated for many events at once."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    event_ids = [event["id"] for event in coordinator.store.events[:3]]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "generate_booking_urls",
+        {
+            "event_ids": [*event_ids, event_ids[0], 424242],
+            "currency": "USD",
+            "qr_code": True,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["success"]
+    assert response["missing"] == [424242]
+    assert [result["event_id"] for result in response["urls"]] == event_ids
+    for result in response["urls"]:
+        assert "currency=USD" in result["booking_url"]
+        assert result["qr_code"].startswith("data:image/png;base64,")
+
+
+async def test_refresh_events_coalesces(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test refreshes only fetch what they need and bursts share one fetch."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    events = [{"id": 1, "title": "Tour", "date": "2026-02-14"}]
+
+    async def refresh(sensor: str) -> dict:
+        return await hass.services.async_call(
+            DOMAIN,
+            "refresh_events",
+            {"sensor": sensor},
+            blocking=True,
+            return_response=True,
+        )
+
+    with patch.object(
+        coordinator.api, "get_events_by_city", return_value={"events": events}
+    ) as get_events:
+        results = await asyncio.gather(refresh("today"), refresh("nearby"), refresh("calendar"))
+        assert get_events.call_count == 1
+        assert results[0] == results[1] == results[2]
+        assert results[0]["refreshed"] == "events"
+        assert results[0]["changed"]
+        assert results[0]["events"] == 1
+
+        result = await refresh("search")
+        assert result["refreshed"] == "search"
+        assert not result["changed"]
+        assert get_events.call_count == 1
+
+        with patch(
+            "custom_components.tickets_events.coordinator.REFRESH_COALESCE_WINDOW", 0
+        ):
+            result = await refresh("today")
+        assert get_events.call_count == 2
+        assert not result["changed"]
+
+
+async def test_services_fan_out_over_entries(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    add_entry: Callable[..., MockConfigEntry],
+) -> None:
+    """Test calls reach every entry unless routed to one entry or city."""
+    bucharest = config_entry
+    paris = add_entry(city_id="c67097")
+    assert await hass.config_entries.async_setup(paris.entry_id)
+    await hass.async_block_till_done()
+
+    async def search(**data: Any) -> dict:
+        return await hass.services.async_call(
+            DOMAIN,
+            "search_events",
+            {"query": "museum", **data},
+            blocking=True,
+            return_response=True,
+        )
+
+    # Matches of both cities are merged by search score
+    response = await search()
+    assert response["success"]
+    ids = [event["id"] for event in response["results"]["events"]]
+    assert ids == [976229, 976228, 234567]
+    scores = {
+        event["id"]: score
+        for entry in (bucharest, paris)
+        for event, score in hass.data[DOMAIN][entry.entry_id].search_matches("museum")
+    }
+    assert [scores[event_id] for event_id in ids] == sorted(scores.values(), reverse=True)
+    assert response["results"]["total_count"] == 3
+
+    response = await search(entry_id=paris.entry_id)
+    assert [event["id"] for event in response["results"]["events"]] == [234567]
+    response = await search(city_id="c76753")
+    assert [event["id"] for event in response["results"]["events"]] == [976229, 976228]
+
+    response = await search(city_id="c00000")
+    assert not response["success"]
+
+    # The API search is not per city, so it is called once for all entries
+    with patch(
+        "custom_components.tickets_events.api.TicketsEventsApiClient.search_events",
+        return_value={"events": [{"id": 1, "title": "Opera"}]},
+    ) as search_events:
+        response = await search(query="opera", fallback_to_api=True)
+    assert search_events.call_count == 1
+    assert [event["id"] for event in response["results"]["events"]] == [1]
+    assert response["results"]["source"] == "api"
+
+    # Booking URLs are found in whichever city has the event
+    response = await hass.services.async_call(
+        DOMAIN,
+        "generate_booking_urls",
+        {"event_ids": [976227, 123456]},
+        blocking=True,
+        return_response=True,
+    )
+    assert [result["event_id"] for result in response["urls"]] == [976227, 123456]
+    response = await hass.services.async_call(
+        DOMAIN,
+        "generate_booking_url",
+        {"event_id": 123456, "entry_id": bucharest.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert not response["success"]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "refresh_events",
+        {"sensor": "search"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["success"]
+    assert response["cities"] == 2
+
+
+async def test_service_pages(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test events are paged with stable cursors and projected to fields."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    days = coordinator.store.date_index.dates
+
+    async def by_date(**data: Any) -> dict:
+        return await hass.services.async_call(
+            DOMAIN,
+            "get_events_by_date",
+            {
+                "date_from": days[1].isoformat(),
+                "date_to": days[-1].isoformat(),
+                "fields": ["id", "price"],
+                "limit": 5,
+                **data,
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    first = (await by_date())["results"]
+    assert first["total_count"] == 8
+    assert len(first["events"]) == 5
+    assert all(set(event) == {"id", "price"} for event in first["events"])
+    second = (await by_date(cursor=first["next_cursor"]))["results"]
+    assert len(second["events"]) == 3
+    assert second["next_cursor"] is None
+    # Events available in the range are listed by their first date in it
+    assert [event["id"] for event in first["events"] + second["events"]][-2:] == [
+        976232,
+        976233,
+    ]
+    assert len({event["id"] for event in first["events"] + second["events"]}) == 8
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "search_events",
+        {"query": "museum", "limit": 1, "fields": ["id", "title"]},
+        blocking=True,
+        return_response=True,
+    )
+    results = response["results"]
+    assert results["events"] == [
+        {"id": 976229, "title": "Village Museum (Muzeul Satului) Entry"}
+    ]
+    assert results["total_count"] == 2
+    response = await hass.services.async_call(
+        DOMAIN,
+        "search_events",
+        {"query": "museum", "limit": 1, "cursor": results["next_cursor"]},
+        blocking=True,
+        return_response=True,
+    )
+    assert [event["id"] for event in response["results"]["events"]] == [976228]
+    assert response["results"]["next_cursor"] is None
+
+    # Cursors expire once the events change
+    coordinator.store.update(coordinator.store.events[:2])
+    response = await by_date(cursor=first["next_cursor"])
+    assert not response["success"]
+
+
+async def test_query_events(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    add_entry: Callable[..., MockConfigEntry],
+) -> None:
+    """Test queries filter, sort and page the events."""
+
+    async def query(text: str, **data: Any) -> dict:
+        return await hass.services.async_call(
+            DOMAIN,
+            "query_events",
+            {"query": text, "limit": 2, **data},
+            blocking=True,
+            return_response=True,
+        )
+
+    first = (await query("type:tour,museum price<=30 sort:-rating"))["results"]
+    assert [event["id"] for event in first["events"]] == [976230, 976229]
+    assert first["total_count"] == 3
+    rest = (
+        await query("type:tour,museum price<=30 sort:-rating", cursor=first["next_cursor"])
+    )["results"]
+    assert [event["id"] for event in rest["events"]] == [976228]
+    assert rest["next_cursor"] is None
+
+    response = await query("sort:colour")
+    assert not response["success"]
+
+    # Events listed by several entries are counted and paged once
+    paris = add_entry(city_id="c67097")
+    assert await hass.config_entries.async_setup(paris.entry_id)
+    await hass.async_block_till_done()
+    bucharest = hass.data[DOMAIN][config_entry.entry_id]
+    hass.data[DOMAIN][paris.entry_id].store.update(bucharest.store.events)
+    results = (await query("type:museum"))["results"]
+    assert [event["id"] for event in results["events"]] == [976228, 976229]
+    assert results["total_count"] == 2
+    assert results["next_cursor"] is None
@@ -0,0 +1,37 @@
+"""Test the aggregate statistics for Tickets & Events."""
+from custom_components.tickets_events.stats import compute_stats
+from custom_components.tickets_events.store import EventStore
+
+EVENTS = [
+    {"id": 1, "type": "tour", "price_eur": 10.0, "rating": 5.0, "rating_count": 10},
+    {"id": 2, "type": "tour", "price_eur": 30.0, "rating": 4.0, "rating_count": 30},
+    {"id": 3, "type": "tour", "price": 20.0, "rating": 1.0, "rating_count": 0},
+    {"id": 4, "type": "museum", "price_eur": 0.0},
+]
+
+
+def test_compute_stats():
+    """Test min and median price and the weighted average rating."""
+    stats = compute_stats(EVENTS[:3])
+    assert stats.count == 3
+    assert stats.min_price == 10.0
+    assert stats.median_price == 20.0
+    assert stats.average_rating == 4.25
+    assert stats.rating_count == 40
+
+    stats = compute_stats(EVENTS[3:])
+    assert stats.average_rating is None
+    assert compute_stats([]).min_price is None
+
+
+def test_store_category_stats():
+    """Test the store groups statistics by event type and refreshes them."""
+    store = EventStore()
+    store.update(EVENTS)
+    assert set(store.category_stats) == {"tour", "museum"}
+    assert store.category_stats is store.category_stats
+    assert store.category_stats["tour"].count == 3
+
+    store.update(EVENTS[:2])
+    assert set(store.category_stats) == {"tour"}
+    assert store.category_stats["tour"].count == 2
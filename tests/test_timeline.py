@@ -0,0 +1,53 @@
+"""Test the calendar timeline of Tickets & Events."""
+from datetime import date, timedelta
+
+from custom_components.tickets_events.timeline import Timeline
+
+BASE = date(2025, 12, 1)
+
+
+def _day(offset: int) -> date:
+    """Return BASE plus offset days."""
+    return BASE + timedelta(days=offset)
+
+
+def _timeline() -> Timeline[str]:
+    """Return a timeline with one-day items and one spanning several days."""
+    return Timeline(
+        [
+            ("festival", [_day(0), _day(1), _day(2), _day(3)]),
+            ("day 1", [_day(0)]),
+            ("day 2", [_day(1)]),
+            ("weekly", [_day(0), _day(7), _day(14)]),
+        ]
+    )
+
+
+def test_timeline_between():
+    """Test range queries return the occurrences of each day in item order."""
+    timeline = _timeline()
+
+    assert len(timeline) == 4
+    assert list(timeline) == ["festival", "day 1", "day 2", "weekly"]
+    assert list(timeline.between(_day(1), _day(2))) == [
+        (_day(1), "festival"),
+        (_day(1), "day 2"),
+        (_day(2), "festival"),
+    ]
+    # Items spanning the range without occurring in it are not returned
+    assert list(timeline.between(_day(4), _day(6))) == []
+    assert list(timeline.between(_day(5), _day(30))) == [
+        (_day(7), "weekly"),
+        (_day(14), "weekly"),
+    ]
+
+
+def test_timeline_first_from():
+    """Test the next occurrence is found from any day."""
+    timeline = _timeline()
+
+    assert timeline.first() == (_day(0), "festival")
+    assert timeline.first_from(_day(1)) == (_day(1), "festival")
+    assert timeline.first_from(_day(4)) == (_day(7), "weekly")
+    assert timeline.first_from(_day(15)) is None
+    assert Timeline([]).first() is None
@@ -0,0 +1,160 @@
+"""Test the Tickets & Events HTTP API."""
+from collections.abc import Callable
+from datetime import timedelta
+from http import HTTPStatus
+import json
+from unittest.mock import AsyncMock, Mock
+
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.tickets_events.const import DOMAIN
+from custom_components.tickets_events.ics import fold_line
+from custom_components.tickets_events.views import (
+    TicketsEventsCalendarView,
+    TicketsEventsView,
+)
+
+
+async def _get(
+    hass: HomeAssistant,
+    view: TicketsEventsView,
+    entry_id: str,
+    path: str = "",
+    headers: dict[str, str] | None = None,
+):
+    """Call the view like the HTTP server would."""
+    request = make_mocked_request(
+        "GET", f"/api/{DOMAIN}/{entry_id}/events{path}", headers=headers, app={"hass": hass}
+    )
+    return await view.get(request, entry_id)
+
+
+async def test_events_view_etag(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test snapshots carry an ETag and unchanged polls get a 304."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    view = TicketsEventsView()
+
+    response = await _get(hass, view, config_entry.entry_id, "?fields=id,price")
+    assert response.status == HTTPStatus.OK
+    snapshot = json.loads(response.body)
+    assert len(snapshot["events"]) == len(coordinator.store)
+    assert set(snapshot["events"][0]) == {"id", "price"}
+    etag = response.headers["ETag"]
+
+    response = await _get(
+        hass, view, config_entry.entry_id, "?fields=id,price", {"If-None-Match": etag}
+    )
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    events = [event.as_dict() for event in coordinator.store.events]
+    events[0]["title"] = "Renamed"
+    coordinator.store.update(events)
+
+    response = await _get(
+        hass, view, config_entry.entry_id, "?fields=id,price", {"If-None-Match": etag}
+    )
+    assert response.status == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+
+    response = await _get(
+        hass, view, config_entry.entry_id, f"?since={snapshot['version']}"
+    )
+    changes = json.loads(response.body)
+    assert [event["title"] for event in changes["changed"]] == ["Renamed"]
+    assert changes["removed"] == []
+
+    response = await _get(hass, view, "unknown")
+    assert response.status == HTTPStatus.NOT_FOUND
+
+
+async def _get_ics(
+    hass: HomeAssistant,
+    entry_id: str,
+    path: str = "",
+    headers: dict[str, str] | None = None,
+) -> tuple[web.StreamResponse, str]:
+    """Call the calendar view, returning the response and the streamed body."""
+    chunks: list[bytes] = []
+    writer = Mock()
+    writer.buffer_size = 0
+    writer.output_size = 0
+    writer.write_headers = AsyncMock()
+    writer.write = AsyncMock(side_effect=chunks.append)
+    writer.write_eof = AsyncMock()
+    writer.drain = AsyncMock()
+    app = web.Application()
+    app["hass"] = hass
+    app.freeze()
+    request = make_mocked_request(
+        "GET",
+        f"/api/{DOMAIN}/{entry_id}/events.ics{path}",
+        headers=headers,
+        app=app,
+        writer=writer,
+    )
+    response = await TicketsEventsCalendarView().get(request, entry_id)
+    return response, b"".join(chunks).decode()
+
+
+def test_fold_line():
+    """Test long content lines are folded at 75 octets."""
+    assert fold_line("SUMMARY:Short") == "SUMMARY:Short\r\n"
+    folded = fold_line("DESCRIPTION:" + "é" * 80)
+    lines = folded.removesuffix("\r\n").split("\r\n")
+    assert all(len(line.encode()) <= 75 for line in lines)
+    assert all(line.startswith(" ") for line in lines[1:])
+    assert "".join(line.removeprefix(" ") for line in lines) == "DESCRIPTION:" + "é" * 80
+
+
+async def test_calendar_view(
+    hass: HomeAssistant, add_entry: Callable[..., MockConfigEntry]
+) -> None:
+    """Test the iCalendar feed is windowed and answers unchanged polls with 304."""
+    entry = add_entry(title="Bucharest")
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    today = dt_util.now().date()
+    coordinator.store.update(
+        [
+            {
+                "id": 1,
+                "title": "Old town, by night",
+                "available_dates": [
+                    (today + timedelta(days=offset)).isoformat() for offset in range(10)
+                ],
+            },
+            {"id": 2, "title": "Far away", "date": (today + timedelta(days=200)).isoformat()},
+        ]
+    )
+    window = f"?start={today.isoformat()}&end={(today + timedelta(days=2)).isoformat()}"
+
+    response, body = await _get_ics(hass, entry.entry_id, window)
+    assert response.status == HTTPStatus.OK
+    assert response.content_type == "text/calendar"
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert body.endswith("END:VCALENDAR\r\n")
+    assert "X-WR-CALNAME:Bucharest" in body
+    assert body.count("BEGIN:VEVENT") == 3
+    assert "SUMMARY:Old town\\, by night" in body
+    assert "Far away" not in body
+    assert f"UID:1_{today.isoformat()}@{DOMAIN}" in body
+
+    etag = response.headers["ETag"]
+    response, body = await _get_ics(hass, entry.entry_id, window, {"If-None-Match": etag})
+    assert response.status == HTTPStatus.NOT_MODIFIED
+    assert body == ""
+
+    _response, body = await _get_ics(hass, entry.entry_id)
+    assert body.count("BEGIN:VEVENT") == 10
+
+    response, _body = await _get_ics(hass, entry.entry_id, "?start=tomorrow")
+    assert response.status == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,159 @@
+"""Test the Tickets & Events websocket API."""
+from typing import Any
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.tickets_events.const import DOMAIN
+from custom_components.tickets_events.websocket_api import (
+    websocket_list_events,
+    websocket_query_events,
+    websocket_subscribe_events,
+)
+
+
+def _send(hass: HomeAssistant, handler, connection: MagicMock, msg: dict[str, Any]) -> Any:
+    """Validate msg like the websocket server and call handler."""
+    handler(hass, connection, handler._ws_schema({"id": 1, **msg}))
+    if connection.send_error.called:
+        return connection.send_error.call_args.args[1]
+    return connection.send_result.call_args.args[1]
+
+
+async def test_list_events_pages(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test events are listed a page at a time with the requested fields."""
+    request = {
+        "type": "tickets_events/events/list",
+        "entry_id": config_entry.entry_id,
+        "sort": "price",
+        "limit": 2,
+        "fields": ["id", "price"],
+    }
+
+    first = _send(hass, websocket_list_events, MagicMock(), request)
+    assert len(first["events"]) == 2
+    assert all(set(event) == {"id", "price"} for event in first["events"])
+    assert first["next_cursor"]
+
+    rest = _send(
+        hass,
+        websocket_list_events,
+        MagicMock(),
+        {**request, "limit": 50, "cursor": first["next_cursor"]},
+    )
+    assert rest["next_cursor"] is None
+    events = first["events"] + rest["events"]
+    assert len(events) == first["total"]
+    prices = [event["price"] for event in events]
+    assert prices == sorted(prices)
+
+    hass.data[DOMAIN][config_entry.entry_id].store.update([])
+    error = _send(
+        hass, websocket_list_events, MagicMock(), {**request, "cursor": first["next_cursor"]}
+    )
+    assert error == "cursor_expired"
+
+
+async def test_query_events(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test events are queried with the query language."""
+    request = {
+        "type": "tickets_events/events/query",
+        "entry_id": config_entry.entry_id,
+        "query": "rating>=4.8 sort:price",
+        "fields": ["id"],
+    }
+
+    result = _send(hass, websocket_query_events, MagicMock(), request)
+    assert [event["id"] for event in result["events"]] == [976232, 976231, 976234]
+    assert result["total"] == 3
+
+    error = _send(
+        hass, websocket_query_events, MagicMock(), {**request, "query": "price<=cheap"}
+    )
+    assert error == "invalid_format"
+
+
+async def test_subscribe_pushes_changes(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test subscribers only receive what a refresh changed."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    connection = MagicMock(subscriptions={})
+    _send(
+        hass,
+        websocket_subscribe_events,
+        connection,
+        {"type": "tickets_events/events/subscribe", "entry_id": config_entry.entry_id},
+    )
+
+    events = [event.as_dict() for event in coordinator.store.events]
+    removed = events.pop()
+    events[0]["title"] = "Renamed"
+    coordinator.store.update(events)
+    coordinator.async_update_listeners()
+
+    message = connection.send_message.call_args.args[0]["event"]
+    assert message["reset"] is False
+    assert [event["title"] for event in message["changed"]] == ["Renamed"]
+    assert message["removed"] == [removed["id"]]
+
+    # New prices are pushed as a reset, without any event changing
+    hass.config_entries.async_update_entry(
+        config_entry, data={**config_entry.data, "currency": "USD"}
+    )
+    await hass.async_block_till_done()
+    message = connection.send_message.call_args.args[0]["event"]
+    assert message["reset"] is True
+    assert message["currency"] == "USD"
+    assert len(message["changed"]) == len(events)
+
+    connection.send_message.reset_mock()
+    coordinator.async_update_listeners()
+    assert not connection.send_message.called
+    coordinator.fx.updated = dt_util.utcnow()
+    coordinator.async_update_listeners()
+    message = connection.send_message.call_args.args[0]["event"]
+    assert message["reset"] is True
+    assert message["currency"] == "USD"
+
+    connection.subscriptions[1]()
+
+
+async def test_subscribe_sends_changes_since_list(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test a refresh between listing and subscribing is not missed."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    listed = _send(
+        hass,
+        websocket_list_events,
+        MagicMock(),
+        {"type": "tickets_events/events/list", "entry_id": config_entry.entry_id},
+    )
+
+    events = [event.as_dict() for event in coordinator.store.events]
+    events[0]["title"] = "Renamed"
+    coordinator.store.update(events)
+
+    request = {"type": "tickets_events/events/subscribe", "entry_id": config_entry.entry_id}
+    result = _send(
+        hass,
+        websocket_subscribe_events,
+        MagicMock(subscriptions={}),
+        {**request, "version": listed["version"]},
+    )
+    assert result["reset"] is False
+    assert result["version"] == coordinator.store.version
+    assert [event["title"] for event in result["changed"]] == ["Renamed"]
+
+    # Without a version every event is sent
+    result = _send(hass, websocket_subscribe_events, MagicMock(subscriptions={}), request)
+    assert result["reset"] is True
+    assert len(result["changed"]) == len(events)